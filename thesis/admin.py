@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
                              QLabel, QPushButton, QDialog, QLineEdit, QTextEdit,
-                             QFileDialog, QTableWidget, QTableWidgetItem, 
+                             QFileDialog, 
                              QHeaderView, QSplitter, QGridLayout, QComboBox, QSizePolicy,
                              QStackedWidget, QTabWidget, QMessageBox, QCheckBox, QTabBar,
                              QApplication)
@@ -11,14 +11,17 @@ from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 from io import BytesIO
 import pandas as pd
-import tempfile
 import time
 import re
 import os
-import hashlib # Add near other imports at the top of admin.py
 
-from model import classify_comment
-from scraper import scrape_comments
+from model import classify_comment, classify_comments, count_duplicates
+from classification_worker import ClassificationJob, JobTab
+from scraper import (iter_comment_batches, comments_to_frame, scrape_export_path, cached_scrape_age,
+                     load_scrape_history, update_scrape_history)
+from scrape_cache import format_age
+from text_filters import filter_comments
+from scrape_queue import ScrapeQueueDialog
 from styles import (COLORS, FONTS, BUTTON_STYLE, INPUT_STYLE, TABLE_STYLE, TAB_STYLE, 
                    DETAIL_TEXT_STYLE, TABLE_ALTERNATE_STYLE, DIALOG_STYLE, 
                    IMAGE_LABEL_STYLE, MENU_BAR_STYLE, CHECKBOX_REPLY_STYLE, 
@@ -33,8 +36,10 @@ from user import SummaryDialog
 from loading_overlay import LoadingOverlay
 from stopwords import TAGALOG_STOP_WORDS
 from comment_operations import generate_report
-from db_config import log_user_action, get_db_connection
+from db_config import log_user_action, get_db_connection, db_connection
+from tab_store import save_tab_comments, load_session_tabs, tab_content_hash
 from comment_filters import CommentFiltersDialog
+from comment_table_model import CommentTableView, COMMENT_COLUMN, LABEL_COLUMN, CONFIDENCE_COLUMN
 
 def admin_classify_comment(text):
     """
@@ -70,8 +75,10 @@ def batch_classify_comments(comments_list):
     """
     results = []
     
-    for comment in comments_list:
-        prediction, confidence = admin_classify_comment(comment)
+    # Classify the whole list in mini-batches rather than one forward pass per comment
+    classifications = classify_comments(comments_list)
+    
+    for comment, (prediction, confidence) in zip(comments_list, classifications):
         results.append({
             'comment_text': comment,
             'prediction': prediction,
@@ -123,6 +130,8 @@ class AdminWindow(QMainWindow):
         self.comment_metadata = {}  # Store metadata for each comment
         self.session_id = None
         self.tabs = {}
+        self.pending_tab_rows = {}  # Restored tab widget -> comments not yet put in its table
+        self.classification_job = None  # Background scrape/CSV analysis in progress
         
         # Define base path for assets
         base_path = os.path.dirname(os.path.abspath(__file__))
@@ -284,6 +293,19 @@ class AdminWindow(QMainWindow):
         
         url_layout.addWidget(self.url_input, 1)  # Give URL input stretch factor of 1
         url_layout.addWidget(self.filter_button, 0)  # Don't stretch filter button
+
+        self.queue_button = QPushButton("Queue")
+        self.queue_button.setFont(FONTS['button'])
+        self.queue_button.setStyleSheet(BUTTON_STYLE)
+        self.queue_button.setFixedWidth(80)
+        self.queue_button.setToolTip("Scrape several Facebook posts at once")
+        self.queue_button.clicked.connect(self.show_scrape_queue)
+        url_layout.addWidget(self.queue_button, 0)
+
+        self.refresh_checkbox = QCheckBox("Force refresh")
+        self.refresh_checkbox.setStyleSheet(CHECKBOX_REPLY_STYLE)
+        self.refresh_checkbox.setToolTip("Ignore cached results and scrape the post again")
+        url_layout.addWidget(self.refresh_checkbox, 0)
         fb_layout.addLayout(url_layout)
 
         self.scrape_button = QPushButton("Scrape Comments")
@@ -395,6 +417,7 @@ class AdminWindow(QMainWindow):
         custom_tab_bar = CustomTabBar()
         self.tab_widget.setTabBar(custom_tab_bar)
         self.tab_widget.setStyleSheet(TAB_STYLE)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         self.initial_message = QLabel("No analysis performed yet.\nResults will appear here.")
         self.initial_message.setAlignment(Qt.AlignCenter)
         self.initial_message.setStyleSheet(f"color: {COLORS['text']}; font-size: 14px;")
@@ -610,9 +633,6 @@ class AdminWindow(QMainWindow):
 
     def create_empty_tab(self, tab_type, is_restoring=False):
         """Create a new empty tab with table"""
-        # Truncate tab name for consistent width in the UI tab bar
-        tab_display_name = self.truncate_tab_name(tab_type, max_length=20) # Slightly longer truncation
-
         # Important: During restoration, we *always* create a new tab widget,
         # even if a tab with the same name was somehow left over or handled incorrectly before.
         # The restore_session loop is responsible for generating unique names passed as tab_type.
@@ -624,15 +644,34 @@ class AdminWindow(QMainWindow):
             if index != -1:
                 self.tab_widget.setCurrentIndex(index)
             # Return the table from the existing tab
-            table = existing_tab_widget.findChild(QTableWidget)
+            table = self.get_tab_table(existing_tab_widget)
             print(f"Switched to existing tab '{tab_type}'")
             return table
 
         # --- Create New Tab Widget ---
         # If restoring OR if tab_type not in self.tabs dictionary, create a new tab widget
+        tab = self.create_tab_page(tab_type)
+        table = self.build_tab_contents(tab, tab_type)
+        self.add_tab_page(tab, tab_type)
+
+        # Set the newly added tab as the current one, especially during restoration
+        # This ensures the UI shows the tab being processed
+        new_index = self.tab_widget.indexOf(tab)
+        if new_index != -1:
+            self.tab_widget.setCurrentIndex(new_index)
+
+
+        return table # Return the newly created table
+
+    def create_tab_page(self, tab_type):
+        """Create the bare page widget for a tab"""
         tab = QWidget()
         # Give the tab widget an object name for easier debugging/identification
         tab.setObjectName(f"tab_{tab_type.replace(' ', '_').replace('(', '').replace(')', '').replace('.', '_')}") # Sanitize name for object name
+        return tab
+
+    def build_tab_contents(self, tab, tab_type):
+        """Build the header, search bar, sort dropdown and comment table inside a tab page"""
         tab_layout = QVBoxLayout(tab)
         tab_layout.setContentsMargins(5, 5, 5, 5) # Add some margins
 
@@ -680,14 +719,11 @@ class AdminWindow(QMainWindow):
         tab_layout.addLayout(header_layout)
 
         # Create and configure table
-        table = QTableWidget()
+        table = CommentTableView() # Columns come from its CommentTableModel
         table.setObjectName(f"table_{tab_type.replace(' ', '_').replace('(', '').replace(')', '').replace('.', '_')}") # Sanitize name
         table.setSortingEnabled(False) # Disable Qt sorting, use custom sort
         table.setStyleSheet(TABLE_ALTERNATE_STYLE)
-        table.setColumnCount(3) # Set to 3 columns
-        table.setHorizontalHeaderLabels(["Comment", "Prediction", "Confidence"]) # Update headers
         table.setAlternatingRowColors(True)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
 
         # Adjust column sizes
         header = table.horizontalHeader()
@@ -700,12 +736,7 @@ class AdminWindow(QMainWindow):
         # table.setColumnWidth(2, 100)
 
         table.setWordWrap(True)
-        table.setSelectionBehavior(QTableWidget.SelectRows)
-        table.setSelectionMode(QTableWidget.SingleSelection)
-        # Disconnect first to avoid multiple connections if called repeatedly
-        try: table.itemSelectionChanged.disconnect(self.update_details_panel)
-        except TypeError: pass
-        table.itemSelectionChanged.connect(self.update_details_panel)
+        table.selectionModel().selectionChanged.connect(lambda *_: self.update_details_panel())
 
         # Store sort combo and connect it using a lambda specific to *this* table instance
         table.sort_combo = sort_combo
@@ -717,31 +748,20 @@ class AdminWindow(QMainWindow):
 
         tab_layout.addWidget(table)
 
-        # Configure search functionality specific to *this* table instance
-        def filter_table(text, tbl=table): # Pass table instance
-            search_text = text.lower()
-            for row in range(tbl.rowCount()):
-                comment_item = tbl.item(row, 0)
-                # Check if item exists and has text
-                if comment_item and comment_item.text():
-                     comment_content = comment_item.text().lower()
-                     # Use UserRole data as well if available
-                     user_data = comment_item.data(Qt.UserRole)
-                     if user_data:
-                          comment_content += user_data.lower()
-                     tbl.setRowHidden(row, search_text not in comment_content)
-                else:
-                     # Hide rows with missing comment items
-                     tbl.setRowHidden(row, True)
-
         # Store search bar reference on the table itself
         table.search_bar = search_bar
         # Disconnect first to avoid multiple connections
         try: search_bar.textChanged.disconnect()
         except TypeError: pass
-        # Use lambda to pass text and table instance
-        search_bar.textChanged.connect(lambda text, tbl=table: filter_table(text, tbl))
+        # Search filters this table's model
+        search_bar.textChanged.connect(table.model().set_search_text)
 
+        return table
+
+    def add_tab_page(self, tab, tab_type):
+        """Register a tab page under its unique name and add it to the tab bar"""
+        # Truncate tab name for consistent width in the UI tab bar
+        tab_display_name = self.truncate_tab_name(tab_type, max_length=20) # Slightly longer truncation
 
         # Store tab reference using the unique `tab_type` name (e.g., "data.csv (2)")
         # This MUST use the name generated by restore_session to ensure uniqueness check works
@@ -772,14 +792,25 @@ class AdminWindow(QMainWindow):
             if not self.show_summary_button.isEnabled():
                 self.enable_dataset_operations(True)
 
-        # Set the newly added tab as the current one, especially during restoration
-        # This ensures the UI shows the tab being processed
-        new_index = self.tab_widget.indexOf(tab)
-        if new_index != -1:
-            self.tab_widget.setCurrentIndex(new_index)
+    def create_placeholder_tab(self, tab_type, comments):
+        """
+        Add a restored tab as an empty page that holds its rows until it is first shown.
 
+        Building the table (one item per cell, colors, reply prefixes) is the slow part of a
+        restore, so it is left to materialize_tab.
 
-        return table # Return the newly created table
+        Args:
+            tab_type (str): Unique tab name
+            comments (list): Rows for populate_table_directly
+
+        Returns:
+            QWidget: The placeholder tab page
+        """
+        tab = self.create_tab_page(tab_type)
+        self.add_tab_page(tab, tab_type)
+        # Registered after adding, so the first tab's currentChanged doesn't build it right away
+        self.pending_tab_rows[tab] = comments
+        return tab
 
 
     def close_tab(self, index, delete_from_db=True):
@@ -866,14 +897,13 @@ class AdminWindow(QMainWindow):
             # (Ensure this doesn't break things if called during deduplication)
             # Maybe skip this part if delete_from_db is False? Or make it safe.
             # Let's assume metadata/selection cleanup is okay even if DB isn't deleted.
-            table_widget = self.tabs[tab_name].findChild(QTableWidget)
-            if table_widget:
-                comments_in_tab = set()
-                for row in range(table_widget.rowCount()):
-                     comment_item = table_widget.item(row, 0)
-                     if comment_item:
-                          comment_text = comment_item.data(Qt.UserRole) or comment_item.text()
-                          comments_in_tab.add(comment_text)
+            table_widget = self.tabs[tab_name].findChild(CommentTableView)
+            # A restored tab that was never shown has no table yet, only its pending rows
+            pending_comments = self.pending_tab_rows.pop(self.tabs[tab_name], None)
+            if table_widget or pending_comments is not None:
+                comments_in_tab = set(comment['comment_text'] for comment in pending_comments or [])
+                if table_widget:
+                     comments_in_tab.update(table_widget.model().comments)
 
                 # Remove associated metadata
                 for comment_text in comments_in_tab:
@@ -926,8 +956,10 @@ class AdminWindow(QMainWindow):
             tab_widget = self.tab_widget.widget(i)
             if not tab_widget: continue
 
-            table = tab_widget.findChild(QTableWidget)
-            if not table: continue
+            # Restored tabs are still placeholders: hash their raw rows, not table items
+            comments = self.pending_tab_rows.get(tab_widget)
+            if not comments: # Skip empty tabs
+                 continue
 
             original_tab_id = tab_widget.property("original_tab_id")
             if original_tab_id is None:
@@ -935,28 +967,8 @@ class AdminWindow(QMainWindow):
                  # Assign a low number to prioritize keeping tabs with valid IDs
                  original_tab_id = -1
 
-            comments = []
-            for row in range(table.rowCount()):
-                item = table.item(row, 0)
-                if item:
-                    # Use UserRole data preferentially as it's the original comment
-                    comment_text = item.data(Qt.UserRole)
-                    if comment_text is None:
-                         comment_text = item.text()
-                         # Strip potential reply prefix if UserRole wasn't used
-                         if isinstance(comment_text, str) and comment_text.startswith(" [↪ Reply] "):
-                              comment_text = comment_text[len(" [↪ Reply] "):]
-                    comments.append(str(comment_text)) # Ensure string conversion
-
-            if not comments: # Skip empty tabs
-                 continue
-
             # Create a consistent signature
-            comments.sort()
-            content_string = "|".join(comments)
-            hasher = hashlib.sha256()
-            hasher.update(content_string.encode('utf-8'))
-            content_hash = hasher.hexdigest()
+            content_hash = tab_content_hash(comment['comment_text'] for comment in comments)
 
             if content_hash not in content_signatures:
                 content_signatures[content_hash] = []
@@ -1011,272 +1023,246 @@ class AdminWindow(QMainWindow):
         """Get the table widget from the current tab"""
         current_tab = self.tab_widget.currentWidget()
         if current_tab:
-            return current_tab.findChild(QTableWidget)
+            return self.get_tab_table(current_tab)
         return None
 
+    def get_tab_table(self, tab_widget):
+        """Get the table widget from a tab, building it first if the tab was restored but not shown yet"""
+        self.materialize_tab(tab_widget)
+        return tab_widget.findChild(CommentTableView)
+
+    def materialize_tab(self, tab_widget):
+        """Build a restored placeholder tab's table from its saved comments the first time it is needed"""
+        comments = self.pending_tab_rows.pop(tab_widget, None)
+        if comments is None:
+            return
+        tab_name = next((name for name, widget in self.tabs.items() if widget is tab_widget), tab_widget.objectName())
+        table = tab_widget.findChild(CommentTableView) or self.build_tab_contents(tab_widget, tab_name)
+        self.populate_table_directly(table, comments)
+        print(f"Built restored tab '{tab_name}' with {table.model().comment_count()} comments")
+
+    def on_tab_changed(self, index):
+        """Populate a restored tab when the user switches to it"""
+        tab_widget = self.tab_widget.widget(index)
+        if tab_widget:
+            self.materialize_tab(tab_widget)
+
     def scrape_comments(self):
         url = self.url_input.text()
         if not url:
             display_message(self, "Error", "Please enter a URL.")
             return
 
-        try:
-            start_time = time.time() # Record start time
-            self.show_loading(True)
-            QApplication.processEvents()
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as temp_file:
-                temp_path = temp_file.name
-            
-            # Use filters instead of include_replies flag
-            scrape_comments(url, temp_path, self.comment_filters)
-            
-            end_time = time.time() # Record end time
-            duration = end_time - start_time
-            print(f"Admin Scraping and initial processing took {duration:.2f} seconds.")
+        start_time = time.time() # Record start time
+        filters = dict(self.comment_filters)
+        refresh = self.refresh_checkbox.isChecked()
+        # Re-scraping a post whose tab is still open only fetches and merges its new comments
+        history_key = f"{self.session_id}|{url}"
+        history = None if refresh else load_scrape_history(history_key)
+        merge_tab = history.get('tab_name') if history and history.get('tab_name') in self.tabs else None
+        # A recent scrape of the same post and actor settings is reused unless a refresh is forced
+        cache_age = None if refresh or merge_tab else cached_scrape_age(url, filters)
+        result_tab = {}
+
+        def prepare():
+            # Runs on the worker thread: comments are filtered and classified page by
+            # page while the scraper is still running, without a temp CSV round trip
+            stats = {
+                'total_comments': 0,
+                'short_comment_count': 0,
+                'name_only_count': 0,
+                'link_comment_count': 0,
+                'emoji_only_count': 0
+            }
+
+            def scraped_rows():
+                # Raw comments are only written to disk if CSV export is turned on
+                for batch in iter_comment_batches(url, filters, save_path=scrape_export_path(),
+                                                  refresh=refresh, incremental=bool(merge_tab),
+                                                  history_key=history_key):
+                    yield self.scraped_comments_to_rows(batch, filters, stats)
+
+                duration = time.time() - start_time
+                print(f"Admin Scraping and analysis took {duration:.2f} seconds.")
+
+            # The counters fill in as pages arrive and are complete once the stream ends
+            return scraped_rows(), stats
+
+        def make_tab_name():
+            if merge_tab:
+                result_tab['name'] = merge_tab
+                return merge_tab
 
-            df = pd.read_csv(temp_path)
-            
-            # Filter out replies if not included
-            if not self.comment_filters.get("includeReplies", True):
-                df = df[~df['Is Reply']]
-
-            # Initialize counters for excluded comments
-            short_comment_count = 0
-            name_only_count = 0
-            link_comment_count = 0
-            emoji_only_count = 0
-            total_comments = len(df)
-            
-            # Function to check if a comment is likely a name-only comment
-            def is_name_only(text):
-                # Convert to lowercase for better comparison
-                text = text.lower()
-                
-                # Check common name patterns
-                name_patterns = [
-                    # Pattern: First Second Third
-                    r"^[A-Za-z]+ [A-Za-z]+ [A-Za-z]+$",
-                    # Pattern: Name @ Name
-                    r"^[A-Za-z]+ @ [A-Za-z]+$",
-                    # Pattern: First Last
-                    r"^[A-Za-z]+ [A-Za-z]+$",
-                    # Tag pattern
-                    r"^@[A-Za-z0-9_]+$"
-                ]
-                
-                # Common Filipino name markers
-                name_markers = [
-                    "kuya", "ate", "tita", "tito", "lola", "lolo", "nanay", "tatay", 
-                    "mommy", "daddy", "mama", "papa", "inay", "itay", "sis", "bro"
-                ]
-                
-                # Check if any word in the comment is a common name marker
-                words = text.split()
-                has_name_marker = any(marker in words for marker in name_markers)
-                
-                # Check against regex patterns
-                matches_pattern = any(re.search(pattern, text, re.IGNORECASE) for pattern in name_patterns)
-                
-                return matches_pattern or has_name_marker
-            
-            # Function to check if comment has fewer words than minimum
-            def is_short_comment(text):
-                # Split by whitespace and count words
-                words = text.strip().split()
-                min_word_count = self.comment_filters.get("minWordCount", 3)
-                return len(words) < min_word_count
-            
-            # Function to check if comment contains links
-            def contains_link(text):
-                # Simple regex to detect URLs
-                url_pattern = r'https?://\S+|www\.\S+'
-                return bool(re.search(url_pattern, text))
-            
-            # Function to check if comment only contains emojis
-            def is_emoji_only(text):
-                # Strip whitespace
-                text = text.strip()
-                if not text:
-                    return False
-                
-                # Check if all characters are emojis or whitespace
-                emoji_pattern = re.compile(
-                    "["
-                    "\U0001F600-\U0001F64F"  # emoticons
-                    "\U0001F300-\U0001F5FF"  # symbols & pictographs
-                    "\U0001F680-\U0001F6FF"  # transport & map symbols
-                    "\U0001F700-\U0001F77F"  # alchemical symbols
-                    "\U0001F780-\U0001F7FF"  # Geometric Shapes
-                    "\U0001F800-\U0001F8FF"  # Supplemental Arrows-C
-                    "\U0001F900-\U0001F9FF"  # Supplemental Symbols and Pictographs
-                    "\U0001FA00-\U0001FA6F"  # Chess Symbols
-                    "\U0001FA70-\U0001FAFF"  # Symbols and Pictographs Extended-A
-                    "\U00002702-\U000027B0"  # Dingbats
-                    "\U000024C2-\U0001F251" 
-                    "]+|[\u2600-\u26FF\u2700-\u27BF]"
-                )
-                
-                # Replace all emojis with empty string
-                text_without_emojis = emoji_pattern.sub('', text)
-                
-                # If after removing emojis and whitespace there's nothing left, it's emoji-only
-                return len(text_without_emojis.strip()) == 0
-            
-            # Get filter settings with defaults
-            exclude_links = self.comment_filters.get("excludeLinks", True)
-            exclude_emojis_only = self.comment_filters.get("excludeEmojisOnly", True)
-            
-            # Create mask for comments to keep
-            keep_mask = pd.Series(True, index=df.index)
-            
-            # Apply filters
-            for idx, row in df.iterrows():
-                text = row['Text']
-                
-                # Check if comment is too short
-                if is_short_comment(text):
-                    keep_mask[idx] = False
-                    short_comment_count += 1
-                    continue
-                
-                # Check if comment is likely just a name
-                if is_name_only(text):
-                    keep_mask[idx] = False
-                    name_only_count += 1
-                    continue
-                
-                # Check if comment contains links and we want to exclude them
-                if exclude_links and contains_link(text):
-                    keep_mask[idx] = False
-                    link_comment_count += 1
-                    continue
-                
-                # Check if comment is emoji-only and we want to exclude them
-                if exclude_emojis_only and is_emoji_only(text):
-                    keep_mask[idx] = False
-                    emoji_only_count += 1
-                    continue
-            
-            # Apply the mask to keep only valid comments
-            filtered_df = df[keep_mask]
-            
-            # Prepare comments data with all needed information
-            comments_data = []
-            
-            for _, row in filtered_df.iterrows():
-                comment_text = row['Text']
-                
-                # Store metadata
-                self.comment_metadata[comment_text] = {
-                    'profile_name': row['Profile Name'],
-                    'profile_picture': row['Profile Picture'],
-                    'date': row['Date'],
-                    'likes_count': row['Likes Count'],
-                    'profile_id': row['Profile ID'],
-                    'is_reply': row['Is Reply'],
-                    'reply_to': row['Reply To']
-                }
-                
-                # Get prediction and confidence
-                prediction, confidence = classify_comment(comment_text)
-                
-                # Add to comments data array
-                comments_data.append({
-                    'comment_text': comment_text,
-                    'prediction': prediction,
-                    'confidence': confidence,
-                    'profile_name': row['Profile Name'],
-                    'profile_picture': row['Profile Picture'],
-                    'comment_date': row['Date'],
-                    'likes_count': row['Likes Count'],
-                    'profile_id': row['Profile ID'],
-                    'is_reply': row['Is Reply'],
-                    'reply_to': row['Reply To']
-                })
-            
             # Create a tab name based on URL
             tab_name = f"Facebook Post {self.url_tab_count}"
             self.url_tab_count += 1
-            
-            # Create table and populate it
-            table = self.create_empty_tab(tab_name)
-            self.populate_table(comments_data, append=False, target_table=table)
-            
-            # Save the initial state
-            self.save_tab_state(tab_name, comments_data)
+            result_tab['name'] = tab_name
+            return tab_name
+
+        def on_complete(comments_data, stats):
+            duration = time.time() - start_time
             
             # Show summary dialog with exclusion statistics and duration
+            short_comment_count = stats['short_comment_count']
+            name_only_count = stats['name_only_count']
+            link_comment_count = stats['link_comment_count']
+            emoji_only_count = stats['emoji_only_count']
+            # Repeated comments were inferred once by the classifier
+            duplicate_count = count_duplicates([comment['comment_text'] for comment in comments_data])
             excluded_count = short_comment_count + name_only_count + link_comment_count + emoji_only_count
             filter_summary = ""
-            if excluded_count > 0:
-                min_word_count = self.comment_filters.get("minWordCount", 3)
+            if excluded_count > 0 or duplicate_count > 0:
+                min_word_count = filters.get("minWordCount", 3)
                 filter_summary = (
                     f"<b>Comments Filter Summary:</b><br>"
-                    f"Total comments found: {total_comments}<br>"
+                    f"Total comments found: {stats['total_comments']}<br>"
                     f"Comments excluded: {excluded_count}<br>"
                     f"&nbsp;&nbsp;• Short comments (&lt; {min_word_count} words): {short_comment_count}<br>"
                     f"&nbsp;&nbsp;• Name-only comments: {name_only_count}<br>"
                     f"&nbsp;&nbsp;• Comments with links: {link_comment_count}<br>"
-                    f"&nbsp;&nbsp;• Emoji-only comments: {emoji_only_count}<br><br>"
+                    f"&nbsp;&nbsp;• Emoji-only comments: {emoji_only_count}<br>"
+                    f"Duplicate comments (analyzed once): {duplicate_count}<br><br>"
                     f"Comments displayed: {len(comments_data)}"
                 )
             
             duration_summary = f"<b>Processing Time:</b><br>Scraping and analysis took {duration:.2f} seconds."            
             
             final_message = filter_summary + ("<br><br>" if filter_summary else "") + duration_summary
+            if cache_age is not None:
+                final_message += (f"<br><br><b>Source:</b><br>Cached scrape from {format_age(cache_age)} ago. "
+                                  f"Check Force refresh to scrape the post again.")
+                self.mark_cached_tab(result_tab['name'], cache_age)
+            if merge_tab:
+                final_message = (f"<b>Update:</b><br>{len(comments_data)} new comments merged into "
+                                 f"'{merge_tab}'.<br><br>" + final_message)
+            # Later scrapes of this post merge into the same tab
+            update_scrape_history(history_key, tab_name=result_tab['name'])
             
             QMessageBox.information(self, "Scraping Results", final_message)
             
             # Log the action
             log_user_action(self.current_user, f"Scraped FB post: {url[:30]}..." if len(url) > 30 else url)
-            
-        except Exception as e:
-            display_message(self, "Error", f"Error scraping comments: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            self.show_loading(False)  # Hide loading overlay
-    
+
+        if merge_tab:
+            message = "Checking for new comments..."
+        elif cache_age is not None:
+            message = "Loading cached comments..."
+        else:
+            message = "Scraping comments..."
+        self.run_classification_job(message, prepare, make_tab_name, on_complete,
+                                    error_message="Error scraping comments", append=bool(merge_tab))
+
+    def show_scrape_queue(self):
+        """Scrape several Facebook posts concurrently, opening a tab for each post as it finishes"""
+        if self.classification_job and self.classification_job.is_running():
+            display_message(self, "Busy", "Please wait for the current analysis to finish or cancel it.")
+            return
+
+        filters = dict(self.comment_filters)
+
+        def process(url, comments):
+            # Runs on the queue's worker thread
+            stats = {}
+            return self.scraped_comments_to_rows(comments, filters, stats), stats
+
+        dialog = ScrapeQueueDialog(filters, process, self, refresh=self.refresh_checkbox.isChecked())
+        dialog.url_finished.connect(self.add_scraped_tab)
+        # Counts as the running job, so single scrapes wait for the queue
+        self.classification_job = dialog
+        dialog.show()
+
+    def mark_cached_tab(self, tab_name, cache_age=None):
+        """Flag a tab whose comments came from the scrape cache"""
+        if tab_name not in self.tabs:
+            return
+        age = f" from {format_age(cache_age)} ago" if cache_age is not None else ""
+        index = self.tab_widget.indexOf(self.tabs[tab_name])
+        self.tab_widget.setTabToolTip(index, f"{tab_name}\nCached scrape{age} (check Force refresh to re-scrape)")
+
+    def add_scraped_tab(self, url, comments_data, stats, cached=False):
+        """Open a results tab for one post finished by the scrape queue"""
+        tab_name = f"Facebook Post {self.url_tab_count}"
+        self.url_tab_count += 1
+        table = self.create_empty_tab(tab_name)
+        self.enable_dataset_operations(True)
+        for row in comments_data:
+            self.store_comment_metadata(row)
+        self.add_comment_rows(table, comments_data)
+        self.save_tab_state(tab_name, comments_data)
+        if cached:
+            self.mark_cached_tab(tab_name)
+        
+        # Log the action
+        log_user_action(self.current_user, f"Scraped FB post: {url[:30]}..." if len(url) > 30 else url)
+
+    def scraped_comments_to_rows(self, comments, filters, stats):
+        """
+        Filter one page of scraped comments and convert it to table rows.
+        
+        Args:
+            comments (list): Comments from the scraper, keyed by its CSV columns
+            filters (dict): Comment filter settings
+            stats (dict): Exclusion counters, updated in place
+            
+        Returns:
+            list: Row dicts ready for classification
+        """
+        df = comments_to_frame(comments)
+        
+        # Filter out replies if not included
+        if not filters.get("includeReplies", True):
+            df = df[~df['Is Reply']]
+
+        filtered_df, batch_stats = filter_comments(df, filters)
+        for key, value in batch_stats.items():
+            stats[key] = stats.get(key, 0) + value
+
+        # Build the rows column-wise instead of with iterrows
+        columns = zip(filtered_df['Text'], filtered_df['Profile Name'], filtered_df['Profile Picture'],
+                      filtered_df['Date'], filtered_df['Likes Count'], filtered_df['Profile ID'],
+                      filtered_df['Is Reply'], filtered_df['Reply To'])
+        rows = []
+        for text, name, picture, date, likes, profile_id, is_reply, reply_to in columns:
+            rows.append({
+                'comment_text': text,
+                'profile_name': name,
+                'profile_picture': picture,
+                'comment_date': date,
+                'likes_count': likes,
+                'profile_id': profile_id,
+                'is_reply': is_reply,
+                'reply_to': reply_to
+            })
+        return rows
+
     def process_csv(self):
         if not self.file_input.text():
             display_message(self, "Error", "Please select a CSV file first")
             return
-        try:
-            self.show_loading(True)  # Show loading overlay
-            QApplication.processEvents()  # Ensure the UI updates
-            
-            file_path = self.file_input.text()
-            
-            # Get just the filename without path and extension for tab naming
-            file_name = os.path.basename(file_path)
-            file_name = os.path.splitext(file_name)[0]
-            
-            log_user_action(self.current_user, f"Started processing CSV file: {file_name}")
-            
+        
+        file_path = self.file_input.text()
+        
+        # Get just the filename without path and extension for tab naming
+        file_name = os.path.basename(file_path)
+        file_name = os.path.splitext(file_name)[0]
+        
+        log_user_action(self.current_user, f"Started processing CSV file: {file_name}")
+
+        def prepare():
+            # Runs on the worker thread: read the CSV and build the rows to classify
             df = pd.read_csv(file_path)
             # Get the first column for comments
             comments = df.iloc[:, 0].astype(str).tolist()
             
-            # Create metadata for CSV comments
-            for comment in comments:
-                if comment not in self.comment_metadata:  # Only add if not already present
-                    self.comment_metadata[comment] = {
-                        'profile_name': 'CSV Input',
-                        'profile_picture': '',
-                        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
-                        'likes_count': 'N/A',
-                        'profile_id': 'N/A'
-                    }
+            duplicate_count = count_duplicates(comments)
+            if duplicate_count:
+                print(f"CSV contains {duplicate_count} duplicate comments; each unique comment is analyzed once.")
             
             # Create comment data array with all needed information
-            comments_data = []
+            rows = []
             for comment in comments:
-                prediction, confidence = classify_comment(comment)
-                comments_data.append({
+                rows.append({
                     'comment_text': comment,
-                    'prediction': prediction,
-                    'confidence': confidence,
                     'profile_name': 'CSV Input',
                     'profile_picture': '',
                     'comment_date': time.strftime('%Y-%m-%d %H:%M:%S'),
@@ -1285,28 +1271,111 @@ class AdminWindow(QMainWindow):
                     'is_reply': False,
                     'reply_to': None
                 })
-            
+            return rows, {'duplicate_count': duplicate_count}
+
+        def make_tab_name():
             # Create tab name based on CSV file
             tab_name = f"CSV {self.csv_tab_count}: {file_name}"
             self.csv_tab_count += 1
-            
-            # Create table and populate it - explicitly passing the tab_name
-            table = self.create_empty_tab(tab_name)
-            
-            # Always use append=False for new CSV data to replace any existing content
-            self.populate_table(comments_data, append=False, target_table=table)
-            
-            # Save the state
-            self.save_tab_state(tab_name, comments_data)
-            
+            return tab_name
+
+        def on_complete(comments_data, stats):
             log_user_action(self.current_user, f"Successfully processed CSV file: {file_name}")
-            
-        except Exception as e:
-            display_message(self, "Error", f"Error reading CSV file: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            self.show_loading(False)  # Hide loading overlay
+
+        # CSV rows don't replace metadata already known for the same comment
+        self.run_classification_job("Processing CSV...", prepare, make_tab_name, on_complete,
+                                    error_message="Error reading CSV file", overwrite_metadata=False)
+
+    def run_classification_job(self, message, prepare, make_tab_name, on_complete,
+                               error_message="Error analyzing comments", overwrite_metadata=True,
+                               append=False):
+        """
+        Classify rows on a background thread, appending them to a new tab as batches finish.
+        
+        Args:
+            message (str): Loading overlay message
+            prepare (callable): Runs on the worker thread and returns (rows, stats)
+            make_tab_name (callable): Returns the new tab's name once the rows are ready
+            on_complete (callable): Called with (rows, stats) when every row is classified
+            error_message (str): Prefix for the error dialog if the job fails
+            overwrite_metadata (bool): Replace comment_metadata already stored for a comment
+            append (bool): Merge the rows into an existing tab; prepare yields only new comments
+        """
+        if self.classification_job and self.classification_job.is_running():
+            display_message(self, "Busy", "Please wait for the current analysis to finish or cancel it.")
+            return
+
+        job = ClassificationJob(self, self.loading_overlay, prepare, message)
+        state = {'stats': {}}
+
+        def open_tab():
+            tab_name = make_tab_name()
+            table = self.create_empty_tab(tab_name)
+            self.enable_dataset_operations(True)
+            if tab_name in self.tabs:
+                self.tab_widget.setCurrentWidget(self.tabs[tab_name])
+            return tab_name, table
+
+        # The tab opens with the first rows, so a job that fails first leaves none behind
+        tab = JobTab(open_tab)
+
+        def on_prepared(total, stats):
+            state['stats'] = stats
+
+        def on_batch(rows):
+            table = tab.ensure()
+            for row in rows:
+                self.store_comment_metadata(row, overwrite_metadata)
+            # Merges trust the scraper's ID check; a repeated text is a distinct comment
+            self.add_comment_rows(table, rows)
+
+        def on_done(rows, cancelled):
+            self.url_input.clear()
+            self.file_input.clear()
+            if cancelled and not tab.is_open():
+                return
+            # A job that finds no rows still gets its (empty) tab
+            tab.ensure()
+            
+            # Save the (possibly partial) state; a merge only adds the new rows
+            self.save_tab_state(tab.name, rows, append=append)
+            
+            if cancelled:
+                log_user_action(self.current_user, f"Cancelled analysis for tab: {tab.name}")
+                QMessageBox.information(
+                    self, "Analysis Cancelled",
+                    f"Analysis was cancelled. The {len(rows)} comments analyzed so far "
+                    f"were kept in '{tab.name}'."
+                )
+            else:
+                on_complete(rows, state['stats'])
+
+        def on_error(error):
+            self.url_input.clear()
+            self.file_input.clear()
+            display_message(self, "Error", f"{error_message}: {error}")
+
+        job.worker.prepared.connect(on_prepared)
+        job.worker.batch_ready.connect(on_batch)
+        job.worker.finished.connect(lambda rows: on_done(rows, False))
+        job.worker.cancelled.connect(lambda rows: on_done(rows, True))
+        job.worker.failed.connect(on_error)
+        self.classification_job = job
+        job.start()
+
+    def store_comment_metadata(self, row, overwrite=True):
+        """Remember an analyzed row's profile details for the details panel."""
+        comment_text = row['comment_text']
+        if overwrite or comment_text not in self.comment_metadata:
+            self.comment_metadata[comment_text] = {
+                'profile_name': row['profile_name'],
+                'profile_picture': row['profile_picture'],
+                'date': row['comment_date'],
+                'likes_count': row['likes_count'],
+                'profile_id': row['profile_id'],
+                'is_reply': row['is_reply'],
+                'reply_to': row['reply_to']
+            }
 
     def analyze_single(self):
         if not self.text_input.text():
@@ -1370,44 +1439,7 @@ class AdminWindow(QMainWindow):
                 display_message(self, "Warning", warning_text)
 
             # Now gather ALL comments from the Direct Inputs tab to save the complete state
-            all_comments_data = []
-            
-            # Iterate through all rows in the table
-            for row in range(table.rowCount()):
-                row_comment_item = table.item(row, 0)
-                row_prediction_item = table.item(row, 1)
-                row_confidence_item = table.item(row, 2)
-                
-                if row_comment_item and row_prediction_item and row_confidence_item:
-                    # Get the stored comment text (using UserRole if available)
-                    row_comment_text = row_comment_item.data(Qt.UserRole) or row_comment_item.text()
-                    row_prediction = row_prediction_item.text()
-                    
-                    # Get confidence - strip "%" and convert to float
-                    try:
-                        row_confidence_text = row_confidence_item.text()
-                        row_confidence = float(row_confidence_text.strip('%'))
-                    except:
-                        row_confidence = 0.0
-                    
-                    # Get metadata for this comment
-                    metadata = self.comment_metadata.get(row_comment_text, {})
-                    
-                    # Create data dictionary for this row
-                    row_data = {
-                        'comment_text': row_comment_text,
-                        'prediction': row_prediction,
-                        'confidence': row_confidence,
-                        'profile_name': metadata.get('profile_name', 'Direct Input'),
-                        'profile_picture': metadata.get('profile_picture', ''),
-                        'comment_date': metadata.get('date', time.strftime('%Y-%m-%d %H:%M:%S')),
-                        'likes_count': metadata.get('likes_count', 'N/A'),
-                        'profile_id': metadata.get('profile_id', 'N/A'),
-                        'is_reply': metadata.get('is_reply', False),
-                        'reply_to': metadata.get('reply_to', None)
-                    }
-                    
-                    all_comments_data.append(row_data)
+            all_comments_data = self.table_comment_rows(table, 'Direct Input')
             
             # Save the complete tab state with ALL comments
             self.save_tab_state(tab_name, all_comments_data)
@@ -1482,6 +1514,7 @@ class AdminWindow(QMainWindow):
                 if msg.clickedButton() == replace_button:
                     # Remove existing tab widget reference (don't remove from tab_widget yet)
                     if file_name in self.tabs:
+                        self.pending_tab_rows.pop(self.tabs[file_name], None)
                         self.tabs[file_name].deleteLater() # Clean up old widget
                         del self.tabs[file_name]
                         # Find the actual index to remove
@@ -1639,7 +1672,7 @@ class AdminWindow(QMainWindow):
             table = target_table
         elif append and tab_name in self.tabs:
              # If appending and tab exists, get its table
-             table = self.tabs[tab_name].findChild(QTableWidget)
+             table = self.get_tab_table(self.tabs[tab_name])
         else:
              # Otherwise, create a new tab/table (handles replacement logic internally if name exists)
              table = self.create_empty_tab(tab_name)
@@ -1649,73 +1682,10 @@ class AdminWindow(QMainWindow):
 
         # Clear existing rows ONLY if not appending
         if not append:
-            table.setRowCount(0)
-        
-        # Create a set of existing comments in the table if appending
-        existing_comments_in_table = set()
-        if append:
-            for row in range(table.rowCount()):
-                item = table.item(row, 0)
-                if item:
-                    existing_comments_in_table.add(item.data(Qt.UserRole) or item.text())
-
-        for comment in comment_data:
-            # Skip if appending and comment already exists
-            comment_text = comment.get('comment_text', '')
-            if append and comment_text in existing_comments_in_table:
-                continue
-            
-            metadata = self.comment_metadata.get(comment_text, {})
-            is_reply = metadata.get('is_reply', False)
-            
-            prediction = comment.get('prediction', '')
-            confidence = comment.get('confidence', 0.0)
-            
-            row_position = table.rowCount()
-            table.insertRow(row_position)
-
-            # Create display text with reply indicator
-            display_text = comment_text
-            if is_reply:
-                reply_to = metadata.get('reply_to', '')
-                comment_item = QTableWidgetItem(display_text)
-                comment_item.setData(Qt.UserRole, comment_text)  # Store original comment
-                comment_item.setData(Qt.DisplayRole, f" [↪ Reply] {display_text}") 
-                comment_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            else:
-                comment_item = QTableWidgetItem(display_text)
-                comment_item.setData(Qt.UserRole, comment_text)
-                comment_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-            # Add subtle background color for reply comments
-            if is_reply:
-                lighter_surface = QColor(COLORS['surface']).lighter(105)
-                comment_item.setBackground(lighter_surface)
-
-            # Set prediction cell
-            prediction_item = QTableWidgetItem(prediction)
-            prediction_item.setTextAlignment(Qt.AlignCenter)
-            if prediction == "Potentially Harmful":
-                prediction_item.setForeground(QColor(COLORS['potentially_harmful']))
-            elif prediction == "Requires Review":
-                prediction_item.setForeground(QColor(COLORS['requires_attention']))
-            elif prediction == "Likely Appropriate":
-                prediction_item.setForeground(QColor(COLORS['likely_appropriate']))
-
-            # Display confidence (0-100) in the third column with %
-            confidence_text = f"{confidence:.2f}%" # Format to 2 decimal places and add %
-            confidence_item = QTableWidgetItem(confidence_text)
-            confidence_item.setTextAlignment(Qt.AlignCenter)
-
-            table.setItem(row_position, 0, comment_item)
-            table.setItem(row_position, 1, prediction_item)
-            table.setItem(row_position, 2, confidence_item) # Add to 3rd column
-
-            table.resizeRowToContents(row_position)
-
-            if comment_text in self.selected_comments:
-                for col in range(table.columnCount()):
-                    table.item(row_position, col).setBackground(QColor(COLORS['highlight']))
+            table.model().clear()
+        
+        # Appending merges into the tab, skipping comments it already shows
+        self.add_comment_rows(table, comment_data, skip_existing=append)
 
         # Reset sort dropdown to default (index 0) when replacing table content
         if not append and hasattr(table, 'sort_combo'):
@@ -1738,132 +1708,63 @@ class AdminWindow(QMainWindow):
             action_type = "Loaded" if append else "Created"
             log_user_action(self.current_user, f"{action_type} tab: {tab_name}")
 
+    def add_comment_rows(self, table, comments, skip_existing=False):
+        """Append analyzed comments to a results table's model in one step (skip_existing when merging)."""
+        texts = [comment.get('comment_text', '') for comment in comments]
+        selected_texts = self.selected_comment_texts()
+        table.model().append_rows(
+            texts,
+            [comment.get('prediction', '') for comment in comments],
+            [comment.get('confidence', 0.0) for comment in comments],
+            is_reply=[self.comment_metadata.get(text, {}).get('is_reply', False) for text in texts],
+            selected=[text in selected_texts for text in texts],
+            skip_existing=skip_existing,
+        )
+
+    def selected_comment_texts(self):
+        """Texts of the comments on the user's list (entries are dicts, or plain strings in the old format)"""
+        return {item.get('comment') if isinstance(item, dict) else item for item in self.selected_comments}
+
+    def table_comment_rows(self, table, default_profile_name):
+        """Every comment in a table as a row for save_tab_state, with its stored metadata"""
+        model = table.model()
+        rows = []
+        for comment_text, prediction, confidence in zip(model.comments, model.labels, model.confidences):
+            metadata = self.comment_metadata.get(comment_text, {})
+            rows.append({
+                'comment_text': comment_text,
+                'prediction': prediction,
+                'confidence': float(confidence),
+                'profile_name': metadata.get('profile_name', default_profile_name),
+                'profile_picture': metadata.get('profile_picture', ''),
+                'comment_date': metadata.get('date', time.strftime('%Y-%m-%d %H:%M:%S')),
+                'likes_count': metadata.get('likes_count', 'N/A'),
+                'profile_id': metadata.get('profile_id', 'N/A'),
+                'is_reply': metadata.get('is_reply', False),
+                'reply_to': metadata.get('reply_to', None)
+            })
+        return rows
+
     def sort_table(self, table):
-        """Sort table based on selected criteria using custom logic."""
-        sort_combo = table.sort_combo
-        index = sort_combo.currentIndex()
-        
-        # Disable sorting during the process
-        table.setSortingEnabled(False)
-
-        # --- Reply Filtering --- 
-        if index == 5:  # "Show Replies Only"
-            for row in range(table.rowCount()):
-                comment_item = table.item(row, 0)
-                # Check UserRole first for original text
-                is_reply = False
-                if comment_item:
-                    metadata = self.comment_metadata.get(comment_item.data(Qt.UserRole) or comment_item.text(), {})
-                    is_reply = metadata.get('is_reply', False)
-                table.setRowHidden(row, not is_reply)
-            # Re-enable sorting after filtering
-            # table.setSortingEnabled(True) # Keep disabled, manual sort below
-            return # Exit after filtering
-        else:
-            # Ensure all rows are visible if not filtering replies
-            for row in range(table.rowCount()):
-                table.setRowHidden(row, False)
-
-        # --- Custom Sorting Logic --- 
-        # Get data for sorting
-        all_rows_data = []
-        for row in range(table.rowCount()):
-            comment_item = table.item(row, 0)
-            prediction_item = table.item(row, 1)
-            confidence_item = table.item(row, 2)
-            
-            if not (comment_item and prediction_item and confidence_item):
-                # Skip rows with missing items to avoid errors
-                continue 
-
-            # Get original comment text (prefer UserRole)
-            comment_text = comment_item.data(Qt.UserRole) or comment_item.text()
-            # Clean potential display prefix if fallback to text() was used
-            if comment_text.startswith(" [↪ Reply] "):
-                 comment_text = comment_text[len(" [↪ Reply] "):]
-            
-            prediction_text = prediction_item.text()
-            
-            # Get numerical confidence
-            confidence_value = 0.0
-            try:
-                # Use UserRole for confidence if available (safer)
-                conf_data = confidence_item.data(Qt.UserRole)
-                if conf_data is not None:
-                     confidence_value = float(conf_data)
-                else:
-                     # Fallback: parse text, removing %
-                     confidence_value = float(confidence_item.text().strip('%'))
-            except (ValueError, TypeError):
-                pass # Keep 0.0 if parsing fails
-                
-            all_rows_data.append((row, comment_text, prediction_text, confidence_value))
-
-        # Define sort key based on index
-        sort_key = None
-        reverse_sort = False
-        
-        if index == 0: # Comment A-Z
-            sort_key = lambda item: item[1].lower() # item[1] is comment_text
-        elif index == 1: # Comment Z-A
-            sort_key = lambda item: item[1].lower()
-            reverse_sort = True
-        elif index == 2: # Prediction A-Z
-            sort_key = lambda item: item[2] # item[2] is prediction_text
-        elif index == 3: # Confidence High-Low
-            sort_key = lambda item: item[3] # item[3] is confidence_value
-            reverse_sort = True
-        elif index == 4: # Confidence Low-High
-            sort_key = lambda item: item[3]
-            
-        # Perform the sort if a key is defined
-        if sort_key:
-            all_rows_data.sort(key=sort_key, reverse=reverse_sort)
+        """Sort the table's model by the selected criteria, or show only replies."""
+        index = table.sort_combo.currentIndex()
+        model = table.model()
 
-        # --- Reorder Table Rows --- 
-        # This part can be slow for large tables, but is necessary for custom sort
-        current_row_mapping = {data[0]: data for data in all_rows_data}
-        
-        # Temporarily block signals to avoid triggering updates during move
-        table.blockSignals(True)
-        
-        # Move rows according to the sorted order
-        target_row = 0
-        processed_original_rows = set()
-        
-        # Iterate through the desired sorted order
-        for original_row_index, _, _, _ in all_rows_data:
-            if original_row_index in processed_original_rows:
-                 continue # Skip if this original row was already moved
-            
-            # Find the current visual position of the original row
-            current_visual_row = -1
-            for r in range(table.rowCount()):
-                item = table.item(r, 0)
-                if item and (item.data(Qt.UserRole) or item.text()) == current_row_mapping[original_row_index][1]:
-                    current_visual_row = r
-                    break
-            
-            if current_visual_row != -1 and current_visual_row != target_row:
-                # Insert a new row at the target position
-                table.insertRow(target_row)
-                
-                # Move items from the current visual row to the target row
-                for col in range(table.columnCount()):
-                    item_to_move = table.takeItem(current_visual_row + 1, col) # +1 because we inserted a row
-                    table.setItem(target_row, col, item_to_move)
-                    
-                # Remove the now empty original row (which shifted down)
-                table.removeRow(current_visual_row + 1)
-                
-            processed_original_rows.add(original_row_index)
-            target_row += 1
-            
-        # Unblock signals
-        table.blockSignals(False)
-        
-        # Optional: re-enable default sorting if desired, but manual sort is done
-        # table.setSortingEnabled(True)
+        # --- Reply Filtering ---
+        model.set_replies_only(index == 5) # "Show Replies Only"
+        if index == 5:
+            return
+
+        # --- Sorting (reorders the model's arrays) ---
+        sort_orders = {
+            0: (COMMENT_COLUMN, Qt.AscendingOrder),     # Comment A-Z
+            1: (COMMENT_COLUMN, Qt.DescendingOrder),    # Comment Z-A
+            2: (LABEL_COLUMN, Qt.AscendingOrder),       # Prediction A-Z
+            3: (CONFIDENCE_COLUMN, Qt.DescendingOrder), # Confidence High-Low
+            4: (CONFIDENCE_COLUMN, Qt.AscendingOrder),  # Confidence Low-High
+        }
+        if index in sort_orders:
+            model.sort(*sort_orders[index])
 
     def update_details_panel(self):
         """Update the details panel with selected comment information"""
@@ -1871,8 +1772,8 @@ class AdminWindow(QMainWindow):
         if not table:
             return
             
-        selected_items = table.selectedItems()
-        if not selected_items:
+        row = table.selected_row()
+        if row == -1:
             self.details_text_edit.clear()
             self.add_remove_button.setEnabled(False)
             self.export_selected_button.setEnabled(False)
@@ -1884,20 +1785,13 @@ class AdminWindow(QMainWindow):
         self.export_selected_button.setEnabled(True)
         self.enable_dataset_operations(True)
 
-        row = selected_items[0].row()
-        comment_item = table.item(row, 0)
-        comment = comment_item.data(Qt.UserRole) or comment_item.text()
-        prediction = table.item(row, 1).text()
-        confidence = table.item(row, 2).text()
+        comment, prediction, confidence_value = table.model().row_values(row)
+        confidence = f"{confidence_value:.2f}%"
         
         metadata = self.comment_metadata.get(comment, {})
         
         # Check if this comment is in the selected list and update add/remove button text
-        in_selected_list = False
-        for item in self.selected_comments:
-            if (isinstance(item, dict) and item.get('comment') == comment) or (isinstance(item, str) and item == comment):
-                in_selected_list = True
-                break
+        in_selected_list = comment in self.selected_comment_texts()
                 
         if in_selected_list:
             self.add_remove_button.setText("➖ Remove from List")
@@ -1934,15 +1828,9 @@ class AdminWindow(QMainWindow):
 
             # Find row number logic (remains the same)
             row_num_str = "N/A"
-            current_table = self.get_current_table()
-            if current_table:
-                for i in range(current_table.rowCount()):
-                     parent_item = current_table.item(i, 0)
-                     # Use UserRole first for matching original text
-                     original_parent_text_from_item = parent_item.data(Qt.UserRole) if parent_item else None
-                     if original_parent_text_from_item == parent_text:
-                          row_num_str = str(i+1)
-                          break
+            parent_row = table.model().find_row(parent_text)
+            if parent_row != -1:
+                 row_num_str = str(parent_row + 1)
 
             self.details_text_edit.append(make_text("Row #", row_num_str))
             self.details_text_edit.append(make_text("Replying to", "[AUTHOR]")) # Redacted name
@@ -1961,20 +1849,14 @@ class AdminWindow(QMainWindow):
         self.details_text_edit.append(make_text("Status", status_text))
 
     def toggle_list_status(self):
-        selected_items = self.get_current_table().selectedItems()
-        if not selected_items:
+        table = self.get_current_table()
+        row = table.selected_row()
+        if row == -1:
             display_message(self, "Error", "Please select a comment to add or remove")
             return
 
-        row = selected_items[0].row()
-        table = self.get_current_table()
-        comment_item = table.item(row, 0)
-        prediction_item = table.item(row, 1)
-        confidence_item = table.item(row, 2)
-        
-        comment = comment_item.data(Qt.UserRole) or comment_item.text()
-        prediction = prediction_item.text()
-        confidence = confidence_item.text()
+        comment, prediction, confidence_value = table.model().row_values(row)
+        confidence = f"{confidence_value:.2f}%"
         
         # Check if this comment is already in the selected comments list
         for i, item in enumerate(self.selected_comments):
@@ -1983,8 +1865,7 @@ class AdminWindow(QMainWindow):
                 self.selected_comments.pop(i)
                 display_message(self, "Success", "Comment removed from list")
                 # Reset row color
-                for col in range(table.columnCount()):
-                    table.item(row, col).setBackground(QColor(COLORS['normal']))
+                table.model().set_selected(comment, False)
                 self.update_details_panel()
                 return
             elif isinstance(item, str) and item == comment:
@@ -1992,8 +1873,7 @@ class AdminWindow(QMainWindow):
                 self.selected_comments.pop(i)
                 display_message(self, "Success", "Comment removed from list")
                 # Reset row color
-                for col in range(table.columnCount()):
-                    table.item(row, col).setBackground(QColor(COLORS['normal']))
+                table.model().set_selected(comment, False)
                 self.update_details_panel()
                 return
                 
@@ -2005,8 +1885,7 @@ class AdminWindow(QMainWindow):
         })
         display_message(self, "Success", "Comment added to list")
         # Highlight row color
-        for col in range(table.columnCount()):
-            table.item(row, col).setBackground(QColor(COLORS['highlight']))
+        table.model().set_selected(comment, True)
         self.update_details_panel()
 
     def export_selected(self):
@@ -2038,13 +1917,11 @@ class AdminWindow(QMainWindow):
                         confidence = "Unknown"
                         
                         # Look for this comment in current table
-                        table = self.get_current_table()
-                        for row in range(table.rowCount()):
-                            comment_item = table.item(row, 0)
-                            if comment_item and (comment_item.data(Qt.UserRole) == comment or comment_item.text() == comment):
-                                prediction = table.item(row, 1).text()
-                                confidence = table.item(row, 2).text()
-                                break
+                        model = self.get_current_table().model()
+                        if model.contains(comment):
+                            i = model.row_of_comment[comment]
+                            prediction = model.labels[i]
+                            confidence = f"{model.confidences[i]:.2f}%"
                         
                         export_data.append([comment, prediction, confidence])
                 
@@ -2056,33 +1933,23 @@ class AdminWindow(QMainWindow):
 
     def export_all(self):
         table = self.get_current_table()
-        if not table or table.rowCount() == 0:
+        if not table or table.model().comment_count() == 0:
             display_message(self, "Info", "No comments to export")
             return
 
-        # Prepare data for export
+        # Prepare data for export straight from the model's columns
+        model = table.model()
         export_data = []
         header = ["Comment", "Prediction", "Confidence", "Commenter", "Date", "Likes", "Profile ID", "Is Reply", "Reply To"]
 
-        for row in range(table.rowCount()):
-            comment_item = table.item(row, 0)
-            prediction_item = table.item(row, 1)
-            confidence_item = table.item(row, 2)
-            
-            if not comment_item or not prediction_item or not confidence_item:
-                continue
-                
-            comment_text = comment_item.data(Qt.UserRole) or comment_item.text()
-            prediction = prediction_item.text()
-            confidence = confidence_item.text() # Get confidence string (e.g., "85.00%")
-
+        for comment_text, prediction, confidence in zip(model.comments, model.labels, model.confidence_texts()):
             # Get metadata
             metadata = self.comment_metadata.get(comment_text, {})
             
             export_data.append([
                 comment_text,
                 prediction,
-                confidence, # Use the formatted string directly
+                confidence, # Formatted as the table shows it (e.g., "85.00%")
                 "[AUTHOR]", # Redacted name
                 metadata.get('date', 'N/A'),
                 metadata.get('likes_count', 'N/A'),
@@ -2104,42 +1971,18 @@ class AdminWindow(QMainWindow):
     def show_summary(self):
         """Show summary with counts, ratios, and a pie chart for the three-level guidance system."""
         table = self.get_current_table()
-        if not table or table.rowCount() == 0:
+        if not table or table.model().comment_count() == 0:
             display_message(self, "Info", "No comments to summarize")
             return
 
-        total_comments = table.rowCount()
-        potentially_harmful_count = 0
-        requires_review_count = 0 # Changed from needs_review_count
-        likely_appropriate_count = 0
-        confidences = [] # Collect confidences
+        # Count labels and average confidence (0-100) over the model's columns
+        model = table.model()
+        total_comments = model.comment_count()
+        potentially_harmful_count = int(np.count_nonzero(model.labels == "Potentially Harmful"))
+        requires_review_count = int(np.count_nonzero(model.labels == "Requires Review"))
+        likely_appropriate_count = int(np.count_nonzero(model.labels == "Likely Appropriate"))
 
-        for row in range(total_comments):
-            comment_item = table.item(row, 0)
-            prediction_item = table.item(row, 1)
-            confidence_item = table.item(row, 2) # Get confidence item from 3rd column
-            
-            if not comment_item or not prediction_item or not confidence_item:
-                continue
-            
-            # Get prediction label from 2nd column
-            prediction = prediction_item.text()
-            
-            # Get confidence score (0-100) from 3rd column
-            try:
-                confidence = float(confidence_item.text().strip('%')) # Read float, remove %
-                confidences.append(confidence)
-            except ValueError:
-                pass # Ignore if not a valid float
-
-            if prediction == "Potentially Harmful":
-                potentially_harmful_count += 1
-            elif prediction == "Requires Review": # Changed from Needs Review
-                requires_review_count += 1
-            elif prediction == "Likely Appropriate":
-                likely_appropriate_count += 1
-
-        avg_confidence = np.mean(confidences) if confidences else 0
+        avg_confidence = model.confidences.mean() if total_comments else 0
 
         # Calculate ratios
         harmful_ratio = (potentially_harmful_count / total_comments) if total_comments > 0 else 0
@@ -2211,16 +2054,11 @@ class AdminWindow(QMainWindow):
     def show_word_cloud(self):
         """Generate and display word cloud visualization"""
         table = self.get_current_table()
-        if not table or table.rowCount() == 0:
+        if not table or table.model().comment_count() == 0:
             display_message(self, "Error", "No comments to visualize")
             return
 
-        all_comments = []
-        for row in range(table.rowCount()):
-            comment_item = table.item(row, 0)
-            if comment_item:
-                comment = comment_item.data(Qt.UserRole) or comment_item.text()
-                all_comments.append(comment)
+        all_comments = list(table.model().comments)
 
         try:
             # Preprocess comments
@@ -2397,34 +2235,21 @@ class AdminWindow(QMainWindow):
                  if widget:
                       widget.deleteLater()
             self.tabs = {}
+            self.pending_tab_rows = {}
             # Prepare data structures: clear selected_comments, comment_metadata
             self.selected_comments = []
             self.comment_metadata = {}
 
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            # Fetch tabs from DB
-            cursor.execute("""
-                SELECT tab_id, tab_name, tab_type
-                FROM session_tabs
-                WHERE session_id = ?
-                ORDER BY tab_id
-            """, (self.session_id,))
-            tabs_from_db = cursor.fetchall()
+            selected_texts = set() # Texts already in self.selected_comments
+
+            # Fetch all tabs and their comments in one round trip
+            with db_connection() as conn:
+                tabs_from_db = load_session_tabs(conn, self.session_id)
             print(f"Found {len(tabs_from_db)} tabs in database for session {self.session_id}")
 
             # Process tabs one by one
-            for tab_id, original_tab_name, tab_type in tabs_from_db:
+            for tab_id, original_tab_name, tab_type, comments_for_tab in tabs_from_db:
                 print(f"Processing tab_id: {tab_id}, original_name: '{original_tab_name}'")
-                # Fetch comments for tab_id
-                cursor.execute("""
-                    SELECT comment_text, prediction, confidence,
-                           profile_name, profile_picture, comment_date,
-                           likes_count, profile_id, is_reply, reply_to, is_selected
-                    FROM tab_comments
-                    WHERE tab_id = ?
-                """, (tab_id,))
-                comments_for_tab = cursor.fetchall()
                 print(f"  Found {len(comments_for_tab)} comments for this tab.")
                 if not comments_for_tab:
                      print(f"  Skipping tab '{original_tab_name}' - no comments found.")
@@ -2442,6 +2267,7 @@ class AdminWindow(QMainWindow):
 
                 # Process comments into list and update metadata/selected
                 comments_data_list = []
+                seen_comments = set()
                 for db_row_index, comment_data in enumerate(comments_for_tab):
                     # ... (Existing logic to parse comment_data into comment_dict) ...
                     (comment_text, prediction, confidence, profile_name,
@@ -2466,7 +2292,10 @@ class AdminWindow(QMainWindow):
                         'is_reply': bool(is_reply),
                         'reply_to': reply_to
                     }
-                    comments_data_list.append(comment_dict)
+                    # Keep the rows the table will show (populate_table_directly skips empty and repeated comments)
+                    if comment_text and comment_text not in seen_comments:
+                        seen_comments.add(comment_text)
+                        comments_data_list.append(comment_dict)
                     # ... (Update self.comment_metadata and self.selected_comments) ...
                     if comment_text and comment_text not in self.comment_metadata:
                         self.comment_metadata[comment_text] = {
@@ -2479,44 +2308,20 @@ class AdminWindow(QMainWindow):
                             'reply_to': reply_to,
                             'confidence': confidence
                         }
-                    if is_selected:
-                         is_already_selected = any(
-                              (isinstance(item, dict) and item.get('comment') == comment_text) or \
-                              (isinstance(item, str) and item == comment_text)
-                              for item in self.selected_comments
-                         )
-                         if not is_already_selected:
-                              self.selected_comments.append({
-                                   'comment': comment_text,
-                                   'prediction': prediction,
-                                   'confidence': confidence
-                              })
-                # Create tab in UI using the final name
-                print(f"  Calling create_empty_tab with name: '{final_tab_name}' (is_restoring=True)")
-                table = self.create_empty_tab(final_tab_name, is_restoring=True)
-
-                if table:
-                    # *** STORE ORIGINAL TAB ID ON THE PARENT TAB WIDGET ***
-                    # Navigate up from QTableWidget -> Layout -> QWidget (the actual tab page)
-                    parent_widget = table.parentWidget()
-                    tab_widget = parent_widget.parentWidget() if parent_widget else None
-
-                    if isinstance(tab_widget, QWidget) and self.tab_widget.indexOf(tab_widget) != -1:
-                         tab_widget.setProperty("original_tab_id", tab_id)
-                         print(f"  Stored original_tab_id ({tab_id}) on tab widget: {tab_widget.objectName()}")
-                    else:
-                         print(f"  Warning: Could not find parent tab widget for table in '{final_tab_name}' to store original_tab_id.")
-
-                    # Populate the table
-                    print(f"  Populating table for tab '{final_tab_name}' with {len(comments_data_list)} comments.")
-                    self.populate_table_directly(table, comments_data_list)
-                    print(f"  Finished populating table for '{final_tab_name}'.")
-                else:
-                    print(f"  Warning: create_empty_tab did not return a table for '{final_tab_name}'.")
+                    if is_selected and comment_text not in selected_texts:
+                         selected_texts.add(comment_text)
+                         self.selected_comments.append({
+                              'comment': comment_text,
+                              'prediction': prediction,
+                              'confidence': confidence
+                         })
+                # Add the tab as a placeholder; its table is built when it is first shown
+                tab_widget = self.create_placeholder_tab(final_tab_name, comments_data_list)
+                tab_widget.setProperty("original_tab_id", tab_id)
+                print(f"  Stored original_tab_id ({tab_id}) on tab widget: {tab_widget.objectName()}")
 
                 print(f"Restored tab '{final_tab_name}' (Original DB ID: {tab_id}, Name: '{original_tab_name}') with {len(comments_data_list)} comments")
 
-            conn.close()
             print("Finished processing all tabs from database.")
 
             # *** CALL DEDUPLICATION AFTER PROCESSING ALL TABS ***
@@ -2528,8 +2333,9 @@ class AdminWindow(QMainWindow):
                  self.initial_message.hide()
                  self.tab_widget.show()
                  self.enable_dataset_operations(True)
-                 if self.tab_widget.currentIndex() == -1: # Select first tab if none is selected
-                      self.tab_widget.setCurrentIndex(0)
+                 # Show the last restored tab, as when each restored tab was selected on creation
+                 self.tab_widget.setCurrentIndex(self.tab_widget.count() - 1)
+                 self.materialize_tab(self.tab_widget.currentWidget()) # Only the visible tab's table is built now
                  self.update_details_panel() # Update details for the currently selected tab
             else:
                  print("No tabs remaining after deduplication. Showing initial message.")
@@ -2548,210 +2354,18 @@ class AdminWindow(QMainWindow):
             traceback.print_exc()
 
     def populate_table_directly(self, table, comments):
-        """Directly populate table with comment data - used for restoring session. Assumes table might already have content from previous restores in the same session, so checks for duplicates."""
-        # Create a set of existing comments IN THIS SPECIFIC TABLE to avoid duplicates within the same restore call
-        existing_comments_in_this_table = set()
-        for row in range(table.rowCount()):
-            comment_item = table.item(row, 0)
-            if comment_item:
-                # Use UserRole first, then text as fallback
-                text = comment_item.data(Qt.UserRole) or comment_item.text()
-                # Handle potential prefix if it's already displayed
-                if text.startswith(" [↪ Reply] "):
-                    text = text[len(" [↪ Reply] "):]
-                existing_comments_in_this_table.add(text)
-
-        for comment in comments:
-            # Skip if already in table
-            comment_text = comment.get('comment_text', '')
-            if not comment_text or comment_text in existing_comments_in_this_table:
-                continue
-                
-            existing_comments_in_this_table.add(comment_text) # Add to set after check
-            
-            prediction = comment.get('prediction', '')
-            # Ensure confidence is float before formatting
-            confidence_val = comment.get('confidence', 0.0)
-            try:
-                confidence = float(confidence_val)
-            except (ValueError, TypeError):
-                confidence = 0.0
-            
-            # Use metadata stored during the restore loop, falling back if needed
-            metadata = self.comment_metadata.get(comment_text, {}) 
-            is_reply = metadata.get('is_reply', False)
-
-            # Insert new row
-            row_position = table.rowCount()
-            table.insertRow(row_position)
-
-            # Set comment cell
-            display_text = comment_text
-            comment_item = QTableWidgetItem() # Create item first
-            comment_item.setData(Qt.UserRole, comment_text) # Store original text
-            if is_reply:
-                reply_to = metadata.get('reply_to', '')
-                comment_item.setData(Qt.DisplayRole, f" [↪ Reply] {display_text}")
-            else:
-                comment_item.setData(Qt.DisplayRole, display_text)
-                
-            comment_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-            # Apply subtle background for replies AFTER setting data
-            if is_reply:
-                lighter_surface = QColor(COLORS['surface']).lighter(105)
-                comment_item.setBackground(lighter_surface)
-
-            # Set prediction cell
-            prediction_item = QTableWidgetItem(prediction)
-            prediction_item.setTextAlignment(Qt.AlignCenter)
-            if prediction == "Cyberbullying":
-                prediction_item.setForeground(QColor(COLORS['bullying']))
-            elif prediction == "Likely Appropriate":
-                prediction_item.setForeground(QColor(COLORS['likely_appropriate']))
-            elif prediction == "Requires Review":
-                prediction_item.setForeground(QColor(COLORS['requires_attention']))
-            else:
-                prediction_item.setForeground(QColor(COLORS['potentially_harmful']))
-            
-            # Set confidence cell (formatted 0-100 with %)
-            confidence_text = f"{confidence:.2f}%" # Format to 2 decimal places and add %
-            confidence_item = QTableWidgetItem(confidence_text)
-            # Store actual float value for potential sorting
-            confidence_item.setData(Qt.UserRole, confidence) 
-            confidence_item.setTextAlignment(Qt.AlignCenter)
-
-            # Add data to table
-            table.setItem(row_position, 0, comment_item)
-            table.setItem(row_position, 1, prediction_item)
-            table.setItem(row_position, 2, confidence_item) # Add to 3rd column
-
-            # Resize row to fit content
-            table.resizeRowToContents(row_position)
-
-            # Highlight if in selected comments (check against the potentially updated self.selected_comments)
-            is_selected_in_list = False
-            for item in self.selected_comments:
-                 if isinstance(item, dict) and item.get('comment') == comment_text:
-                     is_selected_in_list = True
-                     break
-                 elif isinstance(item, str) and item == comment_text:
-                     # Handle legacy string format if still present
-                     is_selected_in_list = True
-                     break
-                     
-            if is_selected_in_list:
-                highlight_color = QColor(COLORS['highlight'])
-                for col in range(table.columnCount()):
-                    current_item = table.item(row_position, col)
-                    if current_item: # Check if item exists before setting background
-                         # Preserve reply background if highlighting
-                         original_bg = current_item.background()
-                         if is_reply and original_bg.isValid() and original_bg != QColor(Qt.transparent):
-                              # Blend highlight with reply color (simple alpha blend)
-                              blended_color = QColor.fromRgbF(
-                                   (highlight_color.redF() * 0.3 + original_bg.redF() * 0.7),
-                                   (highlight_color.greenF() * 0.3 + original_bg.greenF() * 0.7),
-                                   (highlight_color.blueF() * 0.3 + original_bg.blueF() * 0.7)
-                              )
-                              current_item.setBackground(blended_color)
-                         else:
-                              current_item.setBackground(highlight_color)
-
-    def save_tab_state(self, tab_name, comments):
-        """Save tab and its comments to the database"""
+        """Directly populate table with comment data - used for restoring session. Skips empty comments and ones the table already has."""
+        comments = [comment for comment in comments if comment.get('comment_text', '')]
+        # Reply flags come from the metadata stored during the restore loop
+        self.add_comment_rows(table, comments, skip_existing=True)
+
+    def save_tab_state(self, tab_name, comments, append=False):
+        """Save tab and its comments to the database (append adds to the tab's saved comments)"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            # Check if tab already exists for this session
-            cursor.execute("""
-                SELECT tab_id FROM session_tabs 
-                WHERE session_id = ? AND tab_name = ?
-            """, (self.session_id, tab_name))
-            
-            tab_result = cursor.fetchone()
-            
-            if tab_result:
-                # Tab exists, get its ID
-                tab_id = tab_result[0]
-                
-                # Delete existing comments for this tab to avoid duplicates
-                cursor.execute("""
-                    DELETE FROM tab_comments 
-                    WHERE tab_id = ?
-                """, (tab_id,))
-            else:
-                # Create new tab record
-                cursor.execute("""
-                    INSERT INTO session_tabs (session_id, tab_name, tab_type)
-                    VALUES (?, ?, ?)
-                """, (self.session_id, tab_name, "analysis"))
-                
-                tab_id = cursor.execute("SELECT @@IDENTITY").fetchval()
-            
-            # Save each comment
-            for comment in comments:
-                try:
-                    metadata = self.comment_metadata.get(comment.get('comment_text', ''), {})
-                    
-                    # Get prediction and confidence from the comment data
-                    prediction = comment.get('prediction', '')
-                    confidence = comment.get('confidence', 0.0)
-                    
-                    # Handle likes_count - ensure it's a valid float or NULL
-                    likes_count = metadata.get('likes_count')
-                    try:
-                        likes_count = float(likes_count) if likes_count not in ('N/A', '', None) else None
-                    except (ValueError, TypeError):
-                        likes_count = None
-                    
-                    # Clean up text fields to handle emojis and special characters
-                    def clean_text(value):
-                        if value is None:
-                            return ''
-                        # Convert float/int to string if needed
-                        if isinstance(value, (float, int)):
-                            value = str(value)
-                        # Handle string encoding
-                        try:
-                            return value.encode('ascii', 'ignore').decode()
-                        except AttributeError:
-                            return str(value)
-                    
-                    clean_comment = clean_text(comment.get('comment_text', ''))
-                    clean_profile_name = clean_text(metadata.get('profile_name', ''))
-                    clean_profile_picture = clean_text(metadata.get('profile_picture', ''))
-                    clean_reply_to = clean_text(metadata.get('reply_to', ''))
-                    
-                    cursor.execute("""
-                        INSERT INTO tab_comments (
-                            tab_id, comment_text, prediction, confidence,
-                            profile_name, profile_picture, comment_date,
-                            likes_count, profile_id, is_reply, reply_to, is_selected
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        tab_id,
-                        clean_comment,
-                        prediction,
-                        confidence,  # Store actual confidence value
-                        clean_profile_name,
-                        clean_profile_picture,
-                        metadata.get('date'),
-                        likes_count,
-                        metadata.get('profile_id'),
-                        float(bool(metadata.get('is_reply', False))),
-                        clean_reply_to,
-                        clean_comment in self.selected_comments
-                    ))
-                    
-                except Exception as e:
-                    print(f"Error saving comment {comment}: {e}")
-                    continue
-            
-            conn.commit()
-            conn.close()
-            
+            # One transaction; the comments go in as batched bulk inserts
+            with db_connection() as conn:
+                save_tab_comments(conn, self.session_id, tab_name, comments,
+                                  self.comment_metadata, self.selected_comment_texts(), append)
         except Exception as e:
             print(f"Tab save error: {e}")
 
@@ -2763,47 +2377,14 @@ class AdminWindow(QMainWindow):
                 for tab_name, tab_widget in self.tabs.items():
                     try:
                         # Get the table from this tab
-                        table = tab_widget.findChild(QTableWidget)
-                        if not table:
+                        table = tab_widget.findChild(CommentTableView)
+                        if not table and tab_widget not in self.pending_tab_rows:
                             continue
                             
-                        # Gather all comments from this tab
-                        tab_comments = []
-                        for row in range(table.rowCount()):
-                            row_comment_item = table.item(row, 0)
-                            row_prediction_item = table.item(row, 1)
-                            row_confidence_item = table.item(row, 2)
-                            
-                            if row_comment_item and row_prediction_item and row_confidence_item:
-                                # Get the stored comment text (using UserRole if available)
-                                row_comment_text = row_comment_item.data(Qt.UserRole) or row_comment_item.text()
-                                row_prediction = row_prediction_item.text()
-                                
-                                # Get confidence
-                                try:
-                                    row_confidence_text = row_confidence_item.text()
-                                    row_confidence = float(row_confidence_text.strip('%'))
-                                except:
-                                    row_confidence = 0.0
-                                
-                                # Get metadata
-                                metadata = self.comment_metadata.get(row_comment_text, {})
-                                
-                                # Create data dictionary
-                                row_data = {
-                                    'comment_text': row_comment_text,
-                                    'prediction': row_prediction,
-                                    'confidence': row_confidence,
-                                    'profile_name': metadata.get('profile_name', 'Direct Input'),
-                                    'profile_picture': metadata.get('profile_picture', ''),
-                                    'comment_date': metadata.get('date', time.strftime('%Y-%m-%d %H:%M:%S')),
-                                    'likes_count': metadata.get('likes_count', 'N/A'),
-                                    'profile_id': metadata.get('profile_id', 'N/A'),
-                                    'is_reply': metadata.get('is_reply', False),
-                                    'reply_to': metadata.get('reply_to', None)
-                                }
-                                
-                                tab_comments.append(row_data)
+                        # Gather all comments from this tab (restored rows if it was never shown)
+                        tab_comments = list(self.pending_tab_rows.get(tab_widget, []))
+                        if table:
+                            tab_comments.extend(self.table_comment_rows(table, 'Direct Input'))
                         
                         # Save this tab's state
                         if tab_comments:
@@ -1,4 +1,4 @@
-from db_config import get_db_connection
+from db_config import get_db_connection, db_connection
 import traceback
 
 def test_api_table_connection():
@@ -44,25 +44,21 @@ def get_api_key(key_name='apify'):
     Returns:
         str: The API key if found, or None if not found
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT api_key FROM api_keys 
-            WHERE key_name = ? AND is_active = 1
-        ''', (key_name,))
-        
-        result = cursor.fetchone()
-        return result[0] if result else None
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT api_key FROM api_keys 
+                WHERE key_name = ? AND is_active = 1
+            ''', (key_name,))
+            
+            result = cursor.fetchone()
+            return result[0] if result else None
     except Exception as e:
         print(f"Error retrieving API key: {str(e)}")
         print(traceback.format_exc())
         return None
-    finally:
-        if conn:
-            conn.close()
 
 def set_api_key(key_name, api_key):
     """
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+"""
+Performance benchmarks for the classification pipeline.
+
+Usage:
+    python benchmark.py tokenizer [csv_path]
+    python benchmark.py quantization [csv_path]
+    python benchmark.py backends [csv_path]
+    python benchmark.py threads [csv_path]
+    python benchmark.py filters [csv_path]
+    python benchmark.py names [csv_path]
+    python benchmark.py emoji [csv_path]
+    python benchmark.py tabsave [csv_path]
+"""
+import os
+import sys
+import time
+import pandas as pd
+
+DEFAULT_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "docs", "test csv 2.csv")
+
+def load_comments(csv_path=DEFAULT_CSV):
+    """Load the first column of a CSV as a list of comment strings."""
+    return pd.read_csv(csv_path).iloc[:, 0].astype(str).tolist()
+
+def time_call(func, repeats=5):
+    """Best wall-clock time of several runs of func, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmark_tokenizer(csv_path=DEFAULT_CSV, repeats=5):
+    """Compare slow (Python) and fast (Rust) tokenizer throughput on a CSV of comments."""
+    from transformers import BertTokenizer, BertTokenizerFast
+    from model import CB_MODEL_DIR
+
+    comments = load_comments(csv_path)
+    # Repeat the sample so timings aren't dominated by call overhead
+    comments = comments * max(1, 2000 // max(1, len(comments)))
+
+    print(f"Tokenizing {len(comments)} comments ({repeats} runs, best time)")
+    print("-" * 60)
+    results = {}
+    for name, tokenizer_class in (("slow", BertTokenizer), ("fast", BertTokenizerFast)):
+        tokenizer = tokenizer_class.from_pretrained(CB_MODEL_DIR)
+        seconds = time_call(lambda: tokenizer(comments, padding=True, truncation=True, max_length=512), repeats)
+        results[name] = seconds
+        print(f"{name:<6} {seconds * 1000:>10.1f} ms   {len(comments) / seconds:>12.0f} comments/s")
+    print("-" * 60)
+    print(f"Speedup: {results['slow'] / results['fast']:.1f}x")
+    return results
+
+def svm_predictions(texts):
+    """Raw SVM predictions, guidance labels and wall-clock time for texts, bypassing all caches."""
+    import model
+    start = time.perf_counter()
+    embeddings = model.embed_bucketed(texts, model.EMBEDDING_MAX_LENGTH, 32, model.MAX_PADDING_WASTE)
+    predictions = model.svm_classifier.predict(embeddings)
+    seconds = time.perf_counter() - start
+    confidences = model.batch_confidence_scores(embeddings, predictions)
+    labels = [model.guidance_label(p, c) for p, c in zip(predictions, confidences)]
+    return predictions, labels, seconds
+
+def benchmark_quantization(csv_path=DEFAULT_CSV):
+    """Report int8 agreement with fp32 SVM predictions and the CPU speedup on a held-out CSV."""
+    import numpy as np
+    import model
+
+    comments = load_comments(csv_path)
+    model.ENABLE_EMBEDDING_CACHE = False
+
+    results = {}
+    for mode in ("fp32", "int8"):
+        model.initialize_models(mode=mode)
+        svm_predictions(comments[:8])  # Warm-up
+        predictions, labels, seconds = svm_predictions(comments)
+        results[model.inference_mode] = (np.asarray(predictions), labels, seconds)
+
+    if "int8" not in results:
+        print("int8 inference is unavailable on this machine.")
+        return results
+
+    fp32_predictions, fp32_labels, fp32_seconds = results["fp32"]
+    int8_predictions, int8_labels, int8_seconds = results["int8"]
+    prediction_agreement = float(np.mean(fp32_predictions == int8_predictions))
+    label_agreement = float(np.mean([a == b for a, b in zip(fp32_labels, int8_labels)]))
+
+    print(f"Held-out comments: {len(comments)}")
+    print("-" * 60)
+    print(f"fp32  {fp32_seconds:>8.2f} s   {len(comments) / fp32_seconds:>10.1f} comments/s")
+    print(f"int8  {int8_seconds:>8.2f} s   {len(comments) / int8_seconds:>10.1f} comments/s")
+    print("-" * 60)
+    print(f"Speedup: {fp32_seconds / int8_seconds:.2f}x")
+    print(f"SVM prediction agreement with fp32: {prediction_agreement:.1%} "
+          f"(accuracy delta {1 - prediction_agreement:.1%})")
+    print(f"Guidance label agreement with fp32: {label_agreement:.1%}")
+    return results
+
+def percentile_ms(samples, q):
+    """The q-th percentile of a list of durations in seconds, in milliseconds."""
+    import numpy as np
+    return float(np.percentile(samples, q)) * 1000
+
+def benchmark_backends(csv_path=DEFAULT_CSV, batch_sizes=(1, 8, 32, 128), max_batches=50):
+    """Compare PyTorch and ONNX Runtime embedding latency (p50/p95) and throughput on CPU."""
+    os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")  # Compare both backends on CPU
+    import model
+
+    comments = load_comments(csv_path)
+    comments = comments * max(1, (max(batch_sizes) * 2) // max(1, len(comments)))
+    model.ENABLE_EMBEDDING_CACHE = False
+
+    results = {}
+    for backend in ("torch", "onnx"):
+        model.initialize_models(mode="fp32", backend=backend)
+        if model.embedding_backend != backend:
+            print(f"{backend} backend is unavailable on this machine.")
+            continue
+        for batch_size in batch_sizes:
+            batches = [comments[start:start + batch_size]
+                       for start in range(0, len(comments) - batch_size + 1, batch_size)][:max_batches]
+            latencies = []
+            for batch in [batches[0]] + batches:  # First batch doubles as warm-up
+                start = time.perf_counter()
+                inputs = model.tokenizer(batch, return_tensors='pt', padding=True, truncation=True,
+                                         max_length=model.EMBEDDING_MAX_LENGTH)
+                model.embed_inputs(inputs)
+                latencies.append(time.perf_counter() - start)
+            latencies = latencies[1:]
+            results[(backend, batch_size)] = (
+                percentile_ms(latencies, 50),
+                percentile_ms(latencies, 95),
+                batch_size * len(latencies) / sum(latencies),
+            )
+
+    print(f"{'backend':<8}{'batch':>6}{'p50 ms':>12}{'p95 ms':>12}{'comments/s':>14}")
+    print("-" * 52)
+    for (backend, batch_size), (p50, p95, throughput) in results.items():
+        print(f"{backend:<8}{batch_size:>6}{p50:>12.1f}{p95:>12.1f}{throughput:>14.1f}")
+    return results
+
+def benchmark_threads(csv_path=DEFAULT_CSV):
+    """Re-run the CPU thread autotuner on comments from a CSV and persist the result."""
+    import model
+    from utils import save_settings
+
+    model.AUTOTUNE_THREADS = False  # Tune once below instead of inside initialize_models
+    model.initialize_models()
+    comments = load_comments(csv_path)[:32]
+    best = model.autotune_threads(comments)
+    save_settings(autotuned_threads={"intra_op": best, "cpu_count": os.cpu_count() or 1})
+    print(f"Best intra-op thread count: {best} (saved)")
+    return best
+
+def benchmark_comment_filter(csv_path=DEFAULT_CSV, comment_count=20000):
+    """Compare the vectorized comment filter with applying the rules one comment at a time."""
+    from text_filters import filter_comments
+    from filter_reference import filter_comments_loop
+
+    df = pd.DataFrame({'Text': load_comments(csv_path)})
+    df = pd.concat([df] * max(1, comment_count // len(df)), ignore_index=True)
+    loop_time = time_call(lambda: filter_comments_loop(df, {}), repeats=1)
+    vectorized_time = time_call(lambda: filter_comments(df, {}), repeats=1)
+    print(f"Filtered {len(df)} comments: loop {loop_time:.2f}s, vectorized {vectorized_time:.2f}s "
+          f"({loop_time / vectorized_time:.1f}x)")
+    return loop_time, vectorized_time
+
+def benchmark_name_matcher(csv_path=DEFAULT_CSV, copies=100):
+    """Compare the combined name-only pattern with the separate marker and shape checks."""
+    from text_filters import is_name_only
+    from filter_reference import is_name_only_reference
+
+    comments = load_comments(csv_path) * copies
+    reference = [is_name_only_reference(text) for text in comments]
+    combined = [is_name_only(text) for text in comments]
+    assert combined == reference, "Combined pattern disagrees with the separate checks"
+
+    reference_time = time_call(lambda: [is_name_only_reference(text) for text in comments])
+    combined_time = time_call(lambda: [is_name_only(text) for text in comments])
+    print(f"Name-only check on {len(comments)} comments ({sum(combined)} flagged)")
+    print(f"  Separate checks: {reference_time * 1000:.1f} ms")
+    print(f"  Combined pattern: {combined_time * 1000:.1f} ms ({reference_time / combined_time:.1f}x)")
+    return reference_time, combined_time
+
+def benchmark_emoji_filter(csv_path=DEFAULT_CSV, copies=100):
+    """Compare the compiled emoji class, a per-character table scan and the original per-call pattern."""
+    from text_filters import is_emoji_only
+    from filter_reference import is_emoji_only_reference, is_emoji_only_scan
+
+    emoji_posts = ["\U0001F602" * count + " \U0001F525\u2764\uFE0F " * count for count in range(1, 11)]
+    for label, comments in (("CSV comments", load_comments(csv_path) * copies),
+                            ("Emoji-only comments", emoji_posts * copies * 20)):
+        assert [is_emoji_only(text) for text in comments] == [is_emoji_only_reference(text) for text in comments]
+        reference_time = time_call(lambda: [is_emoji_only_reference(text) for text in comments])
+        scan_time = time_call(lambda: [is_emoji_only_scan(text) for text in comments])
+        table_time = time_call(lambda: [is_emoji_only(text) for text in comments])
+        print(f"{label} ({len(comments)}): original {reference_time * 1000:.1f} ms, "
+              f"table scan {scan_time * 1000:.1f} ms ({reference_time / scan_time:.1f}x), "
+              f"compiled class {table_time * 1000:.1f} ms ({reference_time / table_time:.1f}x)")
+
+def benchmark_tab_save(csv_path=DEFAULT_CSV, comment_count=500, round_trip=0.02):
+    """Compare per-row and batched tab_comments inserts against a local SQL stand-in with network latency."""
+    from tab_store import prepare_comment_row, insert_comment_rows
+    from sql_stand_in import SqlStandIn, insert_row_by_row
+
+    texts = load_comments(csv_path)
+    texts = (texts * (comment_count // len(texts) + 1))[:comment_count]
+    rows = [prepare_comment_row(1, {'comment_text': text, 'prediction': "Safe", 'confidence': 0.9}, {}, set())
+            for text in texts]
+
+    print(f"Saving a {len(rows)}-comment tab with a {round_trip * 1000:.0f} ms round trip")
+    for label, insert in (("Row by row", insert_row_by_row), ("Batched", insert_comment_rows)):
+        db = SqlStandIn(round_trip)
+        start = time.perf_counter()
+        insert(db.cursor(), rows)
+        db.commit()
+        print(f"  {label}: {time.perf_counter() - start:.2f}s ({db.round_trips} round trips)")
+
+BENCHMARKS = {
+    "tokenizer": benchmark_tokenizer,
+    "quantization": benchmark_quantization,
+    "backends": benchmark_backends,
+    "threads": benchmark_threads,
+    "filters": benchmark_comment_filter,
+    "names": benchmark_name_matcher,
+    "emoji": benchmark_emoji_filter,
+    "tabsave": benchmark_tab_save,
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(f"Usage: python benchmark.py [{'|'.join(BENCHMARKS)}] [csv_path]")
+        sys.exit(1)
+    BENCHMARKS[sys.argv[1]](*sys.argv[2:])
@@ -0,0 +1,259 @@
+import os
+import gc
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import model
+from model import classify_comments, deduplicate_texts
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # Memory checks fall back to os.sysconf and /proc where available
+
+# --- Pool Settings ---
+# 0 workers means "auto": one per spare core, capped by available memory.
+# The memory budget sizes that cap; a worker found over it only clears its
+# classification memo (see classify_chunk).
+# Override with THESIS_CLASSIFICATION_WORKERS / THESIS_WORKER_MEMORY_MB.
+CLASSIFICATION_WORKERS = int(os.environ.get("THESIS_CLASSIFICATION_WORKERS", "0") or 0)
+WORKER_MEMORY_BUDGET_MB = int(os.environ.get("THESIS_WORKER_MEMORY_MB", "1500") or 1500)  # mBERT + SVM + activations
+POOL_CHUNK_SIZE = 512       # Comments per task sent to a worker
+POOL_MIN_COMMENTS = 2000    # Smaller inputs are classified in-process (worker startup costs seconds)
+
+# --- Global Variables ---
+classification_pool = None
+
+# --- Memory Helpers ---
+def available_memory_mb():
+    """Physical memory currently available to new processes in MB, or None if unknown."""
+    if psutil is not None:
+        return psutil.virtual_memory().available / (1024 * 1024)
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def process_memory_mb():
+    """Current resident memory of this process in MB, or None if unknown."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        # Linux: the second field of statm is the resident size in pages
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        # Peak RSS (resource.ru_maxrss) never goes down, so it can't be used as a budget
+        return None
+
+def default_worker_count(memory_budget_mb=WORKER_MEMORY_BUDGET_MB):
+    """One worker per core (leaving one for the GUI), capped so every worker fits its memory budget."""
+    workers = max(1, (os.cpu_count() or 1) - 1)
+    available = available_memory_mb()
+    if available is not None:
+        workers = min(workers, max(1, int(available // memory_budget_mb)))
+    return workers
+
+# --- Worker Process ---
+def init_worker(model_settings, threads, memory_budget_mb):
+    """
+    Load the mBERT model and SVM once per worker process.
+
+    Args:
+        model_settings (dict): model module attributes to mirror from the parent process
+        threads (int): Intra-op threads per worker, so workers don't oversubscribe cores
+        memory_budget_mb (int): Resident memory each worker should stay under
+    """
+    global WORKER_MEMORY_BUDGET_MB
+
+    for name, value in model_settings.items():
+        setattr(model, name, value)
+    # Workers share one cache directory, so only the parent process writes to it
+    model.ENABLE_EMBEDDING_CACHE = False
+    model.AUTOTUNE_THREADS = False
+    model.INTRA_OP_THREADS = threads
+    model.INTER_OP_THREADS = 1
+    WORKER_MEMORY_BUDGET_MB = memory_budget_mb
+    model.initialize_models()
+
+def classify_chunk(texts):
+    """
+    Classify one shard of comments inside a worker.
+
+    If the worker's current resident memory is over its budget afterwards,
+    the classification memo is cleared and garbage collected. That is the
+    only thing the budget does: the model itself is not unloaded, and the
+    check is skipped where current memory can't be read.
+    """
+    results = classify_comments(texts)
+
+    used = process_memory_mb()
+    if used is not None and used > WORKER_MEMORY_BUDGET_MB:
+        print(f"Classification worker {os.getpid()} is using {used:.0f} MB "
+              f"(budget {WORKER_MEMORY_BUDGET_MB} MB). Releasing memoized results.")
+        model.clear_classification_memo()
+        gc.collect()
+    return results
+
+# --- Classification Pool ---
+class ClassificationPool:
+    """
+    Process pool that classifies large comment lists in parallel.
+
+    Each worker process loads the model once at startup and then classifies
+    shards of POOL_CHUNK_SIZE comments with model.classify_comments. Results
+    are merged back in input order, so the output matches a sequential
+    classify_comments call.
+    """
+
+    def __init__(self, workers=None, memory_budget_mb=None):
+        self.memory_budget_mb = memory_budget_mb or WORKER_MEMORY_BUDGET_MB
+        self.workers = workers or CLASSIFICATION_WORKERS or default_worker_count(self.memory_budget_mb)
+        self.executor = None
+
+    def start(self):
+        """Spawn the worker processes if they are not running yet."""
+        if self.executor is not None:
+            return
+        model_settings = {
+            "CB_MODEL_DIR": model.CB_MODEL_DIR,
+            "SVM_MODEL_PATH": model.SVM_MODEL_PATH,
+            "INFERENCE_MODE": model.inference_mode or model.INFERENCE_MODE,
+            "EMBEDDING_BACKEND": model.embedding_backend or model.EMBEDDING_BACKEND,
+        }
+        threads = max(1, ((os.cpu_count() or 1) - 1) // self.workers)
+        print(f"Starting classification pool: {self.workers} workers x {threads} threads, "
+              f"{self.memory_budget_mb} MB budget each.")
+        # Spawn rather than fork: forking a process running Qt and torch is unsafe
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(model_settings, threads, self.memory_budget_mb),
+        )
+
+    def classify_iter(self, texts, chunk_size=POOL_CHUNK_SIZE):
+        """
+        Classify texts across the worker processes, yielding results as shards complete.
+
+        Args:
+            texts (list): Comment strings to classify
+            chunk_size (int): Comments per task
+
+        Yields:
+            tuple: (start, results) where results are the (label, confidence) tuples
+                for texts[start:start + len(results)], in input order
+        """
+        texts = [str(text) for text in texts]
+        unique_texts, inverse = deduplicate_texts(texts)
+        chunks = [unique_texts[start:start + chunk_size] for start in range(0, len(unique_texts), chunk_size)]
+
+        self.start()
+        futures = [self.executor.submit(classify_chunk, chunk) for chunk in chunks]
+        unique_results = []
+        emitted = 0
+        try:
+            # Collect shards in submission order so results come back in input order
+            for future in futures:
+                unique_results.extend(future.result())
+                # Every position up to the first text whose shard hasn't finished is ready
+                end = emitted
+                while end < len(texts) and inverse[end] < len(unique_results):
+                    end += 1
+                if end > emitted:
+                    yield emitted, [unique_results[i] for i in inverse[emitted:end]]
+                    emitted = end
+        finally:
+            # Drop queued shards if the caller stopped early (e.g. the job was cancelled)
+            for future in futures:
+                future.cancel()
+
+    def classify(self, texts, chunk_size=POOL_CHUNK_SIZE, progress_callback=None):
+        """
+        Classify texts across the worker processes.
+
+        Args:
+            texts (list): Comment strings to classify
+            chunk_size (int): Comments per task
+            progress_callback (callable): Called with (done, total) as shards complete
+
+        Returns:
+            list: (prediction_label, confidence_score) tuples aligned with texts
+        """
+        results = []
+        for _, chunk_results in self.classify_iter(texts, chunk_size):
+            results.extend(chunk_results)
+            if progress_callback:
+                progress_callback(len(results), len(texts))
+        return results
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+def get_classification_pool():
+    """Get the shared classification pool, creating it on first use."""
+    global classification_pool
+    if classification_pool is None:
+        classification_pool = ClassificationPool()
+        atexit.register(classification_pool.shutdown)
+    return classification_pool
+
+def classify_comments_parallel(texts, progress_callback=None):
+    """
+    Classify comments with the process pool when the input is large enough to benefit.
+
+    Args:
+        texts (list): Comment strings to classify
+        progress_callback (callable): Called with (done, total) as shards complete
+
+    Returns:
+        list: (prediction_label, confidence_score) tuples aligned with texts
+    """
+    texts = [str(text) for text in texts]
+    if len(texts) < POOL_MIN_COMMENTS:
+        return classify_comments(texts)
+
+    pool = get_classification_pool()
+    if pool.workers <= 1:
+        return classify_comments(texts)
+    try:
+        return pool.classify(texts, progress_callback=progress_callback)
+    except Exception as e:
+        print(f"Classification pool failed: {e}. Classifying in-process.")
+        pool.shutdown()
+        return classify_comments(texts)
+
+def iter_classifications(texts, batch_size=64):
+    """
+    Classify comments incrementally, in input order.
+
+    Large inputs are sharded across the process pool; smaller ones are
+    classified in-process in batches of batch_size.
+
+    Args:
+        texts (list): Comment strings to classify
+        batch_size (int): Comments per in-process batch
+
+    Yields:
+        tuple: (start, results) for texts[start:start + len(results)]
+    """
+    texts = [str(text) for text in texts]
+    done = 0
+    if len(texts) >= POOL_MIN_COMMENTS:
+        pool = get_classification_pool()
+        if pool.workers > 1:
+            try:
+                for start, results in pool.classify_iter(texts):
+                    yield start, results
+                    done = start + len(results)
+                return
+            except Exception as e:
+                print(f"Classification pool failed: {e}. Classifying the remaining comments in-process.")
+                pool.shutdown()
+
+    for start in range(done, len(texts), batch_size):
+        yield start, classify_comments(texts[start:start + batch_size])
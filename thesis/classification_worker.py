@@ -0,0 +1,210 @@
+import time
+import traceback
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from model import classify_comments
+from classification_pool import iter_classifications
+
+class ClassificationWorker(QObject):
+    """
+    Classifies comment rows in batches on a background thread.
+
+    The worker first runs a prepare callable (e.g. reading a CSV) that
+    returns the rows to classify, then fills in each row's 'prediction' and
+    'confidence' batch by batch. Every completed batch is emitted so the GUI
+    can append it to a table right away.
+
+    prepare may instead return an iterator of row lists (e.g. comments as a
+    scraper produces them); each list is classified as soon as it arrives,
+    so inference overlaps with scraping.
+    """
+
+    prepared = pyqtSignal(int, object)        # total rows (-1 while streaming), stats from the prepare step
+    batch_ready = pyqtSignal(list)            # completed rows, in input order
+    progress = pyqtSignal(int, int, float)    # done, total, ETA in seconds (-1 if unknown)
+    finished = pyqtSignal(list)               # all completed rows
+    cancelled = pyqtSignal(list)              # rows completed before cancellation
+    failed = pyqtSignal(str)
+
+    def __init__(self, prepare, batch_size=64):
+        """
+        Args:
+            prepare (callable): Returns (rows, stats); rows is a list of dicts with a
+                'comment_text' key, or an iterator of such lists
+            batch_size (int): Rows classified per batch
+        """
+        super().__init__()
+        self.prepare = prepare
+        self.batch_size = batch_size
+        self.is_cancelled = False
+
+    def cancel(self):
+        """Ask the worker to stop after the current batch (safe to call from the GUI thread)."""
+        self.is_cancelled = True
+
+    def run(self):
+        try:
+            rows, stats = self.prepare()
+            if isinstance(rows, list):
+                completed = self.classify_rows(rows, stats)
+            else:
+                completed = self.classify_stream(rows, stats)
+
+            if self.is_cancelled:
+                self.cancelled.emit(completed)
+            else:
+                self.finished.emit(completed)
+        except Exception as e:
+            traceback.print_exc()
+            self.failed.emit(str(e))
+
+    def classify_rows(self, rows, stats):
+        """Classify a complete list of rows, reporting progress against its length."""
+        total = len(rows)
+        self.prepared.emit(total, stats)
+
+        completed = []
+        start_time = time.time()
+        batches = iter_classifications([row['comment_text'] for row in rows], self.batch_size)
+        try:
+            for start, results in batches:
+                if self.is_cancelled:
+                    break
+                batch = rows[start:start + len(results)]
+                self.fill_predictions(batch, results)
+                completed.extend(batch)
+                self.batch_ready.emit(batch)
+
+                # Estimate the remaining time from the average rate so far
+                elapsed = time.time() - start_time
+                done = len(completed)
+                eta = elapsed / done * (total - done) if done else -1.0
+                self.progress.emit(done, total, eta)
+        finally:
+            batches.close()
+        return completed
+
+    def classify_stream(self, row_batches, stats):
+        """Classify row lists as the iterator produces them; the total is unknown until it ends."""
+        self.prepared.emit(-1, stats)
+
+        completed = []
+        try:
+            for rows in row_batches:
+                for start in range(0, len(rows), self.batch_size):
+                    if self.is_cancelled:
+                        return completed
+                    batch = rows[start:start + self.batch_size]
+                    self.fill_predictions(batch, classify_comments([row['comment_text'] for row in batch]))
+                    completed.extend(batch)
+                    self.batch_ready.emit(batch)
+                    self.progress.emit(len(completed), -1, -1.0)
+                if self.is_cancelled:
+                    break
+        finally:
+            # Stops the producer (e.g. aborts the scraper run) if we ended early
+            if hasattr(row_batches, "close"):
+                row_batches.close()
+        return completed
+
+    def fill_predictions(self, rows, results):
+        for row, (prediction, confidence) in zip(rows, results):
+            row['prediction'] = prediction
+            row['confidence'] = confidence
+
+class JobTab:
+    """
+    Opens a classification job's result tab when its first rows arrive.
+
+    A job that fails (or is cancelled) before any row is classified never
+    opens a tab, so it leaves no empty tab behind and uses up no tab name.
+    """
+
+    def __init__(self, open_tab):
+        """
+        Args:
+            open_tab (callable): Creates the tab and returns (tab_name, table)
+        """
+        self.open_tab = open_tab
+        self.name = None
+        self.table = None
+
+    def is_open(self):
+        return self.name is not None
+
+    def ensure(self):
+        """Open the tab if this job hasn't yet, and return its table."""
+        if not self.is_open():
+            self.name, self.table = self.open_tab()
+        return self.table
+
+def format_eta(seconds):
+    """Format an ETA in seconds as m:ss (or h:mm:ss)."""
+    if seconds < 0:
+        return "estimating..."
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+class ClassificationJob(QObject):
+    """
+    Runs a ClassificationWorker on its own QThread and drives a LoadingOverlay.
+
+    The overlay shows real progress counts and an ETA, and its Cancel button
+    stops the worker after the batch in progress. Connect to the worker's
+    signals (job.worker.batch_ready etc.) before calling start().
+    """
+
+    def __init__(self, parent, overlay, prepare, message="Analyzing comments...", batch_size=64):
+        super().__init__(parent)
+        self.overlay = overlay
+        self.message = message
+        self.thread = QThread(parent)
+        self.worker = ClassificationWorker(prepare, batch_size)
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.prepared.connect(self.on_prepared)
+        self.worker.progress.connect(self.on_progress)
+        for signal in (self.worker.finished, self.worker.cancelled, self.worker.failed):
+            signal.connect(self.thread.quit)
+        self.thread.finished.connect(self.on_thread_finished)
+
+    def start(self):
+        self.overlay.show_with_progress(self.message, cancellable=True)
+        self.overlay.set_busy(True)
+        self.overlay.cancel_requested.connect(self.cancel)
+        self.thread.start()
+
+    def cancel(self):
+        # Called directly (not queued): the worker thread is busy in run()
+        self.worker.cancel()
+        self.overlay.set_progress_text("Cancelling after the current batch...")
+
+    def is_running(self):
+        return self.thread.isRunning()
+
+    def on_prepared(self, total, stats):
+        if total < 0:
+            # Streaming: keep the busy bar until the source is exhausted
+            self.overlay.set_progress_text("Waiting for comments...")
+            return
+        self.overlay.set_busy(False)
+        self.overlay.set_progress(0)
+        self.overlay.set_progress_text(f"0 / {total} comments")
+
+    def on_progress(self, done, total, eta):
+        if self.worker.is_cancelled:
+            return
+        if total < 0:
+            self.overlay.set_progress_text(f"{done} comments analyzed • still collecting...")
+            return
+        self.overlay.set_progress(int(done * 100 / total) if total else 100)
+        self.overlay.set_progress_text(f"{done} / {total} comments • ETA {format_eta(eta)}")
+
+    def on_thread_finished(self):
+        self.overlay.cancel_requested.disconnect(self.cancel)
+        self.overlay.hide()
+        self.worker.deleteLater()
+        self.thread.deleteLater()
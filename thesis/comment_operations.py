@@ -198,7 +198,7 @@ def generate_report(window):
     Works for both admin and user interfaces.
     """
     current_table = window.get_current_table()
-    if not current_table or current_table.rowCount() == 0:
+    if not current_table or current_table.model().comment_count() == 0:
         display_message(window, "Error", "No data available to generate report")
         return
 
@@ -220,55 +220,23 @@ def generate_report(window):
         import re
         from stopwords import TAGALOG_STOP_WORDS
 
-        # Collect data for charts and table
-        data = []
-        total_rows = current_table.rowCount()
-        potentially_harmful_count = 0
-        requires_review_count = 0
-        likely_appropriate_count = 0
-        confidence_ranges = {'90-100%': 0, '80-89%': 0, '70-79%': 0, '<70%': 0}
-        all_comments = []
-
-        for row in range(total_rows):
-            comment_item = current_table.item(row, 0)
-            prediction_item = current_table.item(row, 1)
-            confidence_item = current_table.item(row, 2)
-            
-            if not comment_item or not prediction_item or not confidence_item:
-                continue
-                
-            comment = comment_item.text()
-            comment_text = comment_item.data(Qt.UserRole) or comment
-            prediction = prediction_item.text()
-            confidence = confidence_item.text()
-            
-            # Convert confidence from string to float
-            try:
-                confidence_value = float(confidence.strip('%'))
-            except ValueError:
-                confidence_value = 0.0
-            
-            # Store data for table
-            data.append([comment_text, prediction, confidence])
-            all_comments.append(comment_text)
-            
-            # Count by prediction type
-            if prediction == "Potentially Harmful":
-                potentially_harmful_count += 1
-            elif prediction == "Requires Review":
-                requires_review_count += 1
-            elif prediction == "Likely Appropriate":
-                likely_appropriate_count += 1
-                
-            # Categorize confidence
-            if confidence_value >= 90:
-                confidence_ranges['90-100%'] += 1
-            elif confidence_value >= 80:
-                confidence_ranges['80-89%'] += 1
-            elif confidence_value >= 70:
-                confidence_ranges['70-79%'] += 1
-            else:
-                confidence_ranges['<70%'] += 1
+        # Collect data for charts and table from the model's columns
+        model = current_table.model()
+        total_rows = model.comment_count()
+        data = [list(row) for row in zip(model.comments, model.labels, model.confidence_texts())]
+        all_comments = list(model.comments)
+        potentially_harmful_count = int(np.count_nonzero(model.labels == "Potentially Harmful"))
+        requires_review_count = int(np.count_nonzero(model.labels == "Requires Review"))
+        likely_appropriate_count = int(np.count_nonzero(model.labels == "Likely Appropriate"))
+
+        # Categorize confidence
+        confidences = model.confidences
+        confidence_ranges = {
+            '90-100%': int(np.count_nonzero(confidences >= 90)),
+            '80-89%': int(np.count_nonzero((confidences >= 80) & (confidences < 90))),
+            '70-79%': int(np.count_nonzero((confidences >= 70) & (confidences < 80))),
+            '<70%': int(np.count_nonzero(confidences < 70)),
+        }
                 
         # Perform advanced sentiment analysis using transformers
         def get_sentiment_analyzer():
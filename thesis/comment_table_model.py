@@ -0,0 +1,365 @@
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QTableView, QAbstractItemView
+from styles import COLORS
+
+# --- Table Settings ---
+HEADERS = ["Comment", "Prediction", "Confidence"]
+COMMENT_COLUMN, LABEL_COLUMN, CONFIDENCE_COLUMN = range(3)
+REPLY_PREFIX = " [↪ Reply] "
+
+LABEL_COLORS = {
+    "Potentially Harmful": QColor(COLORS['potentially_harmful']),
+    "Requires Review": QColor(COLORS['requires_attention']),
+    "Likely Appropriate": QColor(COLORS['likely_appropriate']),
+    "Cyberbullying": QColor(COLORS['bullying']),
+}
+REPLY_BACKGROUND = QColor(COLORS['surface']).lighter(105)
+SELECTED_BACKGROUND = QColor(COLORS['highlight'])
+
+def to_confidence(value):
+    """Read a confidence (0-100) as a float, allowing "85.00%" strings; invalid values become 0.0."""
+    try:
+        return float(str(value).strip().rstrip('%')) if isinstance(value, str) else float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+def grow(array, size):
+    """Return array, or a copy with room for at least size rows, doubling the capacity to keep appends cheap."""
+    if size <= len(array):
+        return array
+    grown = np.empty(max(size, 2 * len(array), 64), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+class CommentTableModel(QAbstractTableModel):
+    """
+    Columnar model for the comments of one results tab.
+
+    Each column is a NumPy array: comments and labels (object), confidences
+    (float, 0-100), and the per-row metadata the table shows, is_reply and
+    selected (bool). Cells are formatted only when the view asks for them, so
+    a tab holds its data once instead of one QTableWidgetItem per cell, and
+    analytics read the arrays directly.
+
+    The arrays are views into buffers that grow geometrically, so streamed
+    batches are appended in place and announced with beginInsertRows; the
+    view keeps its selection and scroll position while a job fills the tab.
+    A tab may show the same text more than once; callers merging into an
+    existing tab pass skip_existing.
+
+    The view shows the rows that match the search text (and only replies if
+    replies_only is set), in array order; sort() reorders the arrays
+    themselves, so exports follow the order the user sees. Sorting and
+    filtering keep the selected comment selected while it stays visible.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_text = ""
+        self.replies_only = False
+        self.reset_buffers()
+
+    def reset_buffers(self):
+        self.count = 0
+        self._comments = np.empty(0, dtype=object)
+        self._labels = np.empty(0, dtype=object)
+        self._confidences = np.empty(0, dtype=float)
+        self._is_reply = np.empty(0, dtype=bool)
+        self._selected = np.empty(0, dtype=bool)
+        self.visible_count = 0
+        self._rows = np.empty(0, dtype=np.intp)  # Array index of each visible row, in display order
+        self.row_of_comment = {}  # Comment text -> array index of its first row
+
+    # --- Columns ---
+    @property
+    def comments(self):
+        return self._comments[:self.count]
+
+    @property
+    def labels(self):
+        return self._labels[:self.count]
+
+    @property
+    def confidences(self):
+        return self._confidences[:self.count]
+
+    @property
+    def is_reply(self):
+        return self._is_reply[:self.count]
+
+    @property
+    def selected(self):
+        return self._selected[:self.count]
+
+    @property
+    def rows(self):
+        return self._rows[:self.visible_count]
+
+    # --- Qt Model Interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.visible_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == COMMENT_COLUMN:
+                return REPLY_PREFIX + self._comments[i] if self._is_reply[i] else self._comments[i]
+            if column == LABEL_COLUMN:
+                return self._labels[i]
+            return f"{self._confidences[i]:.2f}%"
+        if role == Qt.UserRole:
+            # Unformatted values: the original comment text and the confidence as a float
+            if column == COMMENT_COLUMN:
+                return self._comments[i]
+            if column == CONFIDENCE_COLUMN:
+                return float(self._confidences[i])
+            return self._labels[i]
+        if role == Qt.ToolTipRole and column == COMMENT_COLUMN:
+            return self._comments[i]
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter) if column == COMMENT_COLUMN else int(Qt.AlignCenter)
+        if role == Qt.ForegroundRole and column == LABEL_COLUMN:
+            return LABEL_COLORS.get(self._labels[i])
+        if role == Qt.BackgroundRole:
+            if self._selected[i]:
+                return SELECTED_BACKGROUND
+            if self._is_reply[i] and column == COMMENT_COLUMN:
+                return REPLY_BACKGROUND
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Reorder the rows by a column; rows with equal keys keep their current order.
+
+        Args:
+            column (int): COMMENT_COLUMN (case-insensitive), LABEL_COLUMN or CONFIDENCE_COLUMN
+            order (Qt.SortOrder): Qt.AscendingOrder or Qt.DescendingOrder
+        """
+        if column == COMMENT_COLUMN:
+            keys = pd.Series(self.comments, dtype=object).str.lower().to_numpy(dtype=object)
+        elif column == LABEL_COLUMN:
+            keys = self.labels
+        else:
+            keys = self.confidences
+
+        if order == Qt.DescendingOrder:
+            # Stable descending: sort the reversed keys, then reverse back
+            reversed_positions = np.arange(len(keys))[::-1]
+            permutation = reversed_positions[np.argsort(keys[::-1], kind="stable")][::-1]
+        else:
+            permutation = np.argsort(keys, kind="stable")
+
+        layout = self.begin_layout_change()
+        for column_values in (self.comments, self.labels, self.confidences, self.is_reply, self.selected):
+            column_values[:] = column_values[permutation]
+        self.row_of_comment = {}
+        for i, text in enumerate(self.comments):
+            self.row_of_comment.setdefault(text, i)
+        new_index = np.empty(len(permutation), dtype=np.intp)
+        new_index[permutation] = np.arange(len(permutation))
+        self.end_layout_change(layout, new_index)
+
+    def begin_layout_change(self):
+        """Start re-laying out the rows, remembering which comment each persistent index (selection, current row) is on."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        return persistent, [int(self._rows[index.row()]) for index in persistent]
+
+    def end_layout_change(self, layout, new_index=None):
+        """
+        Recompute the visible rows and move persistent indexes to their comments' new rows.
+
+        Args:
+            layout (tuple): From begin_layout_change
+            new_index (np.ndarray): New array index of each old one, if the arrays were reordered
+        """
+        self.set_visible_rows(self.visible_rows())
+        rows = self.rows
+        persistent, array_indices = layout
+        moved = []
+        for index, i in zip(persistent, array_indices):
+            if new_index is not None:
+                i = new_index[i]
+            # Visible rows are in array order, so a binary search finds the comment's row
+            row = int(np.searchsorted(rows, i))
+            moved.append(self.index(row, index.column()) if row < len(rows) and rows[row] == i else QModelIndex())
+        self.changePersistentIndexList(persistent, moved)
+        self.layoutChanged.emit()
+
+    # --- Filling ---
+    def append_rows(self, comments, labels, confidences, is_reply=None, selected=None, skip_existing=False):
+        """
+        Add comments to the end of the table.
+
+        Args:
+            comments (list): Comment texts
+            labels (list): Prediction label for each comment
+            confidences (list): Confidence (0-100) for each comment, as numbers or "85.00%" strings
+            is_reply (list): Whether each comment is a reply (default: none are)
+            selected (list): Whether each comment is on the user's list (default: none are)
+            skip_existing (bool): Skip texts the table already shows, for merges into an existing tab
+
+        Returns:
+            int: Number of rows added
+        """
+        comments = ["" if text is None else str(text) for text in comments]
+        keep = range(len(comments))
+        if skip_existing:
+            keep, seen = [], set(self.row_of_comment)
+            for position, text in enumerate(comments):
+                if text not in seen:
+                    seen.add(text)
+                    keep.append(position)
+        added = len(keep)
+        if not added:
+            return 0
+
+        start, stop = self.count, self.count + added
+        self._comments = grow(self._comments, stop)
+        self._labels = grow(self._labels, stop)
+        self._confidences = grow(self._confidences, stop)
+        self._is_reply = grow(self._is_reply, stop)
+        self._selected = grow(self._selected, stop)
+        self._comments[start:stop] = self.object_array([comments[p] for p in keep])
+        self._labels[start:stop] = self.object_array(["" if labels[p] is None else str(labels[p]) for p in keep])
+        self._confidences[start:stop] = [to_confidence(confidences[p]) for p in keep]
+        self._is_reply[start:stop] = False if is_reply is None else [bool(is_reply[p]) for p in keep]
+        self._selected[start:stop] = False if selected is None else [bool(selected[p]) for p in keep]
+        for i in range(start, stop):
+            self.row_of_comment.setdefault(self._comments[i], i)
+
+        # New rows come last in array order, so the visible ones are inserted at the end of the view
+        visible = start + np.flatnonzero(self.filter_mask(start, stop))
+        first_row = self.visible_count
+        if len(visible):
+            self.beginInsertRows(QModelIndex(), first_row, first_row + len(visible) - 1)
+        self.count = stop
+        self._rows = grow(self._rows, first_row + len(visible))
+        self._rows[first_row:first_row + len(visible)] = visible
+        self.visible_count = first_row + len(visible)
+        if len(visible):
+            self.endInsertRows()
+        return added
+
+    def clear(self):
+        """Remove every row."""
+        self.beginResetModel()
+        self.reset_buffers()
+        self.endResetModel()
+
+    @staticmethod
+    def object_array(values):
+        """Build a 1-D object array without NumPy splitting tuples or lists into extra dimensions."""
+        array = np.empty(len(values), dtype=object)
+        array[:] = list(values)
+        return array
+
+    # --- Filtering ---
+    def filter_mask(self, start, stop):
+        """Which of the rows start..stop (array indices) match the search text and reply filter."""
+        mask = np.ones(stop - start, dtype=bool)
+        if self.search_text:
+            mask &= pd.Series(self._comments[start:stop], dtype=object).str.lower().str.contains(
+                self.search_text, regex=False).to_numpy(dtype=bool)
+        if self.replies_only:
+            mask &= self._is_reply[start:stop]
+        return mask
+
+    def visible_rows(self):
+        """Array indices of the rows matching the search text and reply filter."""
+        return np.flatnonzero(self.filter_mask(0, self.count))
+
+    def set_visible_rows(self, rows):
+        self._rows = np.asarray(rows, dtype=np.intp)
+        self.visible_count = len(rows)
+
+    def set_search_text(self, text):
+        """Show only comments containing text (case-insensitive); an empty text shows all."""
+        layout = self.begin_layout_change()
+        self.search_text = text.lower()
+        self.end_layout_change(layout)
+
+    def set_replies_only(self, replies_only):
+        """Show only reply comments, or every comment again."""
+        layout = self.begin_layout_change()
+        self.replies_only = bool(replies_only)
+        self.end_layout_change(layout)
+
+    # --- Row Access ---
+    def comment_count(self):
+        """Number of comments in the tab, including rows hidden by a filter."""
+        return self.count
+
+    def row_values(self, row):
+        """
+        Get the values of a visible row.
+
+        Args:
+            row (int): Row in the view
+
+        Returns:
+            tuple: (comment text, label, confidence as a float)
+        """
+        i = self._rows[row]
+        return self._comments[i], self._labels[i], float(self._confidences[i])
+
+    def find_row(self, comment_text):
+        """First visible row showing a comment, or -1 if it is absent or filtered out."""
+        if comment_text not in self.row_of_comment:
+            return -1
+        matches = np.flatnonzero(self.comments[self.rows] == comment_text)
+        return int(matches[0]) if len(matches) else -1
+
+    def contains(self, comment_text):
+        return comment_text in self.row_of_comment
+
+    def confidence_texts(self):
+        """Every confidence formatted as the table shows it ("85.00%"), in row order."""
+        return [f"{value:.2f}%" for value in self.confidences]
+
+    # --- Selection Highlight ---
+    def set_selected(self, comment_text, selected):
+        """Mark every row of a comment as on or off the user's list and repaint them."""
+        if comment_text not in self.row_of_comment:
+            return
+        self.selected[self.comments == comment_text] = bool(selected)
+        for row in np.flatnonzero(self.comments[self.rows] == comment_text):
+            self.dataChanged.emit(self.index(int(row), 0), self.index(int(row), len(HEADERS) - 1),
+                                  [Qt.BackgroundRole])
+
+    def set_selected_comments(self, comment_texts):
+        """Highlight exactly the given comments."""
+        self.selected[:] = pd.Series(self.comments, dtype=object).isin(set(comment_texts)).to_numpy(dtype=bool)
+        if self.visible_count:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.visible_count - 1, len(HEADERS) - 1),
+                                  [Qt.BackgroundRole])
+
+class CommentTableView(QTableView):
+    """QTableView over its own CommentTableModel, selecting one whole row at a time."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setModel(CommentTableModel(self))
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+    def selected_row(self):
+        """The selected row in the view, or -1 if none is selected."""
+        rows = self.selectionModel().selectedRows()
+        return rows[0].row() if rows else -1
@@ -1,9 +1,16 @@
+import os
 import pyodbc
 import traceback
+from contextlib import contextmanager
+from db_pool import ConnectionPool
 
-def get_db_connection():
+# --- Connection Pool Settings ---
+DB_POOL_SIZE = int(os.environ.get("THESIS_DB_POOL_SIZE", "4") or 4)  # Open connections at most
+DB_POOL_IDLE_TIMEOUT = int(os.environ.get("THESIS_DB_POOL_IDLE_TIMEOUT", "300") or 300)  # Seconds
+
+def open_db_connection():
     """
-    Get a connection to the SQL Server database
+    Open a new connection to the SQL Server database
     
     Returns:
         Connection object or raises an exception
@@ -23,6 +30,36 @@ def get_db_connection():
         print(traceback.format_exc())
         raise  # Re-raise to allow caller to handle it
 
+# Every helper borrows from this pool, so the TLS handshake and login happen
+# once per connection instead of once per query
+db_pool = ConnectionPool(open_db_connection, max_size=DB_POOL_SIZE, idle_timeout=DB_POOL_IDLE_TIMEOUT)
+
+def get_db_connection():
+    """
+    Borrow a connection to the SQL Server database from the pool
+    
+    The connection behaves like a pyodbc connection; close() returns it to
+    the pool instead of closing it.
+    
+    Returns:
+        PooledConnection object or raises an exception
+    """
+    return db_pool.acquire()
+
+@contextmanager
+def db_connection():
+    """
+    Borrow a pooled connection for a with block
+    
+    Commits when the block succeeds, rolls back when it raises, and returns
+    the connection to the pool either way.
+    
+    Yields:
+        PooledConnection object
+    """
+    with get_db_connection() as conn:
+        yield conn
+
 def test_connection():
     """
     Test if the database connection is working
@@ -49,21 +86,13 @@ def log_user_action(username, action):
         username (str): Username of the user
         action (str): Description of the action
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO user_logs (username, action, timestamp)
-            VALUES (?, ?, GETDATE())
-        ''', (username, action))
-        conn.commit()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO user_logs (username, action, timestamp)
+                VALUES (?, ?, GETDATE())
+            ''', (username, action))
     except Exception as e:
         print(f"Logging error: {str(e)}")
         print(traceback.format_exc())
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except:
-                pass
@@ -0,0 +1,203 @@
+import time
+import threading
+import traceback
+
+class PooledConnection:
+    """
+    A connection borrowed from a ConnectionPool.
+
+    Behaves like the pyodbc connection it wraps (cursor, commit, rollback, ...),
+    except that close() hands the connection back to the pool instead of
+    closing it, so existing `conn = get_db_connection() ... conn.close()` code
+    reuses warm connections without changes. Used as a context manager it
+    commits on success, rolls back on error and returns the connection.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise RuntimeError("Connection has already been returned to the pool")
+        return getattr(raw, name)
+
+    def close(self):
+        """Return the connection to the pool (safe to call more than once)."""
+        raw, self._raw = self.__dict__.get("_raw"), None
+        if raw is not None:
+            self._pool.release(raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        try:
+            if exc_type is None and self._raw is not None:
+                self._raw.commit()
+        finally:
+            self.close()  # Rolls back anything left uncommitted
+        return False
+
+    def __del__(self):
+        # A caller that never closed its connection still gives the slot back
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class ConnectionPool:
+    """
+    Bounded pool of reusable database connections.
+
+    At most max_size connections are open at once (borrowed plus idle);
+    acquire() waits up to acquire_timeout seconds for one to be returned when
+    they are all in use. Idle connections older than idle_timeout seconds are
+    closed instead of reused, and a connection that has been idle for more than
+    ping_after seconds is health-checked with a trivial query before it is
+    handed out, so a connection the server dropped is replaced transparently.
+    Returned connections are rolled back, so no borrower sees another's
+    uncommitted work.
+    """
+
+    def __init__(self, connect, max_size=4, idle_timeout=300, ping_after=5, acquire_timeout=30):
+        """
+        Args:
+            connect (callable): Opens a new raw connection
+            max_size (int): Maximum number of open connections
+            idle_timeout (float): Seconds an idle connection is kept before it is closed
+            ping_after (float): Idle seconds after which a connection is checked before reuse
+            acquire_timeout (float): Seconds acquire() waits for a free connection
+        """
+        self.connect = connect
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.acquire_timeout = acquire_timeout
+        self.idle = []  # (raw connection, returned_at), most recently returned last
+        self.size = 0   # Open connections, borrowed and idle
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.condition = threading.Condition()
+
+    # --- Borrowing ---
+    def acquire(self):
+        """
+        Borrow a healthy connection, reusing an idle one when possible.
+
+        Returns:
+            PooledConnection: Call close() (or use it as a context manager) to return it
+
+        Raises:
+            TimeoutError: Every connection stayed borrowed for acquire_timeout seconds
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self.condition:
+                expired = self._take_expired()
+                if self.idle:
+                    raw, returned_at = self.idle.pop()
+                elif self.size < self.max_size:
+                    raw, returned_at = None, None
+                    self.size += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No database connection free after {self.acquire_timeout}s "
+                                           f"({self.max_size} in use)")
+                    self.condition.wait(remaining)
+                    continue
+            for stale in expired:
+                self._close_raw(stale)
+
+            if raw is None:
+                return PooledConnection(self, self._open())
+            if time.monotonic() - returned_at < self.ping_after or self._is_healthy(raw):
+                self.reused += 1
+                return PooledConnection(self, raw)
+            print("Discarding a pooled database connection that failed its health check")
+            self._discard(raw)
+
+    def _open(self):
+        """Open a new connection for a slot already counted in size."""
+        try:
+            raw = self.connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        self.created += 1
+        return raw
+
+    def _is_healthy(self, raw):
+        try:
+            cursor = raw.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    # --- Returning ---
+    def release(self, raw):
+        """Roll back and return a borrowed connection; broken connections are discarded."""
+        try:
+            raw.rollback()
+        except Exception:
+            self._discard(raw)
+            return
+        with self.condition:
+            self.idle.append((raw, time.monotonic()))
+            self.condition.notify()
+
+    def _discard(self, raw):
+        self._close_raw(raw)
+        with self.condition:
+            self.size -= 1
+            self.discarded += 1
+            self.condition.notify()
+
+    def _take_expired(self):
+        """Remove idle connections past idle_timeout (caller holds the lock)."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [raw for raw, returned_at in self.idle if returned_at < cutoff]
+        if expired:
+            self.idle = [(raw, returned_at) for raw, returned_at in self.idle if returned_at >= cutoff]
+            self.size -= len(expired)
+            self.discarded += len(expired)
+        return expired
+
+    def _close_raw(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            print(f"Error closing database connection: {traceback.format_exc()}")
+
+    def close_all(self):
+        """Close every idle connection, e.g. on application exit."""
+        with self.condition:
+            idle, self.idle = self.idle, []
+            self.size -= len(idle)
+            self.condition.notify_all()
+        for raw, _ in idle:
+            self._close_raw(raw)
+
+    def stats(self):
+        """
+        Get pool counters.
+
+        Returns:
+            dict: size, idle, created, reused and discarded
+        """
+        with self.condition:
+            return {
+                "size": self.size,
+                "idle": len(self.idle),
+                "created": self.created,
+                "reused": self.reused,
+                "discarded": self.discarded,
+            }
@@ -0,0 +1,205 @@
+import os
+import json
+import hashlib
+import threading
+import unicodedata
+import numpy as np
+
+INDEX_FILE = "index.json"
+DATA_FILE = "embeddings.f32"
+
+def normalize_text(text):
+    """Normalize comment text so trivially different copies share a cache entry."""
+    text = unicodedata.normalize("NFC", str(text))
+    # BERT's basic tokenizer splits on any whitespace, so collapsing it doesn't change tokens
+    return " ".join(text.split())
+
+class EmbeddingCache:
+    """
+    Content-addressed, on-disk cache of mean-pooled float32 embeddings.
+
+    Vectors are appended to a flat float32 file that is read back through a
+    memory map, and a JSON index maps each key to its row. Keys hash the
+    normalized text together with a model fingerprint, so a model or tokenizer
+    change never serves stale vectors. When the index grows past max_entries
+    the least recently used entries are evicted and the data file is compacted.
+
+    One cache is shared by the GUI thread and the classification workers, so
+    every read and write of the index and data file holds the cache's lock.
+    """
+
+    def __init__(self, cache_dir, dim, fingerprint, max_entries=100000):
+        self.cache_dir = cache_dir
+        self.dim = int(dim)
+        self.fingerprint = fingerprint
+        self.max_entries = int(max_entries)
+        self.index_path = os.path.join(cache_dir, INDEX_FILE)
+        self.data_path = os.path.join(cache_dir, DATA_FILE)
+
+        self.entries = {}      # key -> row in the data file
+        self.last_used = {}    # key -> access tick, for LRU eviction
+        self.rows = 0          # rows written to the data file (including evicted ones)
+        self.tick = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memmap = None
+        self._lock = threading.RLock()  # Reentrant: put_many flushes and evicts while holding it
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    # --- Index persistence ---
+    def _load_index(self):
+        if not os.path.exists(self.index_path) or not os.path.exists(self.data_path):
+            self._reset_files()
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                index = json.load(file)
+            if index.get("fingerprint") != self.fingerprint or index.get("dim") != self.dim:
+                print("Embedding cache was built for a different model. Starting a fresh cache.")
+                self._reset_files()
+                return
+            # Ignore a torn trailing row if the last append was interrupted
+            self.rows = min(index.get("rows", 0), os.path.getsize(self.data_path) // (4 * self.dim))
+            for key, (row, used) in index.get("entries", {}).items():
+                if row < self.rows:
+                    self.entries[key] = row
+                    self.last_used[key] = used
+            self.tick = max(self.last_used.values(), default=0)
+        except Exception as e:
+            print(f"Failed to read embedding cache index: {e}. Starting a fresh cache.")
+            self._reset_files()
+
+    def _reset_files(self):
+        with self._lock:
+            self.entries = {}
+            self.last_used = {}
+            self.rows = 0
+            self.tick = 0
+            self._memmap = None
+            open(self.data_path, "wb").close()
+            self.flush()
+
+    def flush(self):
+        """Write the index to disk atomically."""
+        with self._lock:
+            index = {
+                "fingerprint": self.fingerprint,
+                "dim": self.dim,
+                "rows": self.rows,
+                "entries": {key: [row, self.last_used.get(key, 0)] for key, row in self.entries.items()},
+            }
+            temp_path = self.index_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(index, file)
+            os.replace(temp_path, self.index_path)
+
+    # --- Lookup and storage ---
+    def make_key(self, text, max_length):
+        """Cache key for a text embedded with the given token cap."""
+        payload = f"{self.fingerprint}|{max_length}|{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _vectors(self):
+        if self._memmap is None and self.rows:
+            self._memmap = np.memmap(self.data_path, dtype=np.float32, mode="r", shape=(self.rows, self.dim))
+        return self._memmap
+
+    def get_many(self, keys):
+        """
+        Look up cached embeddings.
+
+        Args:
+            keys (list): Keys from make_key
+
+        Returns:
+            dict: key -> np.ndarray for every key that was cached
+        """
+        found = {}
+        with self._lock:
+            vectors = self._vectors()
+            for key in keys:
+                row = self.entries.get(key)
+                if row is None:
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                self.tick += 1
+                self.last_used[key] = self.tick
+                found[key] = np.array(vectors[row])
+        return found
+
+    def put_many(self, keys, embeddings):
+        """
+        Append embeddings for keys that are not cached yet and persist the index.
+
+        Args:
+            keys (list): Keys from make_key
+            embeddings (np.ndarray): One row per key
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(keys), self.dim)
+        new_rows = []
+        with self._lock:
+            with open(self.data_path, "ab") as file:
+                for key, vector in zip(keys, embeddings):
+                    if key in self.entries:
+                        continue
+                    file.write(vector.tobytes())
+                    self.tick += 1
+                    self.entries[key] = self.rows
+                    self.last_used[key] = self.tick
+                    self.rows += 1
+                    new_rows.append(key)
+
+            if new_rows:
+                self._memmap = None  # Remap on next read to see the appended rows
+                if len(self.entries) > self.max_entries:
+                    self._evict()
+                self.flush()
+
+    def _evict(self):
+        """Drop least recently used entries down to 90% of max_entries and compact the data file (lock held)."""
+        target = int(self.max_entries * 0.9)
+        by_age = sorted(self.entries, key=lambda key: self.last_used.get(key, 0))
+        for key in by_age[:len(self.entries) - target]:
+            del self.entries[key]
+            self.last_used.pop(key, None)
+            self.evictions += 1
+
+        # Rewrite the surviving rows so the data file stays bounded
+        vectors = self._vectors()
+        temp_path = self.data_path + ".tmp"
+        compacted = {}
+        with open(temp_path, "wb") as file:
+            for new_row, (key, old_row) in enumerate(sorted(self.entries.items(), key=lambda item: item[1])):
+                file.write(np.asarray(vectors[old_row], dtype=np.float32).tobytes())
+                compacted[key] = new_row
+        self._memmap = None
+        del vectors
+        os.replace(temp_path, self.data_path)
+        self.entries = compacted
+        self.rows = len(compacted)
+
+    def clear(self):
+        """Remove every cached embedding."""
+        self._reset_files()
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: hits, misses, hit_rate, entries, evictions and size_bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "entries": len(self.entries),
+                "evictions": self.evictions,
+                "size_bytes": self.rows * self.dim * 4,
+            }
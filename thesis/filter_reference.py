@@ -0,0 +1,122 @@
+"""
+Plain, one-comment-at-a-time versions of the comment filters.
+
+The optimized filters in text_filters are checked against these in the
+tests and timed against them in benchmark.py.
+"""
+import re
+from bisect import bisect_right
+import pandas as pd
+from text_filters import EMOJI_RANGES, WHITESPACE_CODEPOINTS
+
+def filter_comments_loop(df, filters):
+    """Reference implementation: the original row-by-row filter loop."""
+    min_word_count = filters.get("minWordCount", 3)
+    exclude_links = filters.get("excludeLinks", True)
+    exclude_emojis_only = filters.get("excludeEmojisOnly", True)
+    stats = {'total_comments': len(df), 'short_comment_count': 0, 'name_only_count': 0,
+             'link_comment_count': 0, 'emoji_only_count': 0}
+
+    # Missing texts are compared as empty strings, as filter_comments does
+    texts = df['Text'].fillna("").astype(str)
+    keep_mask = pd.Series(True, index=df.index)
+    for idx, text in texts.items():
+        if is_short_comment_reference(text, min_word_count):
+            keep_mask[idx] = False
+            stats['short_comment_count'] += 1
+            continue
+        if is_name_only_reference(text):
+            keep_mask[idx] = False
+            stats['name_only_count'] += 1
+            continue
+        if exclude_links and contains_link_reference(text):
+            keep_mask[idx] = False
+            stats['link_comment_count'] += 1
+            continue
+        if exclude_emojis_only and is_emoji_only_reference(text):
+            keep_mask[idx] = False
+            stats['emoji_only_count'] += 1
+            continue
+    return df[keep_mask], stats
+
+def is_short_comment_reference(text, min_word_count=3):
+    """The word-count check as it was written in the windows."""
+    return len(text.strip().split()) < min_word_count
+
+def contains_link_reference(text):
+    """The link check as it was written in the windows."""
+    url_pattern = r'https?://\S+|www\.\S+'
+    return bool(re.search(url_pattern, text))
+
+def is_name_only_reference(text):
+    """The name-only check as it was written before the combined pattern."""
+    text = text.lower()
+    name_patterns = [
+        r"^[A-Za-z]+ [A-Za-z]+ [A-Za-z]+$",
+        r"^[A-Za-z]+ @ [A-Za-z]+$",
+        r"^[A-Za-z]+ [A-Za-z]+$",
+        r"^@[A-Za-z0-9_]+$",
+    ]
+    name_markers = ["kuya", "ate", "tita", "tito", "lola", "lolo", "nanay", "tatay",
+                    "mommy", "daddy", "mama", "papa", "inay", "itay", "sis", "bro"]
+    words = text.split()
+    if any(marker in words for marker in name_markers):
+        return True
+    return any(re.search(pattern, text, re.IGNORECASE) for pattern in name_patterns)
+
+def is_emoji_only_reference(text):
+    """The emoji-only check as it was written before the codepoint table."""
+    emoji_pattern = re.compile("["
+                               "\U0001F600-\U0001F64F"
+                               "\U0001F300-\U0001F5FF"
+                               "\U0001F680-\U0001F6FF"
+                               "\U0001F700-\U0001F77F"
+                               "\U0001F780-\U0001F7FF"
+                               "\U0001F800-\U0001F8FF"
+                               "\U0001F900-\U0001F9FF"
+                               "\U0001FA00-\U0001FA6F"
+                               "\U0001FA70-\U0001FAFF"
+                               "\U00002702-\U000027B0"
+                               "\U000024C2-\U0001F251"
+                               "]+|[\u2600-\u26FF\u2700-\u27BF]")
+    text = text.strip()
+    if not text:
+        return False
+    return len(emoji_pattern.sub('', text).strip()) == 0
+
+# --- Per-Character Table Scan ---
+# The codepoint table looked up one character at a time: a byte per BMP
+# codepoint, bisect over the ranges above it. Kept to time against the
+# compiled class in text_filters (see benchmark.py emoji).
+OTHER, EMOJI, SPACE = 0, 1, 2
+
+def build_bmp_table(ranges, whitespace):
+    """Map every BMP codepoint to OTHER, EMOJI or SPACE."""
+    table = bytearray(0x10000)
+    for cp in whitespace:
+        table[cp] = SPACE
+    for first, last in ranges:
+        for cp in range(first, min(last, 0xFFFF) + 1):
+            table[cp] = EMOJI
+    return bytes(table)
+
+BMP_TABLE = build_bmp_table(EMOJI_RANGES, WHITESPACE_CODEPOINTS)
+ASTRAL_RANGES = [(max(first, 0x10000), last) for first, last in EMOJI_RANGES if last > 0xFFFF]
+ASTRAL_STARTS = [first for first, _ in ASTRAL_RANGES]
+
+def is_emoji_only_scan(text):
+    """The emoji-only check as a single scan over the codepoint table, without building a string."""
+    found = False
+    for char in text:
+        cp = ord(char)
+        if cp < 0x10000:
+            kind = BMP_TABLE[cp]
+            if kind == OTHER:
+                return False
+            found = found or kind == EMOJI
+        else:
+            i = bisect_right(ASTRAL_STARTS, cp) - 1
+            if i < 0 or cp > ASTRAL_RANGES[i][1]:
+                return False
+            found = True
+    return found
@@ -1,10 +1,13 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar, QPushButton
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QPainter, QColor, QPixmap, QIcon
 from styles import COLORS, FONTS
 import os
 
 class LoadingOverlay(QWidget):
+    # Emitted when the user clicks Cancel on a cancellable overlay
+    cancel_requested = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
@@ -76,6 +79,36 @@ class LoadingOverlay(QWidget):
         self.progress_bar.hide()
         content_layout.addWidget(self.progress_bar)
         
+        # Progress details (counts and ETA) shown under the progress bar
+        self.progress_label = QLabel("")
+        self.progress_label.setStyleSheet(f"""
+            QLabel {{
+                color: {COLORS['text']};
+                background-color: transparent;
+                border: none;
+                padding: 0;
+                font-size: 12px;
+            }}
+        """)
+        self.progress_label.setAlignment(Qt.AlignCenter)
+        self.progress_label.hide()
+        content_layout.addWidget(self.progress_label)
+        
+        # Cancel button for long-running background jobs
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setStyleSheet(f"""
+            QPushButton {{
+                color: {COLORS['text']};
+                background-color: transparent;
+                border: 1px solid {COLORS['primary']};
+                border-radius: 5px;
+                padding: 4px 16px;
+            }}
+        """)
+        self.cancel_button.clicked.connect(self.request_cancel)
+        self.cancel_button.hide()
+        content_layout.addWidget(self.cancel_button, alignment=Qt.AlignCenter)
+        
         # Add the content container to the main layout
         main_layout.addWidget(self.content_container)
         self.setLayout(main_layout)
@@ -96,19 +129,45 @@ class LoadingOverlay(QWidget):
     def show(self, message="Loading..."):
         self.loading_label.setText(message)
         self.progress_bar.hide()
+        self.progress_label.hide()
+        self.set_cancellable(False)
         self.resize(self.parent().size())
         super().show()
         
-    def show_with_progress(self, message="Loading..."):
+    def show_with_progress(self, message="Loading...", cancellable=False):
         self.loading_label.setText(message)
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
         self.progress_bar.show()
+        self.progress_label.setText("")
+        self.progress_label.show()
+        self.set_cancellable(cancellable)
         self.resize(self.parent().size())
         super().show()
         
     def set_progress(self, value):
         self.progress_bar.setValue(value)
         
+    def set_progress_text(self, text):
+        self.progress_label.setText(text)
+        
+    def set_busy(self, busy=True):
+        """Show an indeterminate progress bar while the total amount of work is unknown."""
+        if busy:
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 100)
+        
+    def set_cancellable(self, cancellable):
+        """Show the Cancel button; the overlay then blocks clicks to the window underneath."""
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setVisible(cancellable)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, not cancellable)
+        
+    def request_cancel(self):
+        self.cancel_button.setEnabled(False)
+        self.cancel_requested.emit()
+        
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
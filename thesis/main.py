@@ -1,9 +1,10 @@
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from gui import MainWindow
 from model import initialize_models
 from setup_db import setup_database
-from db_config import test_connection
+from db_config import test_connection, db_pool
 from disclaimer import DisclaimerDialog
 import traceback
 
@@ -102,6 +103,7 @@ def main():
     try:
         window = MainWindow()
         window.show()
+        app.aboutToQuit.connect(db_pool.close_all)
         sys.exit(app.exec_())
     except Exception as e:
         error_msg = f"CRITICAL: Application failed to start: {e}"
@@ -111,5 +113,7 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Required for the classification pool's worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
     
\ No newline at end of file
@@ -3,9 +3,18 @@ import joblib
 import torch
 import numpy as np
 import random
+import hashlib
+import threading
+from collections import OrderedDict
 # Use only the necessary classes
-from transformers import BertTokenizer, BertModel 
-from utils import get_resource_path # Import the helper function
+from transformers import BertTokenizer, BertTokenizerFast, BertModel 
+from utils import get_resource_path, get_app_data_path, load_settings, save_settings # Import the helper functions
+from embedding_cache import EmbeddingCache, normalize_text
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None  # ONNX backend unavailable; the PyTorch backend is always used
 
 # --- Model Paths ---
 # Define paths using the helper function, assuming a structure
@@ -13,11 +22,67 @@ BASE_MODEL = "bert-base-multilingual-cased"  # Base model for fallback
 CB_MODEL_DIR = get_resource_path(os.path.join("models", "cb_model"))
 SVM_MODEL_PATH = get_resource_path(os.path.join("models", "svm_model.pkl"))
 
+# --- Tokenizer Settings ---
+USE_FAST_TOKENIZER = True  # Rust WordPiece tokenizer; falls back to the pure-Python one if it fails to load
+
+# --- Inference Mode ---
+# "fp32" runs the encoder as trained; "int8" applies dynamic int8 quantization to its
+# Linear layers for faster CPU inference at a small cost in agreement with fp32.
+# Override with the THESIS_INFERENCE_MODE environment variable.
+INFERENCE_MODE = os.environ.get("THESIS_INFERENCE_MODE", "fp32").lower()
+
+# --- Embedding Backend ---
+# "torch" runs BertModel directly; "onnx" runs the same encoder exported to ONNX
+# under ONNX Runtime on CPU. Override with the THESIS_EMBEDDING_BACKEND environment variable.
+EMBEDDING_BACKEND = os.environ.get("THESIS_EMBEDDING_BACKEND", "torch").lower()
+ONNX_OPSET = 17
+ONNX_PARITY_TOLERANCE = 1e-4  # Max abs difference from PyTorch embeddings before ONNX is rejected
+PARITY_CHECK_TEXTS = [
+    "Ang ganda naman ng post mo!",
+    "You are so stupid, nobody likes you",
+    "ok",
+]
+
+# --- CPU Thread Settings ---
+# Intra-op threads split a single operator (e.g. a matmul); inter-op threads run
+# independent operators concurrently. 0 means "not set here": settings.json is
+# consulted next, then the value autotuned on first launch.
+# Override with THESIS_INTRA_OP_THREADS / THESIS_INTER_OP_THREADS.
+INTRA_OP_THREADS = int(os.environ.get("THESIS_INTRA_OP_THREADS", "0") or 0)
+INTER_OP_THREADS = int(os.environ.get("THESIS_INTER_OP_THREADS", "0") or 0)
+DEFAULT_INTER_OP_THREADS = 1  # BERT's forward pass is one op chain; more only contends with Qt and pandas
+AUTOTUNE_THREADS = os.environ.get("THESIS_AUTOTUNE_THREADS", "1") != "0"
+
+# --- Batching Settings ---
+EMBEDDING_MAX_LENGTH = 512   # Token cap per input (mBERT's positional limit)
+COMMENT_MAX_LENGTH = 128     # Tighter cap suited to short Facebook comments
+MAX_PADDING_WASTE = 0.25     # Max fraction of pad tokens allowed in a length bucket
+LOG_BUCKET_STATS = os.environ.get("THESIS_LOG_BUCKET_STATS", "0") == "1"  # Print padding per bucketed call
+POOLING_MODE = "masked"      # "masked" ignores pad tokens; "mean" averages over every position (legacy)
+
+# --- Embedding Cache Settings ---
+ENABLE_EMBEDDING_CACHE = True
+EMBEDDING_CACHE_MAX_ENTRIES = 100000  # ~300 MB of 768-dim float32 vectors
+
+# --- Classification Memo Settings ---
+CLASSIFICATION_MEMO_SIZE = 4096  # Recent (label, confidence) results kept in memory
+
 # --- Global Variables ---
 tokenizer = None
 model = None
 svm_classifier = None
 device = None
+inference_mode = None
+embedding_backend = None
+onnx_session = None
+intra_op_threads = None
+inter_op_threads = None
+embedding_cache = None
+model_version = None
+classification_memo = OrderedDict()
+memo_lock = threading.Lock()  # The memo is shared by the GUI thread and the classification workers
+memo_stats = {"hits": 0, "misses": 0}
+padding_stats = {"batches": 0, "real_tokens": 0, "processed_tokens": 0, "padded_tokens": 0}
 
 # --- Model Loading Function ---
 def load_bert_model(model_path, model_name="Model"):
@@ -48,9 +113,218 @@ def load_bert_model(model_path, model_name="Model"):
              print(f"CRITICAL: Failed to load fallback model {BASE_MODEL}: {fallback_e}")
              return None # Indicate critical failure
 
-def initialize_models():
-    """Loads the mBERT model, tokenizer, and SVM."""
-    global tokenizer, model, svm_classifier, device
+def load_tokenizer(tokenizer_path, use_fast=True):
+    """Load the fast (Rust) tokenizer if possible, otherwise the pure-Python BertTokenizer."""
+    if not os.path.isdir(tokenizer_path):
+        print(f"Tokenizer directory not found: {tokenizer_path}. Falling back to {BASE_MODEL}.")
+        tokenizer_path = BASE_MODEL
+
+    if use_fast:
+        try:
+            # Built from vocab.txt + tokenizer_config.json, same WordPiece vocabulary
+            fast_tokenizer = BertTokenizerFast.from_pretrained(tokenizer_path)
+            print(f"Fast tokenizer loaded successfully from {tokenizer_path}")
+            return fast_tokenizer
+        except Exception as e:
+            print(f"Failed to load fast tokenizer from {tokenizer_path}: {e}. Using slow tokenizer.")
+
+    try:
+        slow_tokenizer = BertTokenizer.from_pretrained(tokenizer_path)
+        print(f"Tokenizer loaded successfully from {tokenizer_path}")
+        return slow_tokenizer
+    except Exception as e:
+        print(f"Failed to load tokenizer from {tokenizer_path}: {e}. Falling back to {BASE_MODEL}.")
+        return BertTokenizer.from_pretrained(BASE_MODEL)
+
+def quantize_model(bert_model):
+    """Apply dynamic int8 quantization to the Linear layers of a CPU BertModel."""
+    try:
+        from torch.ao.quantization import quantize_dynamic
+    except ImportError:
+        from torch.quantization import quantize_dynamic
+    return quantize_dynamic(bert_model, {torch.nn.Linear}, dtype=torch.qint8)
+
+# --- CPU Thread Configuration ---
+def thread_candidates(cpu_count=None):
+    """Intra-op thread counts worth trying, leaving one core free for the Qt event loop."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    ceiling = max(1, cpu_count - 1)
+    return sorted({n for n in (1, 2, 4, 8, 12, 16) if n <= ceiling} | {ceiling})
+
+def autotune_threads(sample_texts=None, candidates=None, repeats=3):
+    """
+    Time a sample batch at several intra-op thread counts and return the fastest.
+    
+    Args:
+        sample_texts (list): Texts forming the sample batch; defaults to PARITY_CHECK_TEXTS x 8
+        candidates (list): Thread counts to try; defaults to thread_candidates()
+        repeats (int): Timed runs per thread count (best one counts)
+        
+    Returns:
+        int: Intra-op thread count with the lowest batch latency
+    """
+    import time
+
+    inputs = tokenizer(sample_texts or PARITY_CHECK_TEXTS * 8, return_tensors='pt', padding=True,
+                       truncation=True, max_length=COMMENT_MAX_LENGTH)
+    original = torch.get_num_threads()
+    timings = {}
+    try:
+        for threads in candidates or thread_candidates():
+            torch.set_num_threads(threads)
+            embed_inputs_torch(inputs)  # Warm-up
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                embed_inputs_torch(inputs)
+                best = min(best, time.perf_counter() - start)
+            timings[threads] = best
+            print(f"  {threads:>2} intra-op threads: {best * 1000:.1f} ms per sample batch")
+    finally:
+        torch.set_num_threads(original)
+
+    # Prefer fewer threads unless more are at least 5% faster
+    fastest = min(timings.values())
+    return min(threads for threads, seconds in timings.items() if seconds <= fastest * 1.05)
+
+def configure_threads():
+    """
+    Apply intra-op and inter-op thread counts to torch.
+    
+    Each count comes from the environment variable, then settings.json, then
+    (intra-op only) the autotuned value persisted for this machine. If none is
+    available and AUTOTUNE_THREADS is on, the autotuner runs and its result is
+    saved for later launches.
+    """
+    global intra_op_threads, inter_op_threads
+
+    settings = load_settings()
+    cpu_count = os.cpu_count() or 1
+
+    inter_op_threads = INTER_OP_THREADS or int(settings.get("inter_op_threads") or 0) or DEFAULT_INTER_OP_THREADS
+    if torch.get_num_interop_threads() != inter_op_threads:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError as e:
+            # Only allowed once, before any inter-op parallel work has started
+            print(f"Could not set inter-op threads to {inter_op_threads}: {e}")
+            inter_op_threads = torch.get_num_interop_threads()
+
+    intra_op_threads = INTRA_OP_THREADS or int(settings.get("intra_op_threads") or 0)
+    source = "configured"
+    if not intra_op_threads:
+        autotuned = settings.get("autotuned_threads") or {}
+        if autotuned.get("cpu_count") == cpu_count and autotuned.get("intra_op"):
+            intra_op_threads = int(autotuned["intra_op"])
+            source = "autotuned"
+        elif AUTOTUNE_THREADS and device.type == "cpu":
+            print("Autotuning CPU threads for inference (first launch on this machine)...")
+            intra_op_threads = autotune_threads()
+            save_settings(autotuned_threads={"intra_op": intra_op_threads, "cpu_count": cpu_count})
+            source = "autotuned"
+        else:
+            intra_op_threads = torch.get_num_threads()
+            source = "torch default"
+
+    torch.set_num_threads(intra_op_threads)
+    print(f"CPU threads: {intra_op_threads} intra-op ({source}), {inter_op_threads} inter-op.")
+
+# --- ONNX Runtime Backend ---
+class LastHiddenState(torch.nn.Module):
+    """Wrap BertModel so the exported graph has a single last_hidden_state output."""
+
+    def __init__(self, bert_model):
+        super().__init__()
+        self.bert_model = bert_model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.bert_model(input_ids=input_ids, attention_mask=attention_mask,
+                               token_type_ids=token_type_ids).last_hidden_state
+
+def export_onnx(bert_model, onnx_path):
+    """
+    Export the fp32 encoder to ONNX with dynamic batch and sequence axes.
+    
+    Args:
+        bert_model (BertModel): Unquantized encoder, on any device
+        onnx_path (str): Destination .onnx file
+    """
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    # Pad two samples of different length so the traced mask path is the general one
+    sample = tokenizer(["export sample", "a slightly longer export sample"], padding=True, return_tensors="pt")
+    wrapper = LastHiddenState(bert_model).cpu().eval()
+    temp_path = onnx_path + ".tmp"
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            tuple(sample[name] for name in input_names),
+            temp_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]},
+            opset_version=ONNX_OPSET,
+            dynamo=False,
+        )
+    bert_model.to(device)
+    os.replace(temp_path, onnx_path)
+
+def load_onnx_session(bert_model):
+    """
+    Export the encoder to ONNX (once per model version) and open an ONNX Runtime session.
+    
+    Args:
+        bert_model (BertModel): Unquantized encoder to export
+        
+    Returns:
+        onnxruntime.InferenceSession: CPU session, or None if ONNX Runtime is unavailable or fails
+    """
+    if onnxruntime is None:
+        print("onnxruntime is not installed. Using the PyTorch backend.")
+        return None
+    try:
+        # The file name tracks the model files, so retraining triggers a fresh export
+        onnx_path = os.path.join(get_app_data_path("onnx"), f"cb_model-{model_fingerprint()[:16]}.onnx")
+        if not os.path.exists(onnx_path):
+            print(f"Exporting mBERT to ONNX at {onnx_path}...")
+            export_onnx(bert_model, onnx_path)
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = intra_op_threads or 0
+        session_options.inter_op_num_threads = inter_op_threads or 0
+        session = onnxruntime.InferenceSession(onnx_path, session_options, providers=["CPUExecutionProvider"])
+        print(f"ONNX Runtime session loaded from {onnx_path}")
+        return session
+    except Exception as e:
+        print(f"Failed to load ONNX backend: {e}. Using the PyTorch backend.")
+        return None
+
+def check_backend_parity(texts=None, tolerance=ONNX_PARITY_TOLERANCE):
+    """
+    Compare ONNX Runtime embeddings against PyTorch embeddings for sample texts.
+    
+    Args:
+        texts (list): Texts to embed with both backends; defaults to PARITY_CHECK_TEXTS
+        tolerance (float): Maximum allowed absolute difference
+        
+    Returns:
+        tuple: (passed, max_abs_difference)
+    """
+    inputs = tokenizer(texts or PARITY_CHECK_TEXTS, return_tensors='pt', padding=True,
+                       truncation=True, max_length=EMBEDDING_MAX_LENGTH)
+    torch_embeddings = embed_inputs_torch(inputs)
+    onnx_embeddings = embed_inputs_onnx(inputs)
+    difference = float(np.max(np.abs(torch_embeddings - onnx_embeddings)))
+    return difference <= tolerance, difference
+
+def initialize_models(mode=None, backend=None):
+    """
+    Loads the mBERT model, tokenizer, and SVM.
+    
+    Args:
+        mode (str): "fp32" or "int8"; defaults to INFERENCE_MODE
+        backend (str): "torch" or "onnx"; defaults to EMBEDDING_BACKEND
+    """
+    global tokenizer, model, svm_classifier, device, model_version, inference_mode
+    global embedding_backend, onnx_session
 
     print("Initializing models (mBERT + SVM)...")
     
@@ -59,17 +333,7 @@ def initialize_models():
     print(f"Using device: {device}")
 
     # Load Tokenizer
-    tokenizer_path = CB_MODEL_DIR 
-    try:
-        if os.path.isdir(tokenizer_path):
-             tokenizer = BertTokenizer.from_pretrained(tokenizer_path)
-             print(f"Tokenizer loaded successfully from {tokenizer_path}")
-        else:
-             print(f"Tokenizer directory not found: {tokenizer_path}. Falling back to {BASE_MODEL}.")
-             tokenizer = BertTokenizer.from_pretrained(BASE_MODEL)
-    except Exception as e:
-        print(f"Failed to load tokenizer from {tokenizer_path}: {e}. Falling back to {BASE_MODEL}.")
-        tokenizer = BertTokenizer.from_pretrained(BASE_MODEL)
+    tokenizer = load_tokenizer(CB_MODEL_DIR, use_fast=USE_FAST_TOKENIZER)
 
     # Load BERT Model
     model = load_bert_model(CB_MODEL_DIR, "mBERT Model")
@@ -82,6 +346,55 @@ def initialize_models():
     model = model.to(device)
     model.eval()
 
+    # Pin thread counts before any inference so throughput is predictable
+    configure_threads()
+
+    inference_mode = (mode or INFERENCE_MODE).lower()
+
+    # Select the embedding backend (the ONNX graph is exported from the fp32 encoder)
+    embedding_backend = (backend or EMBEDDING_BACKEND).lower()
+    onnx_session = None
+    if embedding_backend == "onnx":
+        if inference_mode == "int8":
+            print("int8 inference applies to the PyTorch backend only. Using fp32 with ONNX Runtime.")
+            inference_mode = "fp32"
+        onnx_session = load_onnx_session(model)
+        if onnx_session is not None:
+            passed, difference = check_backend_parity()
+            if passed:
+                print(f"ONNX parity check passed (max abs difference {difference:.2e}).")
+            else:
+                print(f"ONNX parity check failed (max abs difference {difference:.2e}). Using the PyTorch backend.")
+                onnx_session = None
+        if onnx_session is None:
+            embedding_backend = "torch"
+    elif embedding_backend != "torch":
+        print(f"Unknown embedding backend '{embedding_backend}'. Using the PyTorch backend.")
+        embedding_backend = "torch"
+    print(f"Embedding backend: {embedding_backend}")
+
+    # Optionally quantize the encoder (dynamic quantization only runs on CPU)
+    if inference_mode == "int8":
+        if device.type == "cpu":
+            try:
+                model = quantize_model(model)
+                print("Applied dynamic int8 quantization to mBERT Linear layers.")
+            except Exception as e:
+                print(f"Failed to quantize mBERT: {e}. Using fp32 inference.")
+                inference_mode = "fp32"
+        else:
+            print("int8 inference is CPU-only. Using fp32 inference on GPU.")
+            inference_mode = "fp32"
+    elif inference_mode != "fp32":
+        print(f"Unknown inference mode '{inference_mode}'. Using fp32 inference.")
+        inference_mode = "fp32"
+    print(f"Inference mode: {inference_mode}")
+
+    # Open the persistent embedding cache
+    model_version = model_fingerprint()
+    clear_classification_memo()
+    initialize_embedding_cache()
+
     # Load SVM Classifier
     if os.path.exists(SVM_MODEL_PATH):
         try:
@@ -94,35 +407,367 @@ def initialize_models():
 
     print("Model initialization complete.")
 
+# --- Embedding Cache ---
+def model_fingerprint():
+    """Identify the loaded model, tokenizer, pooling, inference mode and backend so cached embeddings are never reused across them."""
+    hasher = hashlib.sha256()
+    hasher.update(type(model).__name__.encode("utf-8"))
+    hasher.update(str(getattr(model.config, "_name_or_path", "")).encode("utf-8"))
+    hasher.update(POOLING_MODE.encode("utf-8"))
+    hasher.update(str(inference_mode).encode("utf-8"))
+    hasher.update(str(embedding_backend).encode("utf-8"))
+    for file_name in ("config.json", "vocab.txt", "tokenizer_config.json", "special_tokens_map.json",
+                      "model.safetensors", "pytorch_model.bin"):
+        file_path = os.path.join(CB_MODEL_DIR, file_name)
+        if os.path.exists(file_path):
+            stat = os.stat(file_path)
+            # Size and mtime stand in for hashing multi-hundred-MB weight files
+            hasher.update(f"{file_name}:{stat.st_size}:{int(stat.st_mtime)}".encode("utf-8"))
+    return hasher.hexdigest()
+
+def initialize_embedding_cache():
+    """Open the on-disk embedding cache for the loaded model, or disable caching on failure."""
+    global embedding_cache
+
+    embedding_cache = None
+    if not ENABLE_EMBEDDING_CACHE:
+        return
+    try:
+        embedding_cache = EmbeddingCache(
+            get_app_data_path("embedding_cache"),
+            model.config.hidden_size,
+            model_version or model_fingerprint(),
+            max_entries=EMBEDDING_CACHE_MAX_ENTRIES
+        )
+        print(f"Embedding cache ready with {len(embedding_cache.entries)} entries.")
+    except Exception as e:
+        print(f"Failed to open embedding cache: {e}. Continuing without it.")
+        embedding_cache = None
+
+def get_embedding_cache_stats():
+    """
+    Get hit/miss counters for the embedding cache.
+    
+    Returns:
+        dict: Cache counters, or an empty dict if caching is disabled
+    """
+    return embedding_cache.stats() if embedding_cache else {}
+
+def cached_embeddings(texts, max_length, embed_fn):
+    """
+    Serve embeddings from the cache and compute only the misses.
+    
+    Args:
+        texts (list): Texts to embed
+        max_length (int): Token cap, part of the cache key
+        embed_fn (callable): Computes embeddings for a list of uncached texts
+        
+    Returns:
+        np.ndarray: One embedding row per input text
+    """
+    if not embedding_cache:
+        return embed_fn(texts)
+
+    keys = [embedding_cache.make_key(text, max_length) for text in texts]
+    found = embedding_cache.get_many(keys)
+
+    # Embed each distinct missing key once
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        computed = embed_fn(list(missing.values()))
+        try:
+            embedding_cache.put_many(list(missing.keys()), computed)
+        except Exception as e:
+            print(f"Failed to write embedding cache: {e}")
+        found.update(zip(missing.keys(), computed))
+
+    return np.vstack([found[key] for key in keys]).astype(np.float32, copy=False)
+
+# --- Classification Memo ---
+def memo_lookup(text):
+    """Return a memoized (label, confidence) for text under the loaded model, or None."""
+    key = (model_version, text)
+    with memo_lock:
+        result = classification_memo.get(key)
+        if result is None:
+            memo_stats["misses"] += 1
+            return None
+        memo_stats["hits"] += 1
+        classification_memo.move_to_end(key)
+        return result
+
+def memo_store(text, result):
+    """Remember a (label, confidence) result, evicting the least recently used entries."""
+    if CLASSIFICATION_MEMO_SIZE <= 0 or result[0] == "Error":
+        return
+    with memo_lock:
+        classification_memo[(model_version, text)] = result
+        classification_memo.move_to_end((model_version, text))
+        while len(classification_memo) > CLASSIFICATION_MEMO_SIZE:
+            classification_memo.popitem(last=False)
+
+def set_classification_memo_size(capacity):
+    """Change how many recent classifications are memoized (0 disables the memo)."""
+    global CLASSIFICATION_MEMO_SIZE
+    CLASSIFICATION_MEMO_SIZE = max(0, int(capacity))
+    with memo_lock:
+        while len(classification_memo) > CLASSIFICATION_MEMO_SIZE:
+            classification_memo.popitem(last=False)
+
+def clear_classification_memo():
+    """Forget all memoized classifications and reset the counters."""
+    with memo_lock:
+        classification_memo.clear()
+        memo_stats["hits"] = 0
+        memo_stats["misses"] = 0
+
+def get_classification_memo_stats():
+    """
+    Get counters for the classification memo.
+    
+    Returns:
+        dict: hits, misses, hit_rate, size and capacity
+    """
+    with memo_lock:
+        lookups = memo_stats["hits"] + memo_stats["misses"]
+        return {
+            "hits": memo_stats["hits"],
+            "misses": memo_stats["misses"],
+            "hit_rate": (memo_stats["hits"] / lookups) if lookups else 0.0,
+            "size": len(classification_memo),
+            "capacity": CLASSIFICATION_MEMO_SIZE,
+        }
+
 # --- Embedding Generation with Mean Pooling ---
-def generate_embedding(text):
-    """Generate embeddings for text using mean pooling from mBERT model."""
-    global tokenizer, model, device
+def mean_pool(last_hidden_state, attention_mask, mode=None):
+    """
+    Mean-pool token embeddings into one vector per input.
+    
+    In "masked" mode only real tokens (attention_mask == 1) are averaged, so an
+    input's embedding does not depend on how much padding its batch needed.
+    "mean" averages every position, pad tokens included, as older builds did.
+    
+    Args:
+        last_hidden_state (torch.Tensor): (batch, seq_len, hidden) token embeddings
+        attention_mask (torch.Tensor): (batch, seq_len) mask of real tokens
+        mode (str): "masked" or "mean"; defaults to POOLING_MODE
+        
+    Returns:
+        torch.Tensor: (batch, hidden) pooled embeddings
+    """
+    mode = mode or POOLING_MODE
+    if mode == "mean" or attention_mask is None:
+        return last_hidden_state.mean(dim=1)
+    if mode != "masked":
+        raise ValueError(f"Unknown pooling mode: {mode}")
 
-    if not all([tokenizer, model]):
-        raise RuntimeError("Models not initialized. Call initialize_models() first.")
+    mask = attention_mask.unsqueeze(-1).to(last_hidden_state.dtype)
+    summed = (last_hidden_state * mask).sum(dim=1)
+    counts = mask.sum(dim=1).clamp(min=1e-9)
+    return summed / counts
+
+def embed_inputs(inputs):
+    """Run tokenized, padded inputs through the selected backend and mean-pool the last hidden state."""
+    if onnx_session is not None:
+        return embed_inputs_onnx(inputs)
+    return embed_inputs_torch(inputs)
+
+def embed_inputs_onnx(inputs):
+    """Run tokenized, padded inputs through the ONNX Runtime session and mean-pool on CPU."""
+    feeds = {}
+    for session_input in onnx_session.get_inputs():
+        if session_input.name in inputs:
+            feeds[session_input.name] = inputs[session_input.name].cpu().numpy().astype(np.int64)
+        else:
+            feeds[session_input.name] = np.zeros_like(inputs['input_ids'].cpu().numpy(), dtype=np.int64)
+    last_hidden_state = onnx_session.run(["last_hidden_state"], feeds)[0]
+
+    # Same pooling as the PyTorch path so both backends yield the same vector
+    attention_mask = inputs.get('attention_mask')
+    if attention_mask is not None:
+        attention_mask = attention_mask.cpu()
+    return mean_pool(torch.from_numpy(last_hidden_state), attention_mask).numpy()
 
+def embed_inputs_torch(inputs):
+    """Run tokenized, padded inputs through the PyTorch BertModel and mean-pool the last hidden state."""
     with torch.no_grad():
-        # Convert to list if it's a single string
-        if isinstance(text, str):
-            text = [text]
-            
-        # Tokenize
-        inputs = tokenizer(text, return_tensors='pt', padding=True, truncation=True, max_length=512).to(device)
+        inputs = inputs.to(device)
         
         # Get model outputs
         outputs = model(**inputs)
         
         # Mean pooling instead of CLS token
-        mean_embeddings = outputs.last_hidden_state.mean(dim=1).cpu().numpy()
+        mean_embeddings = mean_pool(outputs.last_hidden_state, inputs.get('attention_mask')).cpu().numpy()
         
     return mean_embeddings
 
+def generate_embedding(text, max_length=EMBEDDING_MAX_LENGTH):
+    """Generate embeddings for text using mean pooling from mBERT model."""
+    if not all([tokenizer, model]):
+        raise RuntimeError("Models not initialized. Call initialize_models() first.")
+
+    # Convert to list if it's a single string
+    if isinstance(text, str):
+        text = [text]
+        
+    def embed_uncached(texts):
+        # Tokenize
+        inputs = tokenizer(texts, return_tensors='pt', padding=True, truncation=True, max_length=max_length)
+        return embed_inputs(inputs)
+    
+    return cached_embeddings(list(text), max_length, embed_uncached)
+
+# --- Length-Bucketed Batching ---
+def bucket_by_length(lengths, max_batch_size=32, max_padding_waste=MAX_PADDING_WASTE):
+    """
+    Group input indices into buckets of similar token length.
+    
+    Indices are sorted by length and a bucket is closed as soon as adding the
+    next input would exceed max_batch_size or push the share of pad tokens in
+    the bucket above max_padding_waste.
+    
+    Args:
+        lengths (list): Token count of each input
+        max_batch_size (int): Maximum number of inputs per bucket
+        max_padding_waste (float): Maximum fraction of pad tokens per bucket (0-1)
+        
+    Returns:
+        list: Buckets, each a list of indices into lengths
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    buckets = []
+    current = []
+    current_tokens = 0
+
+    for index in order:
+        length = lengths[index]
+        # Inputs are visited shortest first, so the new one sets the padded width
+        padded_total = length * (len(current) + 1)
+        waste = (padded_total - current_tokens - length) / padded_total if padded_total else 0.0
+        if current and (len(current) >= max_batch_size or waste > max_padding_waste):
+            buckets.append(current)
+            current = []
+            current_tokens = 0
+        current.append(index)
+        current_tokens += length
+
+    if current:
+        buckets.append(current)
+    return buckets
+
+def generate_embeddings_bucketed(texts, max_length=EMBEDDING_MAX_LENGTH, max_batch_size=32,
+                                 max_padding_waste=MAX_PADDING_WASTE):
+    """
+    Generate embeddings for many texts using length-bucketed dynamic padding.
+    
+    Texts are tokenized once, grouped into buckets of similar length, padded
+    only to the longest member of their bucket, embedded, and returned in the
+    original input order. Texts already in the embedding cache skip the model.
+    Token counts are accumulated in padding_stats.
+    
+    Args:
+        texts (list): Texts to embed
+        max_length (int): Token cap per text (e.g. COMMENT_MAX_LENGTH)
+        max_batch_size (int): Maximum number of texts per forward pass
+        max_padding_waste (float): Maximum fraction of pad tokens per bucket (0-1)
+        
+    Returns:
+        np.ndarray: One embedding row per input text
+    """
+    if not all([tokenizer, model]):
+        raise RuntimeError("Models not initialized. Call initialize_models() first.")
+
+    if isinstance(texts, str):
+        texts = [texts]
+    if not texts:
+        return np.zeros((0, model.config.hidden_size), dtype=np.float32)
+
+    return cached_embeddings(
+        list(texts), max_length,
+        lambda uncached: embed_bucketed(uncached, max_length, max_batch_size, max_padding_waste)
+    )
+
+def embed_bucketed(texts, max_length, max_batch_size, max_padding_waste):
+    """Embed texts with length-bucketed padding, bypassing the cache."""
+    # Tokenize once without padding to learn each text's true length
+    encodings = tokenizer(list(texts), truncation=True, max_length=max_length)
+    lengths = [len(ids) for ids in encodings['input_ids']]
+
+    embeddings = None
+    real_tokens = 0
+    processed_tokens = 0
+    buckets = bucket_by_length(lengths, max_batch_size, max_padding_waste)
+
+    for bucket in buckets:
+        features = [{key: encodings[key][i] for key in encodings.keys()} for i in bucket]
+        inputs = tokenizer.pad(features, padding=True, return_tensors='pt')
+        bucket_embeddings = embed_inputs(inputs)
+
+        if embeddings is None:
+            embeddings = np.zeros((len(texts), bucket_embeddings.shape[1]), dtype=bucket_embeddings.dtype)
+        # Restore the original order
+        embeddings[bucket] = bucket_embeddings
+
+        real_tokens += sum(lengths[i] for i in bucket)
+        processed_tokens += max(lengths[i] for i in bucket) * len(bucket)
+
+    padding_stats["batches"] += len(buckets)
+    padding_stats["real_tokens"] += real_tokens
+    padding_stats["processed_tokens"] += processed_tokens
+    padding_stats["padded_tokens"] += processed_tokens - real_tokens
+
+    if LOG_BUCKET_STATS:
+        # What a single pad-to-longest batching of the same inputs would have cost
+        naive_tokens = sum(
+            max(lengths[start:start + max_batch_size]) * len(lengths[start:start + max_batch_size])
+            for start in range(0, len(lengths), max_batch_size)
+        )
+        print(f"Embedded {len(texts)} texts in {len(buckets)} buckets: "
+              f"{processed_tokens} tokens processed, {processed_tokens - real_tokens} padded "
+              f"(unbucketed batching would process {naive_tokens}).")
+
+    return embeddings
+
+def get_padding_stats():
+    """
+    Get cumulative token counts for bucketed embedding batches.
+    
+    Returns:
+        dict: batches, real_tokens, processed_tokens, padded_tokens and padding_ratio
+    """
+    stats = dict(padding_stats)
+    processed = stats["processed_tokens"]
+    stats["padding_ratio"] = (stats["padded_tokens"] / processed) if processed else 0.0
+    return stats
+
+def reset_padding_stats():
+    """Reset the cumulative token counts in padding_stats."""
+    for key in padding_stats:
+        padding_stats[key] = 0
+
+# --- Guidance Label Mapping ---
+def guidance_label(prediction, confidence_score):
+    """Map a binary SVM prediction and its confidence (0-100) to a guidance label."""
+    # Convert the raw confidence to a threshold-based system
+    # For binary prediction 1 (cyberbullying):
+    if prediction == 1:
+        if confidence_score >= 80:
+            return "Potentially Harmful"  # High confidence harmful content
+        return "Requires Review"   # Lower confidence, but has concerning elements
+    # For binary prediction 0 (normal):
+    if confidence_score >= 80:
+        return "Likely Appropriate"   # High confidence appropriate content
+    return "Requires Review"   # Lower confidence, might have subtle issues
+
 # --- Classification Function ---
-def classify_comment(text):
+def classify_comment(text, max_length=EMBEDDING_MAX_LENGTH):
     """
     Classifies a single comment using the mBERT -> SVM pipeline.
     Returns guidance-oriented prediction label and the confidence score (0-100).
+    max_length is the token cap, as in classify_comments.
     
     Instead of a binary classification (Cyberbullying/Normal), this now returns
     a three-level guidance system:
@@ -130,7 +775,6 @@ def classify_comment(text):
     - "Requires Review" (new neutral/middle category)
     - "Likely Appropriate" (was Normal)
     """
-    global svm_classifier
     if not svm_classifier:
          # Attempt to initialize if not already done (or raise error)
          print("SVM classifier not loaded. Attempting initialization...")
@@ -138,9 +782,16 @@ def classify_comment(text):
          if not svm_classifier: # Check again after attempting initialization
              raise RuntimeError("SVM classifier failed to initialize.")
 
+    # Recently classified text costs a dict lookup instead of a forward pass
+    # (the memo holds results for the default token cap only)
+    use_memo = max_length == EMBEDDING_MAX_LENGTH
+    memoized = memo_lookup(text) if use_memo else None
+    if memoized is not None:
+        return memoized
+
     try:
         # Generate embedding using mean pooling
-        embedding = generate_embedding(text)
+        embedding = generate_embedding(text, max_length=max_length)
 
         # Get prediction (0 or 1) from SVM - original binary classification
         prediction = svm_classifier.predict(embedding)
@@ -173,21 +824,10 @@ def classify_comment(text):
 
         # New 3-level classification based on confidence and original binary prediction
         # Instead of just returning Cyberbullying (1) or Normal (0)
+        prediction_label = guidance_label(prediction[0], confidence_score)
         
-        # Convert the raw confidence to a threshold-based system
-        # For binary prediction 1 (cyberbullying):
-        if prediction[0] == 1:
-            if confidence_score >= 80:
-                prediction_label = "Potentially Harmful"  # High confidence harmful content
-            else:
-                prediction_label = "Requires Review"   # Lower confidence, but has concerning elements
-        # For binary prediction 0 (normal):
-        else:
-            if confidence_score >= 80:
-                prediction_label = "Likely Appropriate"   # High confidence appropriate content
-            else:
-                prediction_label = "Requires Review"   # Lower confidence, might have subtle issues
-        
+        if use_memo:
+            memo_store(text, (prediction_label, confidence_score))
         return prediction_label, confidence_score
 
     except Exception as e:
@@ -195,6 +835,124 @@ def classify_comment(text):
         # Consider more specific error handling or logging
         return "Error", 0.0
 
+# --- Batched Classification ---
+def deduplicate_texts(texts):
+    """
+    Collapse texts that are identical after normalization.
+    
+    Args:
+        texts (list): Texts, possibly with repeats
+        
+    Returns:
+        tuple: (unique_texts, inverse) where texts[i] maps to unique_texts[inverse[i]]
+    """
+    unique_texts = []
+    positions = {}
+    inverse = []
+    for text in texts:
+        key = normalize_text(text)
+        if key not in positions:
+            positions[key] = len(unique_texts)
+            unique_texts.append(text)
+        inverse.append(positions[key])
+    return unique_texts, inverse
+
+def count_duplicates(texts):
+    """Number of texts that repeat an earlier text after normalization."""
+    return len(texts) - len({normalize_text(text) for text in texts})
+
+def batch_confidence_scores(embeddings, predictions):
+    """
+    Confidence scores (0-100) for a batch of embeddings, mirroring classify_comment.
+    
+    Args:
+        embeddings (np.ndarray): Mean-pooled embeddings, one row per comment
+        predictions (np.ndarray): Binary SVM predictions for the same rows
+        
+    Returns:
+        np.ndarray: Confidence score per row
+    """
+    try:
+        # Try to get probabilities if available
+        probabilities = svm_classifier.predict_proba(embeddings)
+        confidence_scores = np.max(probabilities, axis=1) * 100.0
+    except:
+        # If predict_proba is not available, use decision function
+        try:
+            decision_scores = np.asarray(svm_classifier.decision_function(embeddings))
+            if decision_scores.ndim > 1:
+                decision_scores = np.max(decision_scores, axis=1)
+            confidence_scores = np.clip((np.abs(decision_scores) / 2.0) * 100.0, 0.0, 100.0)
+        except:
+            # If decision_function also fails, keep default confidence
+            confidence_scores = np.full(len(predictions), 100.0)
+    return confidence_scores.astype(float)
+
+def classify_comments(texts, batch_size=32, max_length=EMBEDDING_MAX_LENGTH):
+    """
+    Classifies many comments using the mBERT -> SVM pipeline in mini-batches.
+    
+    Identical comments (after whitespace normalization) are classified once
+    and the result is fanned out to every occurrence. Each batch is embedded
+    with length-bucketed padding, and the SVM is queried once per batch.
+    Results use the same guidance labels and confidence scale as
+    classify_comment.
+    
+    Args:
+        texts (list): Comment strings to classify
+        batch_size (int): Maximum number of comments embedded per forward pass
+        max_length (int): Token cap per comment (COMMENT_MAX_LENGTH trades long-comment
+            fidelity for speed)
+        
+    Returns:
+        list: (prediction_label, confidence_score) tuples aligned with texts
+    """
+    if not svm_classifier:
+         print("SVM classifier not loaded. Attempting initialization...")
+         initialize_models()
+         if not svm_classifier:
+             raise RuntimeError("SVM classifier failed to initialize.")
+
+    texts = [str(text) for text in texts]
+    batch_size = max(1, int(batch_size))
+
+    # Infer each distinct comment once and fan the results back out
+    unique_texts, inverse = deduplicate_texts(texts)
+    if len(unique_texts) < len(texts):
+        print(f"Classifying {len(unique_texts)} unique comments out of {len(texts)}.")
+        unique_results = classify_comments(unique_texts, batch_size=batch_size, max_length=max_length)
+        return [unique_results[i] for i in inverse]
+    # The memo holds results for the default token cap only
+    use_memo = max_length == EMBEDDING_MAX_LENGTH
+    results = [memo_lookup(text) if use_memo else None for text in texts]
+    pending = [i for i, result in enumerate(results) if result is None]
+
+    # Each chunk is bucketed by length internally, so chunks can be larger than a
+    # single forward pass without paying for extra padding
+    chunk_size = batch_size * 8
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        batch = [texts[i] for i in chunk]
+        try:
+            embeddings = generate_embeddings_bucketed(batch, max_length=max_length, max_batch_size=batch_size)
+            predictions = svm_classifier.predict(embeddings)
+            confidence_scores = batch_confidence_scores(embeddings, predictions)
+
+            for i, prediction, confidence_score in zip(chunk, predictions, confidence_scores):
+                # If confidence is 100, make it random between 90-95 to avoid seeming too certain
+                if confidence_score >= 99.99:
+                    confidence_score = random.uniform(90.0, 95.0)
+                results[i] = (guidance_label(prediction, confidence_score), float(confidence_score))
+                if use_memo:
+                    memo_store(texts[i], results[i])
+        except Exception as e:
+            # Fall back to one-by-one so a single bad comment doesn't fail the whole batch
+            print(f"Error during batch classification ({len(batch)} comments): {e}. Falling back to single classification.")
+            for i in chunk:
+                results[i] = classify_comment(texts[i], max_length=max_length)
+
+    return results
+
 # --- Initial Model Load ---
 # Call initialization when the module is loaded or before first use
 # initialize_models()
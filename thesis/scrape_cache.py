@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+def format_age(seconds):
+    """Describe an entry age as e.g. '45 s', '12 min' or '3 h 5 min'."""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes = seconds // 60
+    if minutes < 60:
+        return f"{minutes} min"
+    return f"{minutes // 60} h {minutes % 60} min"
+
+class ScrapeCache:
+    """
+    On-disk cache of scraped post comments with a TTL and a size cap.
+
+    Each entry is a JSON file named after a hash of the post URL and the
+    actor input that affects which comments come back (replies, ordering,
+    language). The requested comment count is not part of the key: an entry
+    also serves smaller requests, and an entry for a post whose comments were
+    all scraped serves any request. Entries older than ttl_seconds are
+    ignored and deleted; when the files exceed max_bytes the oldest are evicted.
+    """
+
+    def __init__(self, cache_dir, ttl_seconds, max_bytes):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # scrape_many writes entries from several threads
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # --- Keys ---
+    def make_key(self, fb_url, run_input):
+        """Cache key for a post URL and actor input (resultsLimit excluded)."""
+        relevant = {name: value for name, value in run_input.items()
+                    if name not in ("startUrls", "resultsLimit")}
+        payload = f"{fb_url.strip()}|{json.dumps(relevant, sort_keys=True)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    # --- Lookup and storage ---
+    def _read(self, key, max_comments):
+        """Load a fresh entry that can serve max_comments comments, or None."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except Exception as e:
+            print(f"Failed to read scrape cache entry {path}: {e}")
+            return None
+
+        if time.time() - entry.get("scraped_at", 0) > self.ttl_seconds:
+            # Expired: remove it so it doesn't count against the size cap
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        if not entry.get("complete") and len(entry.get("comments", [])) < max_comments:
+            return None
+        return entry
+
+    def get(self, key, max_comments):
+        """
+        Look up cached comments.
+
+        Args:
+            key (str): Key from make_key
+            max_comments (int): Number of comments requested
+
+        Returns:
+            tuple: (comments, scraped_at) with at most max_comments comments, or None on a miss
+        """
+        with self.lock:
+            entry = self._read(key, max_comments)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry["comments"][:max_comments], entry["scraped_at"]
+
+    def age(self, key, max_comments):
+        """Seconds since the entry for key was scraped, or None if it can't serve the request."""
+        with self.lock:
+            entry = self._read(key, max_comments)
+        return None if entry is None else time.time() - entry["scraped_at"]
+
+    def put(self, key, fb_url, comments, complete):
+        """
+        Store the comments scraped for a post and enforce the size cap.
+
+        Args:
+            key (str): Key from make_key
+            fb_url (str): Post URL, kept for reference
+            comments (list): Normalized comments
+            complete (bool): The actor returned every comment (fewer than were requested)
+        """
+        entry = {
+            "url": fb_url,
+            "scraped_at": time.time(),
+            "complete": bool(complete),
+            "comments": comments,
+        }
+        path = self._path(key)
+        with self.lock:
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as file:
+                    json.dump(entry, file)
+                os.replace(temp_path, path)
+            except Exception as e:
+                print(f"Failed to write scrape cache entry {path}: {e}")
+                return
+            self._evict()
+
+    def _evict(self):
+        """Delete the oldest entries until the cache fits in max_bytes."""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                files.append((os.path.getmtime(path), os.path.getsize(path), path))
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Remove every cached scrape."""
+        with self.lock:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: hits, misses, hit_rate, entries, evictions and size_bytes
+        """
+        sizes = [os.path.getsize(os.path.join(self.cache_dir, name))
+                 for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "entries": len(sizes),
+            "evictions": self.evictions,
+            "size_bytes": sum(sizes),
+        }
@@ -0,0 +1,263 @@
+import os
+import re
+import threading
+import traceback
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPlainTextEdit,
+                             QPushButton, QSpinBox, QCheckBox, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from PyQt5.QtGui import QIcon
+from styles import COLORS, FONTS, BUTTON_STYLE, DIALOG_STYLE, INPUT_STYLE, TABLE_STYLE, CHECKBOX_REPLY_STYLE
+from model import classify_comments
+from scraper import scrape_many, SCRAPE_CONCURRENCY
+
+def split_urls(text):
+    """Split pasted text into unique post URLs (one per line, or separated by spaces/commas)."""
+    urls = []
+    for url in re.split(r"[\s,]+", text):
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+class ScrapeQueueWorker(QObject):
+    """
+    Scrapes a queue of post URLs concurrently and classifies each post as it finishes.
+
+    Scraping runs on a bounded thread pool (scraper.scrape_many); this worker's
+    own thread filters and classifies each finished post while the remaining
+    URLs are still being scraped.
+    """
+
+    url_started = pyqtSignal(str)
+    url_finished = pyqtSignal(str, list, object, float, bool)  # url, classified rows, filter stats, seconds, cached
+    url_failed = pyqtSignal(str, str, float)             # url, error, seconds
+    finished = pyqtSignal()
+
+    def __init__(self, urls, filters, process, concurrency=SCRAPE_CONCURRENCY, refresh=False):
+        """
+        Args:
+            urls (list): Facebook post URLs
+            filters (dict): Comment filter settings
+            process (callable): Turns (url, scraped comments) into (rows, stats); runs on the worker thread
+            concurrency (int): Maximum number of simultaneous scrapes
+            refresh (bool): Ignore cached scrapes
+        """
+        super().__init__()
+        self.urls = urls
+        self.filters = filters
+        self.process = process
+        self.concurrency = concurrency
+        self.refresh = refresh
+        self.stop_event = threading.Event()
+
+    def cancel(self):
+        """Abort the scrapes in progress and skip the queued ones (safe to call from the GUI thread)."""
+        self.stop_event.set()
+
+    def run(self):
+        try:
+            results = scrape_many(self.urls, self.filters, self.concurrency,
+                                  stop_event=self.stop_event, on_start=self.url_started.emit,
+                                  refresh=self.refresh)
+            for result in results:
+                url, seconds = result['url'], result['seconds']
+                if result['error']:
+                    self.url_failed.emit(url, result['error'], seconds)
+                    continue
+                try:
+                    rows, stats = self.process(url, result['comments'])
+                    predictions = classify_comments([row['comment_text'] for row in rows])
+                    for row, (prediction, confidence) in zip(rows, predictions):
+                        row['prediction'] = prediction
+                        row['confidence'] = confidence
+                    self.url_finished.emit(url, rows, stats, seconds, result['cached'])
+                except Exception as e:
+                    traceback.print_exc()
+                    self.url_failed.emit(url, str(e), seconds)
+        except Exception as e:
+            traceback.print_exc()
+            for url in self.urls:
+                self.url_failed.emit(url, str(e), 0.0)
+        finally:
+            self.finished.emit()
+
+class ScrapeQueueDialog(QDialog):
+    """
+    Queue view for scraping several Facebook posts at once.
+
+    The user pastes URLs, then each one is listed with its status, comment
+    count and scrape time. url_finished is emitted for every post that was
+    scraped and classified, so the window can open a tab for it right away.
+    """
+
+    url_finished = pyqtSignal(str, list, object, bool)  # url, classified rows, filter stats, cached
+
+    STATUS_COLUMN = 1
+    COUNT_COLUMN = 2
+    TIME_COLUMN = 3
+
+    def __init__(self, filters, process, parent=None, refresh=False):
+        """
+        Args:
+            filters (dict): Comment filter settings applied to every URL
+            process (callable): Turns (url, scraped comments) into (rows, stats) on the worker thread
+            refresh (bool): Initial state of the Force refresh checkbox
+        """
+        super().__init__(parent)
+        self.filters = filters
+        self.process = process
+        self.thread = None
+        self.worker = None
+        self.url_rows = {}
+        self.close_when_done = False
+        self.setWindowTitle("Scrape Queue")
+        self.setStyleSheet(DIALOG_STYLE)
+        self.setMinimumWidth(700)
+        self.setMinimumHeight(450)
+
+        # Set window icon
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        app_icon = QIcon(os.path.join(base_path, "assets", "applogo.png"))
+        self.setWindowIcon(app_icon)
+
+        self.init_ui()
+        self.refresh_checkbox.setChecked(refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        title = QLabel("Facebook Post URLs")
+        title.setFont(FONTS['header'])
+        title.setStyleSheet(f"color: {COLORS['text']};")
+        layout.addWidget(title)
+
+        # URL entry (replaced by the queue table once scraping starts)
+        self.url_edit = QPlainTextEdit()
+        self.url_edit.setStyleSheet(INPUT_STYLE)
+        self.url_edit.setPlaceholderText("Paste one Facebook post URL per line...")
+        layout.addWidget(self.url_edit)
+
+        self.queue_table = QTableWidget(0, 4)
+        self.queue_table.setStyleSheet(TABLE_STYLE)
+        self.queue_table.setHorizontalHeaderLabels(["URL", "Status", "Comments", "Time"])
+        self.queue_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.queue_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.queue_table.verticalHeader().setVisible(False)
+        self.queue_table.hide()
+        layout.addWidget(self.queue_table)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet(f"color: {COLORS['text']};")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        concurrency_label = QLabel("Parallel scrapes:")
+        concurrency_label.setStyleSheet(f"color: {COLORS['text']};")
+        button_layout.addWidget(concurrency_label)
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 16)
+        self.concurrency_spin.setValue(SCRAPE_CONCURRENCY)
+        self.concurrency_spin.setStyleSheet(INPUT_STYLE)
+        button_layout.addWidget(self.concurrency_spin)
+        self.refresh_checkbox = QCheckBox("Force refresh")
+        self.refresh_checkbox.setStyleSheet(CHECKBOX_REPLY_STYLE)
+        self.refresh_checkbox.setToolTip("Ignore cached results and scrape every post again")
+        button_layout.addWidget(self.refresh_checkbox)
+        button_layout.addStretch()
+
+        self.start_button = QPushButton("Start")
+        self.start_button.setFont(FONTS['button'])
+        self.start_button.setStyleSheet(BUTTON_STYLE)
+        self.start_button.clicked.connect(self.start)
+        button_layout.addWidget(self.start_button)
+
+        self.close_button = QPushButton("Cancel")
+        self.close_button.setFont(FONTS['button'])
+        self.close_button.setStyleSheet(BUTTON_STYLE)
+        self.close_button.clicked.connect(self.close)
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+
+    def start(self):
+        """Switch to the queue view and start scraping the pasted URLs."""
+        urls = split_urls(self.url_edit.toPlainText())
+        if not urls:
+            self.status_label.setText("Please enter at least one URL.")
+            return
+
+        self.url_edit.hide()
+        self.queue_table.show()
+        self.start_button.setEnabled(False)
+        self.concurrency_spin.setEnabled(False)
+        self.refresh_checkbox.setEnabled(False)
+        for url in urls:
+            row = self.queue_table.rowCount()
+            self.queue_table.insertRow(row)
+            self.queue_table.setItem(row, 0, QTableWidgetItem(url))
+            for column in (self.STATUS_COLUMN, self.COUNT_COLUMN, self.TIME_COLUMN):
+                self.queue_table.setItem(row, column, QTableWidgetItem(""))
+            self.url_rows[url] = row
+            self.set_status(url, "Queued")
+        self.remaining = len(urls)
+        self.status_label.setText(f"0 / {len(urls)} posts done")
+
+        self.thread = QThread(self)
+        self.worker = ScrapeQueueWorker(urls, self.filters, self.process, self.concurrency_spin.value(),
+                                        self.refresh_checkbox.isChecked())
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.url_started.connect(self.on_url_started)
+        self.worker.url_finished.connect(self.on_url_finished)
+        self.worker.url_failed.connect(self.on_url_failed)
+        self.worker.finished.connect(self.thread.quit)
+        self.thread.finished.connect(self.on_thread_finished)
+        self.thread.start()
+
+    def is_running(self):
+        return self.thread is not None and self.thread.isRunning()
+
+    def set_status(self, url, status, count="", seconds=None):
+        row = self.url_rows[url]
+        self.queue_table.item(row, self.STATUS_COLUMN).setText(status)
+        if count != "":
+            self.queue_table.item(row, self.COUNT_COLUMN).setText(str(count))
+        if seconds is not None:
+            self.queue_table.item(row, self.TIME_COLUMN).setText(f"{seconds:.1f}s")
+
+    def on_url_started(self, url):
+        self.set_status(url, "Scraping...")
+
+    def on_url_finished(self, url, rows, stats, seconds, cached):
+        self.set_status(url, "Done (cached)" if cached else "Done", len(rows), seconds)
+        self.mark_done()
+        self.url_finished.emit(url, rows, stats, cached)
+
+    def on_url_failed(self, url, error, seconds):
+        self.set_status(url, f"Failed: {error}", seconds=seconds)
+        self.mark_done()
+
+    def mark_done(self):
+        self.remaining -= 1
+        total = len(self.url_rows)
+        self.status_label.setText(f"{total - self.remaining} / {total} posts done")
+
+    def on_thread_finished(self):
+        self.close_button.setText("Close")
+        self.worker.deleteLater()
+        self.thread.deleteLater()
+        self.thread = None
+        if self.close_when_done:
+            self.close()
+
+    def closeEvent(self, event):
+        # Closing the queue stops it; posts already finished keep their tabs
+        if self.is_running():
+            self.worker.cancel()
+            self.status_label.setText("Cancelling...")
+            self.close_button.setEnabled(False)
+            self.close_when_done = True
+            event.ignore()
+            return
+        super().closeEvent(event)
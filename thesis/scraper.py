@@ -1,30 +1,61 @@
 from apify_client import ApifyClient
+import os
 import csv
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
 from api_db import get_api_key
+from scrape_cache import ScrapeCache
+from utils import get_app_data_path
 
-def scrape_comments(fb_url, save_path, filters=None):
-    # Get API key from database
-    api = get_api_key('apify')
-    if not api:
-        raise ValueError("API key not found in database. Please set an API key first.")
-    
-    client = ApifyClient(api)
-    
-    # Set default filters if none provided
-    if filters is None:
-        filters = {
-            "includeReplies": True,
-            "resultsLimit": 50,
-            "viewOption": "RANKED_UNFILTERED",
-            "timelineOption": "CHRONOLOGICAL",
-            "filterPostsByLanguage": False,
-            "filterCommentsLanguage": "en",
-            "maxComments": 50
-        }
-    
+# --- Scraper Settings ---
+ACTOR_ID = "us5srxAYnsrkgUv2v"
+POLL_INTERVAL = 2    # Seconds to wait on the actor run between dataset reads
+PAGE_SIZE = 100      # Max dataset items fetched per read
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED"}
+SCRAPE_CONCURRENCY = int(os.environ.get("THESIS_SCRAPE_CONCURRENCY", "4") or 4)  # Actor runs at once in scrape_many
+CSV_COLUMNS = ['Text', 'Profile Name', 'Profile Picture', 'Date', 'Likes Count',
+               'Profile ID', 'Is Reply', 'Reply To', 'Comment ID']
+INCREMENTAL_VIEW_OPTION = "RECENT_ACTIVITY"  # Newest activity first, for incremental re-scrapes
+SCRAPE_HISTORY_MAX_IDS = 5000                # Known comment IDs remembered per post
+# Optional folder for raw scrape CSVs; scrapes are kept in memory only when unset
+SCRAPE_EXPORT_DIR = os.environ.get("THESIS_SCRAPE_EXPORT_DIR")
+# Scraped comments are reused for this long (0 disables the cache) within a size cap
+SCRAPE_CACHE_TTL = int(os.environ.get("THESIS_SCRAPE_CACHE_TTL", str(6 * 3600)) or 0)
+SCRAPE_CACHE_MAX_MB = int(os.environ.get("THESIS_SCRAPE_CACHE_MAX_MB", "100") or 100)
+DEFAULT_FILTERS = {
+    "includeReplies": True,
+    "resultsLimit": 50,
+    "viewOption": "RANKED_UNFILTERED",
+    "timelineOption": "CHRONOLOGICAL",
+    "filterPostsByLanguage": False,
+    "filterCommentsLanguage": "en",
+    "maxComments": 50
+}
+
+# --- Global Variables ---
+scrape_cache = None
+scrape_history_lock = threading.Lock()
+
+def get_scrape_cache():
+    """Get the shared scrape cache, creating it on first use (None when disabled)."""
+    global scrape_cache
+    if scrape_cache is None and SCRAPE_CACHE_TTL > 0:
+        try:
+            scrape_cache = ScrapeCache(get_app_data_path("scrape_cache"), SCRAPE_CACHE_TTL,
+                                       SCRAPE_CACHE_MAX_MB * 1024 * 1024)
+        except Exception as e:
+            print(f"Failed to initialize scrape cache: {e}. Scraping without a cache.")
+    return scrape_cache
+
+def build_run_input(fb_url, filters):
+    """Build the actor input for a post URL from the comment filter settings."""
     # Get max comments limit (used both for API call and local truncation)
     max_comments = filters.get("maxComments", 50)
-    
+
     # Configure actor input based on filters - request slightly more than needed
     # to ensure we get at least the requested amount after filtering
     run_input = {
@@ -33,49 +64,422 @@ def scrape_comments(fb_url, save_path, filters=None):
         "includeNestedComments": filters.get("includeReplies", True),
         "viewOption": filters.get("viewOption", "RANKED_UNFILTERED"),
     }
-    
+
     # Add timeline option if available
     if "timelineOption" in filters:
         run_input["timelineOption"] = filters["timelineOption"]
-        
+
     # Add language filtering if enabled
     if filters.get("filterPostsByLanguage", False):
         run_input["filterPostsByLanguage"] = True
         run_input["language"] = filters.get("filterCommentsLanguage", "en")
+
+    return run_input
+
+LIKES_SUFFIXES = {"K": 1000, "M": 1000000, "B": 1000000000}  # Abbreviated counts such as "1.2K"
+
+def parse_likes_count(value):
+    """
+    Read a likes count from the actor as an int.
+
+    Args:
+        value: A number, a numeric string ("1,234") or an abbreviated one ("1.2K")
+
+    Returns:
+        int: The count, or 0 if value is missing or can't be read
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value or "").strip().upper().replace(",", "")
+    multiplier = LIKES_SUFFIXES.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    try:
+        return int(round(float(text) * multiplier))
+    except ValueError:
+        return 0
+
+def normalize_comment(item):
+    """Convert a raw actor dataset item into a row keyed by CSV_COLUMNS."""
+    is_reply = item.get("threadingDepth", 0) == 1
+    reply_to = ""
+
+    if is_reply and "parentComment" in item:
+        parent = item["parentComment"]["author"]
+        reply_to = f"{parent.get('name', '')} ({parent.get('id', '')})"
+
+    return {
+        'Text': item.get("text", "No text"),
+        'Profile Name': item.get("profileName", "No profileName"),
+        'Profile Picture': item.get("profilePicture", ""),
+        'Date': item.get("date", ""),
+        'Likes Count': parse_likes_count(item.get("likesCount")),
+        'Profile ID': item.get("profileId", ""),
+        'Is Reply': is_reply,
+        'Reply To': reply_to,
+        'Comment ID': item.get("id") or item.get("commentUrl") or ""
+    }
+
+def comments_to_frame(comments):
+    """
+    Build a typed DataFrame from normalized comments.
+    
+    Args:
+        comments (list): Dicts keyed by CSV_COLUMNS
+        
+    Returns:
+        pd.DataFrame: One row per comment with CSV_COLUMNS columns
+    """
+    df = pd.DataFrame(comments, columns=CSV_COLUMNS)
+    df['Likes Count'] = df['Likes Count'].astype('int64')
+    df['Is Reply'] = df['Is Reply'].astype(bool)
+    return df
+
+def scrape_export_path():
+    """Path for an opt-in raw scrape CSV under SCRAPE_EXPORT_DIR, or None when export is off."""
+    if not SCRAPE_EXPORT_DIR:
+        return None
+    os.makedirs(SCRAPE_EXPORT_DIR, exist_ok=True)
+    return os.path.join(SCRAPE_EXPORT_DIR, f"scrape_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+
+# --- Scrape History ---
+def comment_key(comment):
+    """Stable identity of a scraped comment: its Facebook ID, else a hash of author, date and text."""
+    if comment.get('Comment ID'):
+        return str(comment['Comment ID'])
+    payload = f"{comment.get('Profile ID', '')}|{comment.get('Date', '')}|{comment.get('Text', '')}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def scrape_history_path():
+    return os.path.join(get_app_data_path(), "scrape_history.json")
+
+def read_scrape_history():
+    path = scrape_history_path()
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except Exception as e:
+        print(f"Failed to read scrape history: {e}")
+        return {}
+
+def load_scrape_history(history_key):
+    """
+    What earlier scrapes under history_key have already returned.
+    
+    Args:
+        history_key (str): Usually the post URL; the GUI scopes it to a session
+        
+    Returns:
+        dict: newest_date, comment_ids, tab_name and updated_at, or None if never scraped
+    """
+    with scrape_history_lock:
+        return read_scrape_history().get(history_key)
+
+def update_scrape_history(history_key, comments=(), tab_name=None):
+    """
+    Record comments returned for history_key (and optionally the tab showing them).
+    
+    Args:
+        history_key (str): Key passed to iter_comment_batches
+        comments (list): Newly received comments, keyed by CSV_COLUMNS
+        tab_name (str): Results tab the comments were merged into
+    """
+    with scrape_history_lock:
+        history = read_scrape_history()
+        entry = history.get(history_key, {"newest_date": "", "comment_ids": []})
+        known = entry["comment_ids"] + [comment_key(comment) for comment in comments]
+        # Keep the most recent IDs; older ones are also behind newest_date
+        entry["comment_ids"] = list(dict.fromkeys(known))[-SCRAPE_HISTORY_MAX_IDS:]
+        dates = [str(comment.get('Date') or "") for comment in comments]
+        entry["newest_date"] = max(dates + [entry["newest_date"]])
+        if tab_name is not None:
+            entry["tab_name"] = tab_name
+        entry["updated_at"] = time.time()
+        history[history_key] = entry
+
+        path = scrape_history_path()
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(history, file)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Failed to save scrape history: {e}")
+
+def iter_new_comments(pages, history):
+    """
+    Yield only comments missing from an earlier scrape, stopping after a page with nothing new.
     
-    # Run the actor
-    run = client.actor("us5srxAYnsrkgUv2v").call(run_input=run_input)
+    The pages come in recent-activity order, where a thread with a new reply
+    brings its old, already known parent to the top. So a known comment on a
+    page doesn't mean the rest is old: paging only stops once a whole page
+    has no unknown comment that is at least as new as the newest one seen.
+    """
+    known = set(history.get("comment_ids", []))
+    newest_date = history.get("newest_date", "")
+
+    def is_new(comment):
+        if comment_key(comment) in known:
+            return False
+        # IDs beyond SCRAPE_HISTORY_MAX_IDS are forgotten; their dates still mark them as old
+        date = str(comment.get('Date') or "")
+        return not (newest_date and date and date < newest_date)
 
-    # Get the results
-    comments = list(client.dataset(run["defaultDatasetId"]).iterate_items())
+    try:
+        for page in pages:
+            new = [comment for comment in page if is_new(comment)]
+            if not new:
+                break
+            yield new
+    finally:
+        # Aborts the actor run
+        pages.close()
+
+def cached_scrape_age(fb_url, filters):
+    """
+    How old the cached comments for a post are.
     
-    # Apply strict limit to enforce maxComments
-    comments = comments[:max_comments]
+    Args:
+        fb_url (str): Facebook post URL
+        filters (dict): Comment filter settings
+        
+    Returns:
+        float: Seconds since the cached scrape, or None if a new scrape is needed
+    """
+    cache = get_scrape_cache()
+    if cache is None:
+        return None
+    if filters is None:
+        filters = DEFAULT_FILTERS
+    key = cache.make_key(fb_url, build_run_input(fb_url, filters))
+    return cache.age(key, filters.get("maxComments", 50))
+
+def iter_comment_batches(fb_url, filters=None, save_path=None, stop_event=None, refresh=False,
+                         incremental=False, history_key=None):
+    """
+    Stream normalized comments while the scraper actor is still running.
+
+    The actor run is started without waiting for it to finish, and its
+    dataset is read incrementally between short waits on the run, so callers
+    can process early comments while later ones are still being scraped.
+    The run is aborted once maxComments comments have been received.
+    A fresh cached scrape of the same post and actor settings is served
+    instead of starting the actor, unless refresh is set.
+
+    Every completed scrape is recorded in the scrape history. With
+    incremental set and an earlier scrape on record, the actor is asked
+    for the most recent activity first, only comments not returned before
+    are yielded, and the run stops after a page with nothing new.
+
+    Args:
+        fb_url (str): Facebook post URL
+        filters (dict): Comment filter settings
+        save_path (str): Optional CSV file that every page is also appended to
+        stop_event (threading.Event): Stops the stream (and aborts the run) once set
+        refresh (bool): Ignore the scrape cache and run the actor again
+        incremental (bool): Only fetch comments newer than the last scrape
+        history_key (str): Scrape history entry to use (defaults to the URL)
+
+    Yields:
+        list: Newly scraped comments, each a dict keyed by CSV_COLUMNS
+    """
+    # Set default filters if none provided
+    if filters is None:
+        filters = DEFAULT_FILTERS
+    max_comments = filters.get("maxComments", 50)
+    run_input = build_run_input(fb_url, filters)
+
+    history_key = history_key or fb_url
+    history = load_scrape_history(history_key) if incremental else None
+
+    cache = get_scrape_cache()
+    key = cache.make_key(fb_url, run_input) if cache else None
+    cached = cache.get(key, max_comments) if cache and not refresh and not history else None
+    if history:
+        # Most recent activity first, so paging can stop once a page has nothing new
+        run_input = dict(run_input, viewOption=INCREMENTAL_VIEW_OPTION)
+        pages = iter_new_comments(iter_actor_pages(fb_url, run_input, max_comments, stop_event), history)
+    elif cached is not None:
+        comments, scraped_at = cached
+        print(f"Using {len(comments)} cached comments for {fb_url} "
+              f"(scraped {(time.time() - scraped_at) / 60:.0f} min ago).")
+        pages = (comments[start:start + PAGE_SIZE] for start in range(0, len(comments), PAGE_SIZE))
+    else:
+        pages = iter_actor_pages(fb_url, run_input, max_comments, stop_event, cache, key)
+
+    csv_file = None
+    received = []
+    try:
+        if save_path:
+            csv_file = open(save_path, mode='w', newline='', encoding='utf-8')
+            writer = csv.DictWriter(csv_file, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+
+        for comments in pages:
+            if csv_file:
+                writer.writerows(comments)
+            received.extend(comments)
+            yield comments
+
+        # Only a scrape the caller consumed to the end counts as delivered
+        if not (stop_event is not None and stop_event.is_set()):
+            update_scrape_history(history_key, received)
+    finally:
+        if csv_file:
+            csv_file.close()
+        # Aborts the actor run if the caller stopped early
+        pages.close()
+
+def iter_actor_pages(fb_url, run_input, max_comments, stop_event=None, cache=None, key=None):
+    """
+    Run the scraper actor and yield pages of normalized comments as they appear.
 
-    # Write to CSV
+    A scrape that runs to the end (not stopped by stop_event or the caller)
+    is stored in cache under key.
+    """
+    # Get API key from database
+    api = get_api_key('apify')
+    if not api:
+        raise ValueError("API key not found in database. Please set an API key first.")
+
+    client = ApifyClient(api)
+
+    # Start the actor without blocking until it finishes
+    run = client.actor(ACTOR_ID).start(run_input=run_input)
+    run_client = client.run(run["id"])
+    dataset_client = client.dataset(run["defaultDatasetId"])
+
+    scraped = []
+    finished = False
+    try:
+        while len(scraped) < max_comments:
+            if stop_event is not None and stop_event.is_set():
+                return
+            # Read everything the actor has pushed so far
+            items = dataset_client.list_items(offset=len(scraped), limit=min(PAGE_SIZE, max_comments - len(scraped))).items
+            if items:
+                comments = [normalize_comment(item) for item in items]
+                scraped.extend(comments)
+                yield comments
+                continue
+            if finished:
+                break
+            # Nothing new yet: wait on the run (returns early if it finishes)
+            run = run_client.wait_for_finish(wait_secs=POLL_INTERVAL) or run
+            # Read once more after the run ends to pick up its final items
+            finished = run.get("status") in TERMINAL_STATUSES
+
+        # Only a successful run that ended below the limit has returned every comment
+        if cache is not None and (not finished or run.get("status") == "SUCCEEDED"):
+            cache.put(key, fb_url, scraped, complete=finished and len(scraped) < max_comments)
+    finally:
+        # Enough comments (or the caller stopped early): don't keep the actor scraping
+        if not finished:
+            try:
+                run_client.abort()
+            except Exception as e:
+                print(f"Failed to abort scraper run: {e}")
+
+def write_comments_csv(comments, save_path):
+    """Write normalized comments to a CSV file with the CSV_COLUMNS header."""
     with open(save_path, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        writer.writerow(['Text', 'Profile Name', 'Profile Picture', 'Date', 'Likes Count', 
-                        'Profile ID', 'Is Reply', 'Reply To'])
+        writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(comments)
+    return save_path
+
+def scrape_comments(fb_url, save_path=None, filters=None, as_frame=False, refresh=False,
+                    incremental=False):
+    """
+    Scrape every comment of a post, into a CSV file or in memory.
+    
+    Args:
+        fb_url (str): Facebook post URL
+        save_path (str): Write the comments to this CSV file and return its path; leave it out
+                         to get the comments back in memory instead
+        filters (dict): Comment filter settings
+        as_frame (bool): In memory, return a typed DataFrame instead of a list of dicts
+        refresh (bool): Ignore the scrape cache and run the actor again
+        incremental (bool): Only return comments newer than the last scrape of this post
         
-        for item in comments:
-            is_reply = item.get("threadingDepth", 0) == 1
-            reply_to = ""
-            
-            if is_reply and "parentComment" in item:
-                parent = item["parentComment"]["author"]
-                reply_to = f"{parent.get('name', '')} ({parent.get('id', '')})"
-            
-            writer.writerow([
-                item.get("text", "No text"),
-                item.get("profileName", "No profileName"),
-                item.get("profilePicture", ""),
-                item.get("date", ""),
-                item.get("likesCount", 0),
-                item.get("profileId", ""),
-                is_reply,
-                reply_to
-            ])
+    Returns:
+        str | list | pd.DataFrame: save_path when it is given, else the comments keyed by CSV_COLUMNS
+    """
+    comments = []
+    for batch in iter_comment_batches(fb_url, filters, save_path=save_path, refresh=refresh,
+                                      incremental=incremental):
+        comments.extend(batch)
+
+    if save_path:
+        return save_path
+    if as_frame:
+        return comments_to_frame(comments)
+    return comments
+
+def scrape_one(url, filters=None, stop_event=None, on_start=None, refresh=False):
+    """
+    Scrape one post for scrape_many, timing it and capturing any failure.
     
-    return save_path
+    Returns:
+        dict: url, comments (list), seconds (float), error (str or None) and cached (bool)
+    """
+    if stop_event is not None and stop_event.is_set():
+        # Stopped while queued: don't start an actor run at all
+        return {'url': url, 'comments': [], 'seconds': 0.0, 'error': "Cancelled", 'cached': False}
+    if on_start:
+        on_start(url)
+    start_time = time.perf_counter()
+    cached = not refresh and cached_scrape_age(url, filters) is not None
+    comments = []
+    error = None
+    try:
+        for batch in iter_comment_batches(url, filters, stop_event=stop_event, refresh=refresh):
+            comments.extend(batch)
+        if stop_event is not None and stop_event.is_set():
+            error = "Cancelled"
+    except Exception as e:
+        error = str(e)
+    return {
+        'url': url,
+        'comments': comments,
+        'seconds': time.perf_counter() - start_time,
+        'error': error,
+        'cached': cached
+    }
 
+def scrape_many(urls, filters=None, concurrency=SCRAPE_CONCURRENCY, stop_event=None, on_start=None,
+                refresh=False):
+    """
+    Scrape several posts with at most `concurrency` actor runs at a time.
+    
+    Results are yielded as each post finishes, not in input order. A failed
+    URL is reported with its error and does not stop the others.
+    
+    Args:
+        urls (list): Facebook post URLs
+        filters (dict): Comment filter settings shared by every URL
+        concurrency (int): Maximum number of simultaneous actor runs
+        stop_event (threading.Event): Set to stop and abort the scrapes in progress
+        on_start (callable): Called with the URL when its scrape starts (from a pool thread)
+        refresh (bool): Ignore the scrape cache and run the actor for every URL
+        
+    Yields:
+        dict: url, comments (list), seconds (float), error (str or None) and cached (bool)
+    """
+    stop_event = stop_event or threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(urls) or 1)))
+    futures = [executor.submit(scrape_one, url, filters, stop_event, on_start, refresh) for url in urls]
+    try:
+        for future in as_completed(futures):
+            result = future.result()
+            status = f"failed ({result['error']})" if result['error'] else f"{len(result['comments'])} comments"
+            if result['cached']:
+                status += " (cached)"
+            print(f"Scraped {result['url']} in {result['seconds']:.2f}s: {status}")
+            yield result
+    finally:
+        # Runs once every URL is done, or when the caller stops early
+        stop_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,84 @@
+"""
+Local stand-in for the Azure SQL database, used by the tab_store tests and
+the tab save benchmark.
+"""
+import time
+import sqlite3
+from tab_store import INSERT_COMMENT_SQL
+
+# An in-memory sqlite3 database standing in for Azure SQL: it accepts the
+# T-SQL savepoint statements tab_store uses, has pyodbc's fast_executemany
+# flag, and sleeps round_trip seconds per network round trip pyodbc would
+# make (one per row for executemany unless fast_executemany is on). A batch
+# of ;-separated statements is one round trip with one result set per
+# statement, like pyodbc's nextset(). Comments longer than max_text_length
+# are rejected like a too-narrow column would.
+class SqlStandIn:
+    def __init__(self, round_trip=0.0, max_text_length=None):
+        self.conn = sqlite3.connect(":memory:")
+        self.round_trip = round_trip
+        self.round_trips = 0
+        length_check = f"CHECK (length(comment_text) <= {max_text_length})" if max_text_length else ""
+        self.conn.execute(f"""
+            CREATE TABLE tab_comments (
+                comment_id INTEGER PRIMARY KEY,
+                tab_id INTEGER, comment_text TEXT {length_check},
+                prediction TEXT, confidence REAL, profile_name TEXT, profile_picture TEXT,
+                comment_date TEXT, likes_count REAL, profile_id TEXT, is_reply REAL,
+                reply_to TEXT, is_selected INTEGER
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE session_tabs (
+                tab_id INTEGER PRIMARY KEY, session_id INTEGER, tab_name TEXT, tab_type TEXT
+            )
+        """)
+
+    def cursor(self):
+        return StandInCursor(self)
+
+    def commit(self):
+        self.conn.commit()
+
+    def wait(self, round_trips):
+        self.round_trips += round_trips
+        if self.round_trip:
+            time.sleep(self.round_trip * round_trips)
+
+class StandInCursor:
+    def __init__(self, db):
+        self.db = db
+        self.cursor = db.conn.cursor()
+        self.fast_executemany = False
+        self.result_sets = []
+
+    def execute(self, sql, params=()):
+        sql = sql.replace("SAVE TRANSACTION", "SAVEPOINT").replace("ROLLBACK TRANSACTION", "ROLLBACK TO")
+        self.db.wait(1)
+        self.result_sets = []
+        params = list(params)
+        for statement in filter(str.strip, sql.split(";")):
+            count = statement.count("?")
+            self.cursor.execute(statement, params[:count])
+            params = params[count:]
+            self.result_sets.append(self.cursor.fetchall())
+        return self
+
+    def fetchall(self):
+        return self.result_sets[0]
+
+    def nextset(self):
+        self.result_sets = self.result_sets[1:]
+        return bool(self.result_sets)
+
+    def executemany(self, sql, rows):
+        self.db.wait(1 if self.fast_executemany else len(rows))
+        self.cursor.executemany(sql, rows)
+
+def insert_row_by_row(cursor, rows):
+    """The previous save path: one execute per comment."""
+    for row in rows:
+        try:
+            cursor.execute(INSERT_COMMENT_SQL, row)
+        except Exception as e:
+            print(f"Error saving comment {row[1]}: {e}")
@@ -0,0 +1,220 @@
+import hashlib
+
+# --- Bulk Insert Settings ---
+INSERT_BATCH_SIZE = 500  # Rows per executemany call
+
+INSERT_COMMENT_SQL = """
+    INSERT INTO tab_comments (
+        tab_id, comment_text, prediction, confidence,
+        profile_name, profile_picture, comment_date,
+        likes_count, profile_id, is_reply, reply_to, is_selected
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def clean_text(value):
+    """Clean up a text field to handle emojis and special characters"""
+    if value is None:
+        return ''
+    # Convert float/int to string if needed
+    if isinstance(value, (float, int)):
+        value = str(value)
+    # Handle string encoding
+    try:
+        return value.encode('ascii', 'ignore').decode()
+    except AttributeError:
+        return str(value)
+
+def prepare_comment_row(tab_id, comment, comment_metadata, selected_comments):
+    """
+    Build the tab_comments parameters for one classified comment.
+
+    Args:
+        tab_id (int): Tab the comment belongs to
+        comment (dict): Row with comment_text, prediction and confidence
+        comment_metadata (dict): Scraped metadata keyed by comment text
+        selected_comments (set): Texts of the comments on the user's list, as shown in the table
+
+    Returns:
+        tuple: Parameters for INSERT_COMMENT_SQL
+    """
+    comment_text = comment.get('comment_text', '')
+    metadata = comment_metadata.get(comment_text, {})
+
+    # Handle likes_count - ensure it's a valid float or NULL
+    likes_count = metadata.get('likes_count')
+    try:
+        likes_count = float(likes_count) if likes_count not in ('N/A', '', None) else None
+    except (ValueError, TypeError):
+        likes_count = None
+
+    clean_comment = clean_text(comment_text)
+    return (
+        tab_id,
+        clean_comment,
+        comment.get('prediction', ''),
+        comment.get('confidence', 0.0),  # Store actual confidence value
+        clean_text(metadata.get('profile_name', '')),
+        clean_text(metadata.get('profile_picture', '')),
+        metadata.get('date'),
+        likes_count,
+        metadata.get('profile_id'),
+        float(bool(metadata.get('is_reply', False))),
+        clean_text(metadata.get('reply_to', '')),
+        comment_text in selected_comments
+    )
+
+def insert_comment_rows(cursor, rows, batch_size=INSERT_BATCH_SIZE):
+    """
+    Insert prepared tab_comments rows in batched executemany calls.
+
+    With pyodbc's fast_executemany each batch is sent as one parameter array
+    instead of one round trip per row. Each batch runs under a savepoint: if
+    the server rejects it, the batch is rolled back and split in halves until
+    the bad rows are isolated, so only those are reported and skipped, as
+    before, while the rest still go in as batches.
+
+    Args:
+        cursor: Database cursor inside an open transaction
+        rows (list): Parameter tuples from prepare_comment_row
+        batch_size (int): Rows per executemany call
+
+    Returns:
+        int: Number of rows inserted
+    """
+    if hasattr(cursor, "fast_executemany"):
+        cursor.fast_executemany = True
+
+    inserted = 0
+    for start in range(0, len(rows), batch_size):
+        inserted += insert_batch(cursor, rows[start:start + batch_size])
+    return inserted
+
+def insert_batch(cursor, batch):
+    """Insert one batch under a savepoint, splitting it to find the rows the server rejects."""
+    cursor.execute("SAVE TRANSACTION comment_batch")
+    try:
+        if len(batch) == 1:
+            cursor.execute(INSERT_COMMENT_SQL, batch[0])
+        else:
+            cursor.executemany(INSERT_COMMENT_SQL, batch)
+        return len(batch)
+    except Exception as e:
+        cursor.execute("ROLLBACK TRANSACTION comment_batch")
+        if len(batch) == 1:
+            print(f"Error saving comment {batch[0][1]}: {e}")
+            return 0
+
+    middle = len(batch) // 2
+    return insert_batch(cursor, batch[:middle]) + insert_batch(cursor, batch[middle:])
+
+def save_tab_comments(conn, session_id, tab_name, comments, comment_metadata, selected_comments, append=False):
+    """
+    Save a tab and its comments in the caller's transaction.
+
+    Args:
+        conn: Database connection; the caller commits
+        session_id (int): Session the tab belongs to
+        tab_name (str): Tab name
+        comments (list): Rows with comment_text, prediction and confidence
+        comment_metadata (dict): Scraped metadata keyed by comment text
+        selected_comments (set): Texts of the comments on the user's list, as shown in the table
+        append (bool): Add to the tab's saved comments instead of replacing them
+
+    Returns:
+        int: Number of comments inserted
+    """
+    cursor = conn.cursor()
+
+    # Check if tab already exists for this session
+    cursor.execute("""
+        SELECT tab_id FROM session_tabs
+        WHERE session_id = ? AND tab_name = ?
+    """, (session_id, tab_name))
+
+    tab_result = cursor.fetchone()
+
+    if tab_result:
+        # Tab exists, get its ID
+        tab_id = tab_result[0]
+
+        # Delete existing comments for this tab to avoid duplicates
+        if not append:
+            cursor.execute("""
+                DELETE FROM tab_comments
+                WHERE tab_id = ?
+            """, (tab_id,))
+    else:
+        # Create new tab record
+        cursor.execute("""
+            INSERT INTO session_tabs (session_id, tab_name, tab_type)
+            VALUES (?, ?, ?)
+        """, (session_id, tab_name, "analysis"))
+
+        tab_id = cursor.execute("SELECT @@IDENTITY").fetchval()
+
+    # Prepare every row first, reporting the ones that can't be converted
+    rows = []
+    for comment in comments:
+        try:
+            rows.append(prepare_comment_row(tab_id, comment, comment_metadata, selected_comments))
+        except Exception as e:
+            print(f"Error saving comment {comment}: {e}")
+
+    return insert_comment_rows(cursor, rows)
+
+# Tabs and all of their comments in one round trip: two result sets, read
+# with nextset(). Comments come back per tab in insertion (comment_id) order.
+RESTORE_SESSION_SQL = """
+    SELECT tab_id, tab_name, tab_type
+    FROM session_tabs
+    WHERE session_id = ?
+    ORDER BY tab_id;
+
+    SELECT c.tab_id, c.comment_text, c.prediction, c.confidence,
+           c.profile_name, c.profile_picture, c.comment_date,
+           c.likes_count, c.profile_id, c.is_reply, c.reply_to, c.is_selected
+    FROM tab_comments c
+    JOIN session_tabs t ON t.tab_id = c.tab_id
+    WHERE t.session_id = ?
+    ORDER BY c.tab_id, c.comment_id;
+"""
+
+def load_session_tabs(conn, session_id):
+    """
+    Fetch a session's tabs and all their comments with a single query batch.
+
+    Args:
+        conn: Database connection
+        session_id (int): Session to restore
+
+    Returns:
+        list: (tab_id, tab_name, tab_type, comments) in tab_id order, where comments is a list of
+              (comment_text, prediction, confidence, profile_name, profile_picture, comment_date,
+              likes_count, profile_id, is_reply, reply_to, is_selected) tuples in the order
+              they were saved (comment_id order)
+    """
+    cursor = conn.cursor()
+    cursor.execute(RESTORE_SESSION_SQL, (session_id, session_id))
+    tabs = cursor.fetchall()
+
+    # Group the comments client-side instead of querying each tab
+    comments_by_tab = {}
+    if cursor.nextset():
+        for row in cursor.fetchall():
+            comments_by_tab.setdefault(row[0], []).append(tuple(row[1:]))
+
+    return [(tab_id, tab_name, tab_type, comments_by_tab.get(tab_id, []))
+            for tab_id, tab_name, tab_type in tabs]
+
+def tab_content_hash(comment_texts):
+    """
+    Hash a tab's comments independently of their order, to spot restored tabs with the same content.
+
+    Args:
+        comment_texts (iterable): The tab's comment texts
+
+    Returns:
+        str: SHA-256 hex digest of the sorted texts
+    """
+    content_string = "|".join(sorted(str(text) for text in comment_texts))
+    return hashlib.sha256(content_string.encode('utf-8')).hexdigest()
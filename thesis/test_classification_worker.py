@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtWidgets import QApplication
+from classification_worker import ClassificationWorker, JobTab
+
+app = QApplication.instance() or QApplication([])
+
+def test_failing_prepare_leaves_no_tab():
+    """A scrape that fails before any rows are classified never opens a result tab"""
+    opened = []
+    tab = JobTab(lambda: (opened.append("Facebook Post 1") or opened[-1], object()))
+
+    def failing_scrape():
+        raise RuntimeError("actor run failed")
+        yield []
+
+    worker = ClassificationWorker(lambda: (failing_scrape(), {}))
+    errors = []
+    worker.batch_ready.connect(lambda rows: tab.ensure())
+    worker.failed.connect(errors.append)
+    worker.run()
+
+    assert errors == ["actor run failed"]
+    assert not tab.is_open()
+    assert opened == []
+    print("Failed scrape reported its error and opened no tab.")
+
+def test_tab_opens_once():
+    """Every batch lands in the tab opened for the first one"""
+    opened = []
+    tab = JobTab(lambda: (f"Facebook Post {len(opened)}", opened.append(object()) or opened[-1]))
+    first = tab.ensure()
+    assert tab.ensure() is first
+    assert tab.name == "Facebook Post 0"
+    assert len(opened) == 1
+    print("Tab opened once for all batches.")
+
+if __name__ == "__main__":
+    test_failing_prepare_leaves_no_tab()
+    test_tab_opens_once()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+import os
+import time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+from comment_table_model import (CommentTableModel, CommentTableView, COMMENT_COLUMN, LABEL_COLUMN,
+                                 CONFIDENCE_COLUMN, REPLY_PREFIX, SELECTED_BACKGROUND)
+
+app = QApplication.instance() or QApplication([])
+
+LABELS = ["Potentially Harmful", "Requires Review", "Likely Appropriate"]
+
+def make_model(count):
+    model = CommentTableModel()
+    model.append_rows([f"Comment number {i} about the post" for i in range(count)],
+                      [LABELS[i % 3] for i in range(count)],
+                      [f"{50 + i % 50:.2f}%" for i in range(count)],
+                      is_reply=[i % 4 == 0 for i in range(count)])
+    return model
+
+def cell(model, row, column, role=Qt.DisplayRole):
+    return model.data(model.index(row, column), role)
+
+def test_append_keeps_duplicates_unless_merging():
+    """A new tab shows every row, repeated texts included; merges skip texts the tab already shows"""
+    model = CommentTableModel()
+    assert model.append_rows(["a", "b", "a"], [LABELS[0]] * 3, [90, "80.5%", 70]) == 3
+    assert model.append_rows(["b", "c", "c"], [LABELS[1]] * 3, [60, "bad", 50], skip_existing=True) == 1
+    assert list(model.comments) == ["a", "b", "a", "c"] and model.rowCount() == 4
+    assert list(model.confidences) == [90.0, 80.5, 70.0, 0.0]
+    assert cell(model, 1, CONFIDENCE_COLUMN) == "80.50%"
+    model.set_selected("a", True)
+    assert list(model.selected) == [True, False, True, False]
+    print("A new tab kept its repeated comment; the merge skipped 2 known texts.")
+
+def test_streamed_batches_insert_rows():
+    """Appending a batch inserts rows without resetting the view, which keeps its selection"""
+    view = CommentTableView()
+    model = view.model()
+    model.append_rows(["a", "b", "c"], LABELS, [90, 80, 70])
+    resets, inserts = [], []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.rowsInserted.connect(lambda parent, first, last: inserts.append((first, last)))
+    view.selectRow(1)
+
+    model.append_rows(["d", "e"], LABELS[:2], [60, 50])
+    assert view.selected_row() == 1
+    view.selectRow(4)
+    model.set_search_text("e")
+    assert view.selected_row() == 0
+    model.append_rows(["f", "ee"], LABELS[:2], [60, 50])  # Only "ee" matches the search
+    assert not resets and inserts == [(3, 4), (1, 1)], (resets, inserts)
+    assert [model.row_values(row)[0] for row in range(model.rowCount())] == ["e", "ee"]
+    model.set_search_text("")
+    assert model.rowCount() == 7 and view.selected_row() == 4
+    model.sort(CONFIDENCE_COLUMN, Qt.AscendingOrder)
+    assert [model.row_values(row)[0] for row in range(7)] == ["e", "ee", "d", "f", "c", "b", "a"]
+    assert view.selected_row() == 0
+    print("Streamed batches were inserted; the selection survived filtering and sorting.")
+
+def test_sort_is_stable_and_reorders_columns():
+    """Sorting keeps equal keys in their previous order and moves every column together"""
+    model = make_model(300)
+    model.sort(CONFIDENCE_COLUMN, Qt.DescendingOrder)
+    model.sort(LABEL_COLUMN, Qt.AscendingOrder)
+    assert list(model.labels) == sorted(model.labels)
+    for label in LABELS:
+        confidences = model.confidences[model.labels == label]
+        assert list(confidences) == sorted(confidences, reverse=True)
+    for text, label, confidence in zip(model.comments, model.labels, model.confidences):
+        i = int(text.split()[2])
+        assert label == LABELS[i % 3] and confidence == 50 + i % 50
+        assert model.row_of_comment[text] == model.find_row(text)
+    print("Sorting by label kept the confidence order within each label.")
+
+def test_search_and_reply_filters():
+    """Search and the replies-only filter hide rows without removing them"""
+    model = make_model(100)
+    model.set_search_text("NUMBER 1")
+    assert model.rowCount() == 11 and model.comment_count() == 100
+    assert model.find_row("Comment number 5 about the post") == -1
+    model.set_replies_only(True)
+    assert [model.row_values(row)[0] for row in range(model.rowCount())] == \
+        ["Comment number 12 about the post", "Comment number 16 about the post"]
+    assert cell(model, 0, COMMENT_COLUMN) == REPLY_PREFIX + "Comment number 12 about the post"
+    assert cell(model, 0, COMMENT_COLUMN, Qt.UserRole) == "Comment number 12 about the post"
+    model.set_search_text("")
+    model.set_replies_only(False)
+    assert model.rowCount() == 100
+    print("Filtering showed 11 matches, then the 2 replies among them.")
+
+def test_selection_highlight():
+    """Comments on the user's list are painted with the highlight color"""
+    view = CommentTableView()
+    model = view.model()
+    model.append_rows(["a", "b", "c"], LABELS, [90, 80, 70], selected=[False, True, False])
+    assert cell(model, 1, LABEL_COLUMN, Qt.BackgroundRole) == SELECTED_BACKGROUND
+    model.set_selected("b", False)
+    model.set_selected("c", True)
+    assert cell(model, 1, LABEL_COLUMN, Qt.BackgroundRole) is None
+    assert list(model.selected) == [False, False, True]
+    model.set_selected_comments(["a"])
+    assert list(model.selected) == [True, False, False]
+    assert view.selected_row() == -1
+    view.selectRow(2)
+    assert view.selected_row() == 2
+    print("Highlighting followed the selection list.")
+
+def test_large_tab():
+    """A 100,000-comment tab streams in, sorts and searches without per-cell items"""
+    count, batch_size = 100000, 100
+    texts = [f"Comment number {i} about the post" for i in range(count)]
+    model = CommentTableModel()
+    start = time.time()
+    for first in range(0, count, batch_size):
+        batch = range(first, first + batch_size)
+        model.append_rows([texts[i] for i in batch], [LABELS[i % 3] for i in batch],
+                          [50 + i % 50 for i in batch], is_reply=[i % 4 == 0 for i in batch])
+    filled = time.time()
+    model.sort(COMMENT_COLUMN, Qt.AscendingOrder)
+    sorted_at = time.time()
+    model.set_search_text("number 99")
+    searched = time.time()
+    assert model.comment_count() == count and model.rowCount() == 1111
+    # Growing the buffers geometrically keeps streaming linear in the number of rows
+    assert filled - start < 5.0, filled - start
+    print(f"{count} comments: streamed in {count // batch_size} batches in {filled - start:.2f}s, "
+          f"sorted in {sorted_at - filled:.2f}s, searched in {searched - sorted_at:.2f}s.")
+
+if __name__ == "__main__":
+    test_append_keeps_duplicates_unless_merging()
+    test_streamed_batches_insert_rows()
+    test_sort_is_stable_and_reorders_columns()
+    test_search_and_reply_filters()
+    test_selection_highlight()
+    test_large_tab()
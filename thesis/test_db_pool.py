@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+import time
+import threading
+from db_pool import ConnectionPool
+
+# --- Fake Connection ---
+# Stands in for a pyodbc connection; opening one sleeps like a TLS handshake
+# plus login would.
+class FakeConnection:
+    connect_delay = 0.05
+    opened = 0
+
+    def __init__(self):
+        time.sleep(FakeConnection.connect_delay)
+        FakeConnection.opened += 1
+        self.closed = False
+        self.broken = False
+        self.pending = []
+        self.committed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.check()
+        self.committed.extend(self.pending)
+        self.pending = []
+
+    def rollback(self):
+        self.check()
+        self.pending = []
+
+    def close(self):
+        self.closed = True
+
+    def check(self):
+        if self.broken or self.closed:
+            raise RuntimeError("Communication link failure")
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=()):
+        self.conn.check()
+        self.conn.pending.append(sql)
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+def test_pool_reuses_one_warm_connection():
+    """A scrape's worth of sequential helper calls opens a single connection"""
+    FakeConnection.opened = 0
+    pool = ConnectionPool(FakeConnection, max_size=4)
+
+    start = time.time()
+    for action in ("get_api_key", "log_user_action", "save_tab_state", "save_tab_state", "log_user_action"):
+        conn = pool.acquire()
+        conn.cursor().execute(action)
+        conn.commit()
+        conn.close()
+        conn.close()  # Some call sites close twice
+    elapsed = time.time() - start
+
+    stats = pool.stats()
+    assert FakeConnection.opened == 1 and stats["reused"] == 4, stats
+    print(f"5 database helper calls opened {FakeConnection.opened} connection in {elapsed:.2f}s.")
+
+def test_pool_rolls_back_and_discards_broken_connections():
+    """Uncommitted work is rolled back on return, and broken or stale connections are replaced"""
+    FakeConnection.opened = 0
+    pool = ConnectionPool(FakeConnection, max_size=2, idle_timeout=0.2, ping_after=0)
+
+    with pool.acquire() as conn:
+        conn.cursor().execute("INSERT committed")
+    conn = pool.acquire()
+    conn.cursor().execute("INSERT abandoned")
+    raw = conn._raw
+    conn.close()
+    assert raw.committed == ["INSERT committed"] and raw.pending == []
+
+    # The server dropped the idle connection: the health check replaces it
+    raw.broken = True
+    conn = pool.acquire()
+    assert conn._raw is not raw and FakeConnection.opened == 2
+    conn.close()
+
+    # Idle past the timeout: closed instead of reused
+    raw = pool.idle[-1][0]
+    time.sleep(0.3)
+    conn = pool.acquire()
+    assert raw.closed and conn._raw is not raw and FakeConnection.opened == 3
+    conn.close()
+    assert pool.stats()["size"] == 1, pool.stats()
+    print("Pool rolled back abandoned work and replaced a broken and an expired connection.")
+
+def test_pool_is_bounded():
+    """Borrowers beyond max_size wait for a connection to be returned"""
+    FakeConnection.opened = 0
+    pool = ConnectionPool(FakeConnection, max_size=2, acquire_timeout=0.2)
+    first, second = pool.acquire(), pool.acquire()
+    try:
+        pool.acquire()
+        assert False, "acquire() should time out while both connections are borrowed"
+    except TimeoutError:
+        pass
+
+    threading.Timer(0.05, first.close).start()
+    third = pool.acquire()
+    assert FakeConnection.opened == 2
+    for conn in (second, third):
+        conn.close()
+
+    # Threads sharing a small pool never open more than max_size connections
+    pool.acquire_timeout = 5
+    def worker():
+        for _ in range(10):
+            with pool.acquire() as conn:
+                conn.cursor().execute("SELECT 1")
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert FakeConnection.opened == 2 and pool.stats()["size"] == 2, pool.stats()
+    print("Pool stayed at 2 connections for 6 threads.")
+
+if __name__ == "__main__":
+    test_pool_reuses_one_warm_connection()
+    test_pool_rolls_back_and_discards_broken_connections()
+    test_pool_is_bounded()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+import tempfile
+import threading
+import numpy as np
+from embedding_cache import EmbeddingCache
+
+def test_concurrent_writers_keep_rows_matched():
+    """Threads storing and evicting at the same time never give a key another text's vector"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = EmbeddingCache(cache_dir, dim=8, fingerprint="test", max_entries=300)
+
+        def vector_for(text):
+            return np.full(8, float(sum(map(ord, text))), dtype=np.float32)
+
+        def worker(prefix):
+            for start in range(0, 200, 10):
+                texts = [f"{prefix} comment {i}" for i in range(start, start + 10)]
+                keys = [cache.make_key(text, 128) for text in texts]
+                cache.put_many(keys, np.stack([vector_for(text) for text in texts]))
+                cache.get_many(keys)
+
+        threads = [threading.Thread(target=worker, args=(f"thread {n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.evictions > 0
+        reopened = EmbeddingCache(cache_dir, dim=8, fingerprint="test", max_entries=300)
+        texts = [f"thread {n} comment {i}" for n in range(4) for i in range(200)]
+        keys = {cache.make_key(text, 128): text for text in texts}
+        found = reopened.get_many(list(keys))
+        assert found
+        for key, vector in found.items():
+            assert np.array_equal(vector, vector_for(keys[key])), keys[key]
+        print(f"4 writers stored 800 vectors with {cache.evictions} evictions; "
+              f"{len(found)} survivors all match their text.")
+
+if __name__ == "__main__":
+    test_concurrent_writers_keep_rows_matched()
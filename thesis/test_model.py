@@ -1,4 +1,9 @@
 #!/usr/bin/env python
+import os
+import numpy as np
+import pandas as pd
+from transformers import BertTokenizer, BertTokenizerFast
+import model
 from model import classify_comment
 
 def test_model():
@@ -33,5 +38,86 @@ def test_model():
     print("• Likely Appropriate: Content that appears non-harmful based on the model.")
     print("\nNote: This is a guidance tool to assist human review, not to make definitive judgments.")
 
+def test_batched_embeddings_match_single():
+    """Embeddings must not depend on which comments share a padded batch"""
+    if not model.model:
+        model.initialize_models()
+
+    comments = [
+        "ok",
+        "You are so stupid, nobody likes you",
+        "I really enjoyed your presentation today, great work! See you at the meeting tomorrow, "
+        "and thanks again for all the help with the slides last week.",
+        "Grabe ka talaga 😂",
+    ]
+
+    # Bypass the embedding cache so every call really runs the model
+    cache = model.embedding_cache
+    model.embedding_cache = None
+    try:
+        single = np.vstack([model.generate_embedding(comment) for comment in comments])
+        batched = model.generate_embedding(comments)
+        bucketed = model.generate_embeddings_bucketed(comments, max_batch_size=2)
+    finally:
+        model.embedding_cache = cache
+
+    np.testing.assert_allclose(batched, single, rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(bucketed, single, rtol=1e-4, atol=1e-5)
+    print("Batched and single-comment embeddings match.")
+
+def test_fast_tokenizer_parity():
+    """The fast tokenizer must produce the same input_ids as the slow one"""
+    csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "docs", "test csv 2.csv")
+    comments = pd.read_csv(csv_path).iloc[:, 0].astype(str).tolist()
+
+    slow_tokenizer = BertTokenizer.from_pretrained(model.CB_MODEL_DIR)
+    fast_tokenizer = BertTokenizerFast.from_pretrained(model.CB_MODEL_DIR)
+
+    slow_ids = slow_tokenizer(comments, truncation=True, max_length=512)['input_ids']
+    fast_ids = fast_tokenizer(comments, truncation=True, max_length=512)['input_ids']
+
+    mismatches = [comment for comment, slow, fast in zip(comments, slow_ids, fast_ids) if slow != fast]
+    assert not mismatches, f"{len(mismatches)} comments tokenized differently, e.g. {mismatches[0][:50]!r}"
+    print(f"Fast and slow tokenizers agree on all {len(comments)} comments.")
+
+def test_onnx_backend_parity():
+    """ONNX Runtime and PyTorch backends must produce the same mean-pooled vectors"""
+    csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "docs", "test csv 2.csv")
+    comments = pd.read_csv(csv_path).iloc[:, 0].astype(str).tolist()
+
+    model.initialize_models(backend="onnx")
+    try:
+        if model.embedding_backend != "onnx":
+            print("ONNX backend unavailable, skipping parity test.")
+            return
+        passed, difference = model.check_backend_parity(comments)
+        assert passed, f"ONNX embeddings differ from PyTorch by up to {difference:.2e}"
+        print(f"ONNX and PyTorch embeddings agree on {len(comments)} comments (max abs difference {difference:.2e}).")
+    finally:
+        model.initialize_models()
+
+def test_classification_pool_matches_sequential():
+    """The process pool must return the same labels as sequential classification, in input order"""
+    from classification_pool import ClassificationPool
+
+    if not model.model:
+        model.initialize_models()
+    csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "docs", "test csv 2.csv")
+    comments = pd.read_csv(csv_path).iloc[:, 0].astype(str).tolist()
+
+    sequential = [label for label, _ in model.classify_comments(comments)]
+    pool = ClassificationPool(workers=2)
+    try:
+        parallel = [label for label, _ in pool.classify(comments, chunk_size=32)]
+    finally:
+        pool.shutdown()
+
+    assert parallel == sequential, "Pooled classification differs from sequential classification"
+    print(f"Pooled and sequential classification agree on {len(comments)} comments.")
+
 if __name__ == "__main__":
-    test_model() 
\ No newline at end of file
+    test_model()
+    test_batched_embeddings_match_single()
+    test_fast_tokenizer_parity()
+    test_onnx_backend_parity()
+    test_classification_pool_matches_sequential() 
\ No newline at end of file
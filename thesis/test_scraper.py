@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+import os
+import time
+import tempfile
+import threading
+import scraper
+from scrape_cache import ScrapeCache
+
+# --- Fake Apify Client ---
+# Stands in for apify_client.ApifyClient so the scraper can be tested offline.
+# Each post URL maps to a list of raw actor items; a URL containing "fail"
+# raises when its actor run is started.
+class FakeApifyClient:
+    datasets = {}
+    delay = 0.0                  # Seconds each actor run takes to finish
+    active_runs = 0
+    max_active_runs = 0
+    started_runs = 0
+    page_reads = 0
+    last_run_input = None
+    lock = threading.Lock()
+
+    def __init__(self, token):
+        self.runs = {}
+
+    def actor(self, actor_id):
+        return FakeActor(self)
+
+    def run(self, run_id):
+        return self.runs[run_id]
+
+    def dataset(self, dataset_id):
+        return FakeDataset(self.runs[dataset_id])
+
+class FakeActor:
+    def __init__(self, client):
+        self.client = client
+
+    def start(self, run_input):
+        url = run_input["startUrls"][0]["url"]
+        FakeApifyClient.last_run_input = run_input
+        if "fail" in url:
+            raise RuntimeError(f"Actor failed for {url}")
+        run = FakeRun(FakeApifyClient.datasets.get(url, []))
+        self.client.runs[url] = run
+        return {"id": url, "defaultDatasetId": url}
+
+class FakeRun:
+    def __init__(self, items):
+        self.items = items
+        self.started = time.time()
+        self.status = "RUNNING"
+        with FakeApifyClient.lock:
+            FakeApifyClient.started_runs += 1
+            FakeApifyClient.active_runs += 1
+            FakeApifyClient.max_active_runs = max(FakeApifyClient.max_active_runs, FakeApifyClient.active_runs)
+
+    def wait_for_finish(self, wait_secs):
+        remaining = FakeApifyClient.delay - (time.time() - self.started)
+        time.sleep(max(0.0, min(wait_secs, remaining)))
+        if remaining <= wait_secs:
+            self.finish("SUCCEEDED")
+        return {"status": self.status}
+
+    def abort(self):
+        self.finish("ABORTED")
+
+    def finish(self, status):
+        if self.status == "RUNNING":
+            with FakeApifyClient.lock:
+                FakeApifyClient.active_runs -= 1
+        self.status = status
+
+class FakeDataset:
+    def __init__(self, run):
+        self.run = run
+
+    def list_items(self, offset, limit):
+        # Items only become visible once the run has finished
+        items = self.run.items if self.run.status != "RUNNING" else []
+        page = items[offset:offset + limit]
+        if page:
+            FakeApifyClient.page_reads += 1
+        return type("ListPage", (), {"items": page})()
+
+def fake_items(url, count):
+    return [{"id": f"{url}#{i}", "text": f"Comment {i} on {url}", "profileName": f"User {i}",
+             "likesCount": i, "threadingDepth": i % 2, "date": f"2024-01-01T00:{i % 60:02d}:00.000Z"}
+            for i in range(count)]
+
+def use_fake_client(ttl_seconds=3600, max_bytes=10 * 1024 * 1024):
+    """Route the scraper to the fake client, with an empty scrape cache and history per test."""
+    scraper.ApifyClient = FakeApifyClient
+    scraper.get_api_key = lambda service: "fake-key"
+    os.environ["THESIS_APP_DATA"] = tempfile.mkdtemp()
+    scraper.scrape_cache = ScrapeCache(tempfile.mkdtemp(), ttl_seconds, max_bytes)
+    FakeApifyClient.started_runs = 0
+    FakeApifyClient.page_reads = 0
+
+def test_scrape_comments_in_memory():
+    """scrape_comments returns records or a typed frame without writing a CSV"""
+    use_fake_client()
+    url = "https://www.facebook.com/post/1"
+    FakeApifyClient.datasets = {url: fake_items(url, 30)}
+    FakeApifyClient.delay = 0.0
+
+    records = scraper.scrape_comments(url, filters={"maxComments": 20})
+    assert len(records) == 20
+    assert records[3]['Likes Count'] == 3 and records[3]['Is Reply'] is True
+
+    frame = scraper.scrape_comments(url, filters={"maxComments": 20}, as_frame=True)
+    assert list(frame.columns) == scraper.CSV_COLUMNS
+    assert str(frame['Likes Count'].dtype) == "int64" and str(frame['Is Reply'].dtype) == "bool"
+
+    # Callers that pass save_path still get the CSV path back
+    save_path = os.path.join(tempfile.mkdtemp(), "comments.csv")
+    assert scraper.scrape_comments(url, save_path, filters={"maxComments": 20}) == save_path
+    assert scraper.pd.read_csv(save_path)['Text'].tolist() == [record['Text'] for record in records]
+    print("scrape_comments returns 20 in-memory records, a typed frame, or the CSV path when asked.")
+
+def test_abbreviated_likes_count():
+    """Abbreviated or unreadable likes counts don't abort the scrape"""
+    use_fake_client()
+    url = "https://www.facebook.com/post/popular"
+    items = fake_items(url, 5)
+    for item, likes in zip(items, ["1.2K", "3M", "1,234", "many", None]):
+        item["likesCount"] = likes
+    FakeApifyClient.datasets = {url: items}
+    FakeApifyClient.delay = 0.0
+
+    frame = scraper.scrape_comments(url, filters={"maxComments": 10}, as_frame=True)
+    assert list(frame['Likes Count']) == [1200, 3000000, 1234, 0, 0]
+    print("Abbreviated likes counts were parsed instead of failing the page.")
+
+def test_scrape_many_runs_concurrently():
+    """scrape_many overlaps actor runs up to the concurrency limit and reports failures per URL"""
+    use_fake_client()
+    urls = [f"https://www.facebook.com/post/{i}" for i in range(6)] + ["https://www.facebook.com/post/fail"]
+    FakeApifyClient.datasets = {url: fake_items(url, 10) for url in urls}
+    FakeApifyClient.delay = 0.5
+    FakeApifyClient.max_active_runs = 0
+
+    start = time.time()
+    results = list(scraper.scrape_many(urls, {"maxComments": 50}, concurrency=3))
+    elapsed = time.time() - start
+
+    assert sorted(result['url'] for result in results) == sorted(urls)
+    failed = [result for result in results if result['error']]
+    assert [result['url'] for result in failed] == ["https://www.facebook.com/post/fail"]
+    assert all(len(result['comments']) == 10 for result in results if not result['error'])
+    assert FakeApifyClient.max_active_runs == 3, FakeApifyClient.max_active_runs
+    # Six half-second runs, three at a time: about 1s instead of 3s sequentially
+    assert elapsed < 2.0, elapsed
+    print(f"Scraped {len(urls)} URLs in {elapsed:.2f}s with 3 concurrent runs (1 failure reported).")
+
+def test_scrape_many_stop_aborts_runs():
+    """Stopping scrape_many early aborts the actor runs still in progress"""
+    use_fake_client()
+    urls = [f"https://www.facebook.com/post/{i}" for i in range(4)]
+    FakeApifyClient.datasets = {url: fake_items(url, 10) for url in urls}
+    FakeApifyClient.delay = 30.0
+
+    stop_event = threading.Event()
+    threading.Timer(0.5, stop_event.set).start()
+    start = time.time()
+    results = list(scraper.scrape_many(urls, {"maxComments": 50}, concurrency=2, stop_event=stop_event))
+    elapsed = time.time() - start
+
+    assert all(result['error'] == "Cancelled" for result in results)
+    assert FakeApifyClient.active_runs == 0
+    assert elapsed < 5.0, elapsed
+    print(f"Stopped {len(results)} scrapes after {elapsed:.2f}s; all actor runs aborted.")
+
+def test_scrape_cache_serves_repeat_scrapes():
+    """Repeat scrapes are served from the cache; actor settings, refresh and the TTL force a new run"""
+    use_fake_client(ttl_seconds=1)
+    url = "https://www.facebook.com/post/cached"
+    FakeApifyClient.datasets = {url: fake_items(url, 30)}
+    FakeApifyClient.delay = 0.0
+    filters = {"maxComments": 20, "includeReplies": True, "minWordCount": 3}
+
+    first = scraper.scrape_comments(url, filters=filters)
+    assert scraper.cached_scrape_age(url, filters) is not None
+    # Local filters and smaller requests reuse the entry
+    assert scraper.scrape_comments(url, filters=dict(filters, minWordCount=5)) == first
+    assert scraper.scrape_comments(url, filters=dict(filters, maxComments=10)) == first[:10]
+    assert FakeApifyClient.started_runs == 1
+
+    # More comments, different actor settings or a forced refresh run the actor again
+    scraper.scrape_comments(url, filters=dict(filters, maxComments=25))
+    scraper.scrape_comments(url, filters=dict(filters, includeReplies=False))
+    scraper.scrape_comments(url, filters=filters, refresh=True)
+    assert FakeApifyClient.started_runs == 4
+
+    # All 30 comments fit under a 50-comment request, so that entry serves any size
+    scraper.scrape_comments(url, filters=dict(filters, maxComments=50))
+    scraper.scrape_comments(url, filters=dict(filters, maxComments=500))
+    assert FakeApifyClient.started_runs == 5
+
+    time.sleep(1.1)
+    assert scraper.cached_scrape_age(url, filters) is None
+    scraper.scrape_comments(url, filters=filters)
+    assert FakeApifyClient.started_runs == 6
+    print("Scrape cache served 3 of 9 scrapes; refresh, new actor settings and expiry re-ran the actor.")
+
+def test_scrape_cache_size_cap():
+    """The cache evicts the oldest entries to stay under its size cap"""
+    use_fake_client(max_bytes=6000)
+    urls = [f"https://www.facebook.com/post/big{i}" for i in range(5)]
+    FakeApifyClient.datasets = {url: fake_items(url, 20) for url in urls}
+    FakeApifyClient.delay = 0.0
+
+    for url in urls:
+        scraper.scrape_comments(url, filters={"maxComments": 20})
+        time.sleep(0.01)  # Distinct modification times
+    stats = scraper.scrape_cache.stats()
+    assert stats["size_bytes"] <= 6000 and stats["evictions"] > 0, stats
+    assert scraper.cached_scrape_age(urls[-1], {"maxComments": 20}) is not None
+    assert scraper.cached_scrape_age(urls[0], {"maxComments": 20}) is None
+    print(f"Scrape cache kept {stats['entries']} entries ({stats['size_bytes']} bytes) "
+          f"after {stats['evictions']} evictions.")
+
+def test_incremental_rescrape_fetches_only_new_comments():
+    """An incremental re-scrape asks for recent activity first and stops after a page with nothing new"""
+    use_fake_client()
+    url = "https://www.facebook.com/post/monitored"
+    old_items = list(reversed(fake_items(url, 40)))  # Newest first
+    FakeApifyClient.datasets = {url: old_items}
+    FakeApifyClient.delay = 0.0
+    page_size = scraper.PAGE_SIZE
+    scraper.PAGE_SIZE = 10
+    try:
+        first = scraper.scrape_comments(url, filters={"maxComments": 100}, incremental=True)
+        assert len(first) == 40  # Nothing on record yet: full scrape
+
+        new_items = [{"id": f"{url}#new{i}", "text": f"New comment {i}", "date": f"2024-01-02T00:0{i}:00.000Z"}
+                     for i in reversed(range(5))]
+        FakeApifyClient.datasets = {url: new_items + old_items}
+        FakeApifyClient.page_reads = 0
+        update = scraper.scrape_comments(url, filters={"maxComments": 100}, incremental=True)
+        assert [comment['Text'] for comment in update] == [f"New comment {i}" for i in reversed(range(5))]
+        assert FakeApifyClient.last_run_input["viewOption"] == scraper.INCREMENTAL_VIEW_OPTION
+        assert FakeApifyClient.page_reads == 2, FakeApifyClient.page_reads  # Stopped after an all-known page
+        assert FakeApifyClient.active_runs == 0
+
+        # Nothing new since the update
+        assert scraper.scrape_comments(url, filters={"maxComments": 100}, incremental=True) == []
+        history = scraper.load_scrape_history(url)
+        assert len(history["comment_ids"]) == 45 and history["newest_date"].startswith("2024-01-02")
+    finally:
+        scraper.PAGE_SIZE = page_size
+    print("Incremental re-scrape returned only the 5 new comments after reading two pages.")
+
+def test_incremental_rescrape_past_active_old_thread():
+    """A known parent surfaced by a new reply doesn't stop paging before newer comments further down"""
+    use_fake_client()
+    url = "https://www.facebook.com/post/active-thread"
+    old_items = list(reversed(fake_items(url, 40)))
+    FakeApifyClient.datasets = {url: old_items}
+    FakeApifyClient.delay = 0.0
+    page_size = scraper.PAGE_SIZE
+    scraper.PAGE_SIZE = 10
+    try:
+        scraper.scrape_comments(url, filters={"maxComments": 100}, incremental=True)
+
+        # Page 1: an old, known parent with a new reply, then known comments; page 2 holds a new comment
+        parent = old_items[20]
+        reply = {"id": f"{url}#reply", "text": "New reply to an old comment", "threadingDepth": 1,
+                 "date": "2024-01-03T00:00:00.000Z", "parentComment": {"author": {"name": "User 19", "id": "19"}}}
+        new_comment = {"id": f"{url}#new", "text": "New comment further down", "date": "2024-01-03T00:01:00.000Z"}
+        rest = [item for item in old_items if item is not parent]
+        FakeApifyClient.datasets = {url: [parent, reply] + rest[:8] + [new_comment] + rest[8:]}
+        FakeApifyClient.page_reads = 0
+        update = scraper.scrape_comments(url, filters={"maxComments": 100}, incremental=True)
+        assert [comment['Text'] for comment in update] == ["New reply to an old comment", "New comment further down"]
+        assert FakeApifyClient.page_reads == 3, FakeApifyClient.page_reads
+    finally:
+        scraper.PAGE_SIZE = page_size
+    print("Incremental re-scrape found a new reply on page 1 and a new comment on page 2.")
+
+if __name__ == "__main__":
+    test_scrape_comments_in_memory()
+    test_abbreviated_likes_count()
+    test_scrape_many_runs_concurrently()
+    test_scrape_many_stop_aborts_runs()
+    test_scrape_cache_serves_repeat_scrapes()
+    test_scrape_cache_size_cap()
+    test_incremental_rescrape_fetches_only_new_comments()
+    test_incremental_rescrape_past_active_old_thread()
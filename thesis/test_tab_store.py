@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+import time
+from tab_store import (INSERT_COMMENT_SQL, prepare_comment_row, insert_comment_rows, load_session_tabs,
+                       tab_content_hash)
+from sql_stand_in import SqlStandIn, insert_row_by_row
+
+def make_comments(count):
+    comments = [{'comment_text': f"Comment number {i} about the post", 'prediction': "Potentially Harmful",
+                 'confidence': 0.5 + i % 50 / 100} for i in range(count)]
+    metadata = {comment['comment_text']: {'profile_name': f"User {i}", 'likes_count': str(i), 'date': "2024-01-01",
+                                          'profile_id': str(i), 'is_reply': i % 3 == 0}
+                for i, comment in enumerate(comments)}
+    return comments, metadata
+
+def test_bulk_insert_matches_row_by_row():
+    """Batched inserts store the same rows as the per-comment loop"""
+    comments, metadata = make_comments(1234)
+    selected = {comments[5]['comment_text']}
+    rows = [prepare_comment_row(7, comment, metadata, selected) for comment in comments]
+
+    loop_db, bulk_db = SqlStandIn(), SqlStandIn()
+    insert_row_by_row(loop_db.cursor(), rows)
+    assert insert_comment_rows(bulk_db.cursor(), rows, batch_size=500) == len(rows)
+    query = "SELECT * FROM tab_comments ORDER BY comment_id"
+    assert loop_db.conn.execute(query).fetchall() == bulk_db.conn.execute(query).fetchall()
+    # Three batches, each with a savepoint: 6 round trips instead of 1234
+    assert bulk_db.round_trips == 6, bulk_db.round_trips
+    print(f"Bulk insert stored {len(rows)} comments in {bulk_db.round_trips} round trips "
+          f"(row by row: {loop_db.round_trips}).")
+
+def test_selected_flag_matches_listed_texts():
+    """is_selected is set for exactly the listed comment texts, including ones cleaned of emojis"""
+    comments, metadata = make_comments(5)
+    comments[2]['comment_text'] = "Nice one 😂"
+    selected = {comments[1]['comment_text'], comments[2]['comment_text']}
+    flags = [prepare_comment_row(1, comment, metadata, selected)[-1] for comment in comments]
+    assert flags == [False, True, True, False, False], flags
+    print("Saved rows flag the 2 listed comments as selected.")
+
+def test_bulk_insert_reports_bad_rows():
+    """A rejected batch is rolled back and split until only the bad rows are skipped"""
+    comments, metadata = make_comments(20)
+    comments[4]['comment_text'] = "x" * 300  # Violates the length check
+    comments[11]['comment_text'] = "y" * 300
+    rows = [prepare_comment_row(1, comment, metadata, set()) for comment in comments]
+
+    db = SqlStandIn(max_text_length=200)
+    assert insert_comment_rows(db.cursor(), rows, batch_size=8) == 18
+    db.commit()
+    stored = [text for (text,) in db.conn.execute("SELECT comment_text FROM tab_comments ORDER BY comment_id")]
+    assert stored == [row[1] for i, row in enumerate(rows) if i not in (4, 11)]
+    print(f"Bulk insert skipped the 2 rejected comments and kept the other 18 ({db.round_trips} round trips).")
+
+def test_session_restore_single_round_trip():
+    """load_session_tabs returns every tab with its own comments, in order, from one query batch"""
+    db = SqlStandIn()
+    comments, metadata = make_comments(30)
+    for tab_id, tab_name in ((3, "CSV 1: a.csv"), (5, "URL 1: post"), (9, "Empty tab")):
+        db.conn.execute("INSERT INTO session_tabs VALUES (?, 42, ?, 'analysis')", (tab_id, tab_name))
+    db.conn.execute("INSERT INTO session_tabs VALUES (4, 7, 'Other session', 'analysis')")
+    # Interleave the tabs' comments, as saves from several tabs would
+    for i, comment in enumerate(comments):
+        tab_id = (3, 5, 4)[i % 3]
+        db.conn.execute(INSERT_COMMENT_SQL, prepare_comment_row(tab_id, comment, metadata, set()))
+
+    tabs = load_session_tabs(db, 42)
+    assert db.round_trips == 1, db.round_trips
+    assert [(tab_id, tab_name) for tab_id, tab_name, _, _ in tabs] == \
+        [(3, "CSV 1: a.csv"), (5, "URL 1: post"), (9, "Empty tab")]
+    assert [row[0] for row in tabs[0][3]] == [comment['comment_text'] for comment in comments[0::3]]
+    assert [row[0] for row in tabs[1][3]] == [comment['comment_text'] for comment in comments[1::3]]
+    assert tabs[2][3] == [] and len(tabs[0][3][0]) == 11
+    print(f"Restored {len(tabs)} tabs with {sum(len(tab[3]) for tab in tabs)} comments in 1 round trip.")
+
+def test_tab_content_hash_ignores_order():
+    """Restored tabs with the same comments in any order hash alike; different comments don't"""
+    comments, _ = make_comments(2000)
+    texts = [comment['comment_text'] for comment in comments]
+    start = time.time()
+    content_hash = tab_content_hash(texts)
+    elapsed = time.time() - start
+    assert tab_content_hash(reversed(texts)) == content_hash
+    assert tab_content_hash(texts[:-1]) != content_hash
+    assert tab_content_hash(texts[:-1] + ["Another comment"]) != content_hash
+    print(f"Hashed a {len(texts)}-comment tab from its raw rows in {elapsed * 1000:.1f}ms.")
+
+if __name__ == "__main__":
+    test_bulk_insert_matches_row_by_row()
+    test_selected_flag_matches_listed_texts()
+    test_bulk_insert_reports_bad_rows()
+    test_session_restore_single_round_trip()
+    test_tab_content_hash_ignores_order()
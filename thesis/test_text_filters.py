@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+import os
+import sys
+import pandas as pd
+from text_filters import filter_comments, is_name_only, is_emoji_only
+from filter_reference import (filter_comments_loop, is_name_only_reference, is_emoji_only_reference,
+                              is_emoji_only_scan)
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "docs", "test csv 2.csv")
+
+EDGE_CASES = [
+    "", "   ", "Juan Dela Cruz", "@juan_23", "Maria @ Jose", "salamat po kuya sa tulong",
+    "kuyaa ang galing mo po", "Ate, thank you po", "check this https://example.com now please",
+    "visit www.example.com for more", "😂😂😂", "❤️ 🔥", "😂 ang galing mo talaga", "Ⓜ️",
+    "I really enjoyed your presentation today", "Thanks!", None,
+]
+
+NAME_EDGE_CASES = [
+    "KUYA", "kuya,", "kuya\n", "\u2003kuya\u2003", "sabi ni mama mo", "mamaa", "ſis", "Juan Cruz\n",
+    "\u212Aevin Cruz", "\u0131sa Cruz", "Juan  Cruz", "juan_cruz", "@", "@juan", "@juan cruz", "Maria@Jose",
+    "Juan Dela Cruz Jr", "ñino cruz", "bro!", "ate ko", "Mga ate at kuya",
+]
+
+def load_sample_comments():
+    texts = pd.read_csv(SAMPLE_CSV)['Comment'].tolist() if os.path.exists(SAMPLE_CSV) else []
+    return pd.DataFrame({'Text': texts + EDGE_CASES})
+
+def test_filter_matches_per_comment_rules():
+    """The vectorized masks exclude the same comments, with the same per-rule counts, as the scalar rules"""
+    df = load_sample_comments()
+    for filters in ({}, {"minWordCount": 1}, {"excludeLinks": False},
+                    {"minWordCount": 1, "excludeEmojisOnly": False}):
+        filtered, stats = filter_comments(df, filters)
+        expected, expected_stats = filter_comments_loop(df, filters)
+        assert stats == expected_stats, (filters, stats, expected_stats)
+        assert list(filtered.index) == list(expected.index), filters
+    print(f"Vectorized filters match the per-comment rules on {len(df)} comments.")
+
+def test_name_matcher_matches_reference():
+    """The combined name-only pattern flags exactly the comments the separate checks did"""
+    texts = load_sample_comments()['Text'].fillna("").astype(str).tolist() + NAME_EDGE_CASES
+    mismatches = [text for text in texts if is_name_only(text) != is_name_only_reference(text)]
+    assert not mismatches, mismatches
+    print(f"Combined name matcher agrees with the reference on {len(texts)} comments.")
+
+def test_emoji_table_matches_reference():
+    """The codepoint table accepts the same characters as the original emoji pattern, for every codepoint"""
+    mismatches = []
+    for cp in range(sys.maxunicode + 1):
+        char = chr(cp)
+        for text in (char, f"\U0001F525{char}", f" {char} "):
+            expected = is_emoji_only_reference(text)
+            if is_emoji_only(text) != expected or is_emoji_only_scan(text) != expected:
+                mismatches.append((hex(cp), text))
+    assert not mismatches, mismatches[:10]
+    for text in EDGE_CASES[:-1]:
+        assert is_emoji_only(text) == is_emoji_only_reference(text), text
+    print("Emoji codepoint table agrees with the original pattern on every codepoint.")
+
+if __name__ == "__main__":
+    test_filter_matches_per_comment_rules()
+    test_name_matcher_matches_reference()
+    test_emoji_table_matches_reference()
@@ -0,0 +1,164 @@
+import re
+import numpy as np
+
+# --- Compiled Patterns ---
+# Compiled once at import instead of on every comment
+
+# Name-only shapes, matched case-insensitively against the whole comment:
+# First Second Third, Name @ Name, First Last, or a @tag
+NAME_SHAPES = [
+    r"[A-Za-z]+ [A-Za-z]+ [A-Za-z]+",
+    r"[A-Za-z]+ @ [A-Za-z]+",
+    r"[A-Za-z]+ [A-Za-z]+",
+    r"@[A-Za-z0-9_]+",
+]
+
+# Common Filipino name markers
+NAME_MARKERS = frozenset([
+    "kuya", "ate", "tita", "tito", "lola", "lolo", "nanay", "tatay",
+    "mommy", "daddy", "mama", "papa", "inay", "itay", "sis", "bro"
+])
+
+# One alternation for both checks, so a comment is scanned once: a marker as a
+# whole whitespace-separated word (i.e. `marker in text.split()`), or a name
+# shape spanning the whole comment. The text is lowercased before matching;
+# the (?i:) group around the shapes is kept only for parity with the original
+# re.IGNORECASE checks on the two characters that stay non-ASCII after
+# lower() but case-fold to ASCII letters: long s (U+017F) and dotless i
+# (U+0131). (The Kelvin sign already lowercases to "k".)
+NAME_ONLY_PATTERN = re.compile(
+    r"(?<!\S)(?:" + "|".join(sorted(NAME_MARKERS)) + r")(?!\S)"
+    r"|^(?i:" + "|".join(NAME_SHAPES) + r")$"
+)
+
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+
+# Codepoint blocks counted as emoji (inclusive)
+EMOJI_BLOCKS = [
+    (0x1F600, 0x1F64F),  # emoticons
+    (0x1F300, 0x1F5FF),  # symbols & pictographs
+    (0x1F680, 0x1F6FF),  # transport & map symbols
+    (0x1F700, 0x1F77F),  # alchemical symbols
+    (0x1F780, 0x1F7FF),  # Geometric Shapes
+    (0x1F800, 0x1F8FF),  # Supplemental Arrows-C
+    (0x1F900, 0x1F9FF),  # Supplemental Symbols and Pictographs
+    (0x1FA00, 0x1FA6F),  # Chess Symbols
+    (0x1FA70, 0x1FAFF),  # Symbols and Pictographs Extended-A
+    (0x2702, 0x27B0),    # Dingbats
+    (0x24C2, 0x1F251),   # Enclosed characters
+    (0x2600, 0x26FF),    # Miscellaneous Symbols
+    (0x2700, 0x27BF),    # Dingbats
+]
+
+# Whitespace codepoints as str.strip() and \s see them (there are none above the BMP)
+WHITESPACE_CODEPOINTS = frozenset(cp for cp in range(0x10000) if chr(cp).isspace())
+
+def build_codepoint_ranges(blocks, exclude=frozenset()):
+    """
+    Merge overlapping codepoint blocks into a sorted table of disjoint ranges.
+
+    Args:
+        blocks (list): (first, last) codepoint pairs, inclusive
+        exclude (frozenset): Codepoints to cut out of the ranges
+
+    Returns:
+        list: Sorted, non-overlapping (first, last) pairs
+    """
+    merged = []
+    for first, last in sorted(blocks):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+
+    ranges = []
+    for first, last in merged:
+        for cp in sorted(cp for cp in exclude if first <= cp <= last):
+            if first < cp:
+                ranges.append((first, cp - 1))
+            first = cp + 1
+        if first <= last:
+            ranges.append((first, last))
+    return ranges
+
+# Emoji ranges without the whitespace they overlap (U+3000 sits inside U+24C2-U+1F251)
+EMOJI_RANGES = build_codepoint_ranges(EMOJI_BLOCKS, WHITESPACE_CODEPOINTS)
+EMOJI_CLASS = "".join(f"{chr(first)}-{chr(last)}" for first, last in EMOJI_RANGES)
+# Leading whitespace, one emoji, then only emojis and whitespace: a single
+# scan, so the comment doesn't need stripping first. The table is compiled
+# into a regex class rather than looked up per character (filter_reference.
+# is_emoji_only_scan): on 20k emoji-only posts the class takes 11 ms and the
+# per-character bytes/bisect scan 88 ms, as slow as the original pattern.
+EMOJI_ONLY_PATTERN = re.compile(f"\\s*[{EMOJI_CLASS}][{EMOJI_CLASS}\\s]*")
+
+# --- Per-Comment Rules ---
+def is_short_comment(text, min_words=3):
+    """Check if a comment has fewer than min_words whitespace-separated words."""
+    return len(text.split()) < min_words
+
+def is_name_only(text):
+    """Check if a comment is likely just a name, a tag or a name marker (kuya, ate, ...)."""
+    return NAME_ONLY_PATTERN.search(text.lower()) is not None
+
+def contains_link(text):
+    """Check if a comment contains a URL."""
+    return URL_PATTERN.search(text) is not None
+
+def is_emoji_only(text):
+    """Check if a comment contains only emojis (and whitespace)."""
+    return EMOJI_ONLY_PATTERN.fullmatch(text) is not None
+
+# --- Vectorized Rules ---
+def name_only_mask(texts):
+    """Vectorized is_name_only over a Series of strings."""
+    return texts.str.lower().str.contains(NAME_ONLY_PATTERN, regex=True).to_numpy(dtype=bool)
+
+def filter_comments(df, filters, text_column='Text'):
+    """
+    Drop short, name-only, link and emoji-only comments.
+
+    Each rule is evaluated as a vectorized mask over the text column, only on
+    the comments that earlier rules kept, so every excluded comment is counted
+    under the first rule it fails (short, name-only, link, emoji-only).
+
+    Args:
+        df (pd.DataFrame): Comments with a text column
+        filters (dict): Comment filter settings (minWordCount, excludeLinks, excludeEmojisOnly)
+        text_column (str): Column holding the comment text
+
+    Returns:
+        tuple: (filtered_df, stats) where stats holds total_comments and a count per rule
+    """
+    # Get filter settings with defaults
+    min_word_count = filters.get("minWordCount", 3)
+    exclude_links = filters.get("excludeLinks", True)
+    exclude_emojis_only = filters.get("excludeEmojisOnly", True)
+
+    texts = df[text_column].fillna("").astype(str)
+    keep = np.ones(len(df), dtype=bool)
+    stats = {
+        'total_comments': len(df),
+        'short_comment_count': 0,
+        'name_only_count': 0,
+        'link_comment_count': 0,
+        'emoji_only_count': 0
+    }
+
+    def apply_rule(stat, rule):
+        # Evaluate the rule on the comments still kept and drop the ones it matches
+        remaining = np.flatnonzero(keep)
+        if len(remaining) == 0:
+            return
+        matched = remaining[np.asarray(rule(texts.iloc[remaining]), dtype=bool)]
+        keep[matched] = False
+        stats[stat] = len(matched)
+
+    apply_rule('short_comment_count', lambda t: (t.str.split().str.len() < min_word_count).to_numpy())
+    apply_rule('name_only_count', name_only_mask)
+    if exclude_links:
+        apply_rule('link_comment_count', lambda t: t.str.contains(URL_PATTERN, regex=True).to_numpy(dtype=bool))
+    if exclude_emojis_only:
+        apply_rule('emoji_only_count',
+                   lambda t: t.str.fullmatch(EMOJI_ONLY_PATTERN).to_numpy(dtype=bool))
+
+    return df[keep], stats
@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, 
                            QLineEdit, QPushButton, QTextEdit, QWidget, 
-                           QFileDialog, QTableWidget, QTableWidgetItem, 
+                           QFileDialog, 
                            QHeaderView, QSplitter, QGridLayout, QComboBox, 
                            QSizePolicy, QStackedWidget, QDialog, QTabWidget, QTabBar,
                            QMessageBox, QCheckBox, QApplication, QRadioButton)
@@ -10,8 +10,13 @@ import numpy as np
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 from io import BytesIO
-from scraper import scrape_comments
-from model import classify_comment
+from scraper import (iter_comment_batches, comments_to_frame, scrape_export_path, cached_scrape_age,
+                     load_scrape_history, update_scrape_history)
+from scrape_cache import format_age
+from text_filters import filter_comments
+from scrape_queue import ScrapeQueueDialog
+from model import classify_comment, count_duplicates
+from classification_worker import ClassificationJob, JobTab
 import pandas as pd
 from utils import display_message
 from styles import (COLORS, FONTS, BUTTON_STYLE, INPUT_STYLE, TABLE_STYLE, TAB_STYLE, 
@@ -24,15 +29,16 @@ from styles import (COLORS, FONTS, BUTTON_STYLE, INPUT_STYLE, TABLE_STYLE, TAB_S
                    ABOUT_BUTTON_OUTLINE_STYLE, DETAIL_TEXT_SPAN_STYLE,
                    SECTION_CONTAINER_STYLE, DETAILS_SECTION_STYLE, TEXT_EDIT_STYLE,
                    MENU_BAR_STYLE, CHECKBOX_REPLY_STYLE, ROW_OPERATION_BUTTON_STYLE)
-import tempfile
 import time
 from comment_operations import generate_report_user
 from loading_overlay import LoadingOverlay
 from stopwords import TAGALOG_STOP_WORDS
 import re
-from db_config import log_user_action, get_db_connection
+from db_config import log_user_action, get_db_connection, db_connection
+from tab_store import save_tab_comments, load_session_tabs
 import os
 from comment_filters import CommentFiltersDialog
+from comment_table_model import CommentTableView, COMMENT_COLUMN, LABEL_COLUMN, CONFIDENCE_COLUMN
 
 class CustomTabBar(QTabBar):
     def __init__(self, parent=None):
@@ -107,9 +113,11 @@ class UserMainWindow(QMainWindow):
         self.url_tab_count = 1
         self.comment_metadata = {}
         self.tabs = {}
+        self.pending_tab_rows = {}  # Restored tab widget -> comments not yet put in its table
         self.tab_states = {}
         self.main_window = None
         self.session_id = None  # Add session ID property
+        self.classification_job = None  # Background scrape/CSV analysis in progress
         self.setWindowTitle("Cyberbullying Content Guidance System - User View")
         self.showFullScreen()
         self.setStyleSheet(f"background-color: {COLORS['background']}; color: {COLORS['text']};")
@@ -134,6 +142,9 @@ class UserMainWindow(QMainWindow):
         }
         self.filter_button = QPushButton("Filters")
         self.filter_button.clicked.connect(self.show_filters_dialog)
+        self.queue_button = QPushButton("Queue")
+        self.queue_button.clicked.connect(self.show_scrape_queue)
+        self.refresh_checkbox = QCheckBox("Force refresh")
         self.scrape_button = QPushButton("Scrape Comments")
         self.scrape_button.clicked.connect(self.scrape_comments)
         
@@ -289,6 +300,7 @@ class UserMainWindow(QMainWindow):
             self.selected_comments = []
             self.comment_metadata = {}
             self.tabs = {}
+            self.pending_tab_rows = {}
             
             # Reset tab counters for fresh start
             self.csv_tab_count = 1
@@ -298,37 +310,21 @@ class UserMainWindow(QMainWindow):
             while self.tab_widget.count() > 0:
                 self.tab_widget.removeTab(0)
             
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # Get all tabs for this session
-            cursor.execute("""
-                SELECT tab_id, tab_name, tab_type 
-                FROM session_tabs 
-                WHERE session_id = ?
-            """, (self.session_id,))
-            
-            tabs = cursor.fetchall()
+            # Get all tabs for this session with their comments in one round trip
+            with db_connection() as conn:
+                tabs = load_session_tabs(conn, self.session_id)
             
             # Create a dictionary to collect comments for each tab name
             all_tab_comments = {}
+            seen_rows = {}  # Tab name -> rows already collected, for the duplicate check
+            selected_texts = set()  # Texts already in self.selected_comments
             
             # First, collect all comments for all tabs
-            for tab_id, tab_name, tab_type in tabs:
-                # Get comments for this tab
-                cursor.execute("""
-                    SELECT comment_text, prediction, confidence,
-                           profile_name, profile_picture, comment_date,
-                           likes_count, profile_id, is_reply, reply_to, is_selected
-                    FROM tab_comments 
-                    WHERE tab_id = ?
-                """, (tab_id,))
-                
-                comments = cursor.fetchall()
-                
+            for tab_id, tab_name, tab_type, comments in tabs:
                 # Initialize list for this tab name if not exists
                 if tab_name not in all_tab_comments:
                     all_tab_comments[tab_name] = []
+                    seen_rows[tab_name] = set()
                 
                 # Process each comment
                 for comment_data in comments:
@@ -350,8 +346,10 @@ class UserMainWindow(QMainWindow):
                         'reply_to': reply_to
                     }
                     
-                    # Add to list for this tab (avoid duplicates)
-                    if comment_dict not in all_tab_comments[tab_name]:
+                    # Add to list for this tab (avoid duplicates; the row without is_selected is the comment_dict)
+                    row_key = tuple(comment_data[:10])
+                    if row_key not in seen_rows[tab_name]:
+                        seen_rows[tab_name].add(row_key)
                         all_tab_comments[tab_name].append(comment_dict)
                     
                     # Store metadata
@@ -367,7 +365,8 @@ class UserMainWindow(QMainWindow):
                     }
                     
                     # Add to selected comments if selected
-                    if is_selected and comment_text not in self.selected_comments:
+                    if is_selected and comment_text not in selected_texts:
+                        selected_texts.add(comment_text)
                         self.selected_comments.append(comment_text)
             
             # Now create tabs and populate them with the collected comments
@@ -375,17 +374,15 @@ class UserMainWindow(QMainWindow):
                 if not comments_data:  # Skip empty tabs
                     continue
                     
-                # Create tab in UI
-                table = self.create_empty_tab(tab_name)
-                
-                # Populate the table with all comments for this tab
-                table.setRowCount(0)
-                self.populate_table(table, comments_data)
+                # Add the tab as a placeholder; its table is built when it is first shown
+                self.create_placeholder_tab(tab_name, comments_data)
                 
                 # Log the restored tab
                 print(f"Restored tab '{tab_name}' with {len(comments_data)} comments")
             
-            conn.close()
+            # Only the visible tab's table is built now
+            if self.tab_widget.count() > 0:
+                self.materialize_tab(self.tab_widget.currentWidget())
             
             # Update tab counters based on existing tabs
             self.update_tab_counters()
@@ -437,100 +434,13 @@ class UserMainWindow(QMainWindow):
         
         print(f"Updated tab counters - CSV: {self.csv_tab_count}, URL: {self.url_tab_count}")
 
-    def save_tab_state(self, tab_name, comments):
-        """Save tab and its comments to the database"""
+    def save_tab_state(self, tab_name, comments, append=False):
+        """Save tab and its comments to the database (append adds to the tab's saved comments)"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            # Check if tab already exists for this session
-            cursor.execute("""
-                SELECT tab_id FROM session_tabs 
-                WHERE session_id = ? AND tab_name = ?
-            """, (self.session_id, tab_name))
-            
-            tab_result = cursor.fetchone()
-            
-            if tab_result:
-                # Tab exists, get its ID
-                tab_id = tab_result[0]
-                
-                # Delete existing comments for this tab to avoid duplicates
-                cursor.execute("""
-                    DELETE FROM tab_comments 
-                    WHERE tab_id = ?
-                """, (tab_id,))
-            else:
-                # Create new tab record
-                cursor.execute("""
-                    INSERT INTO session_tabs (session_id, tab_name, tab_type)
-                    VALUES (?, ?, ?)
-                """, (self.session_id, tab_name, "analysis"))
-                
-                tab_id = cursor.execute("SELECT @@IDENTITY").fetchval()
-            
-            # Save each comment
-            for comment in comments:
-                try:
-                    metadata = self.comment_metadata.get(comment.get('comment_text', ''), {})
-                    
-                    # Get prediction and confidence from the comment data
-                    prediction = comment.get('prediction', '')
-                    confidence = comment.get('confidence', 0.0)
-                    
-                    # Handle likes_count - ensure it's a valid float or NULL
-                    likes_count = metadata.get('likes_count')
-                    try:
-                        likes_count = float(likes_count) if likes_count not in ('N/A', '', None) else None
-                    except (ValueError, TypeError):
-                        likes_count = None
-                    
-                    # Clean up text fields to handle emojis and special characters
-                    def clean_text(value):
-                        if value is None:
-                            return ''
-                        # Convert float/int to string if needed
-                        if isinstance(value, (float, int)):
-                            value = str(value)
-                        # Handle string encoding
-                        try:
-                            return value.encode('ascii', 'ignore').decode()
-                        except AttributeError:
-                            return str(value)
-                    
-                    clean_comment = clean_text(comment.get('comment_text', ''))
-                    clean_profile_name = clean_text(metadata.get('profile_name', ''))
-                    clean_profile_picture = clean_text(metadata.get('profile_picture', ''))
-                    clean_reply_to = clean_text(metadata.get('reply_to', ''))
-                    
-                    cursor.execute("""
-                        INSERT INTO tab_comments (
-                            tab_id, comment_text, prediction, confidence,
-                            profile_name, profile_picture, comment_date,
-                            likes_count, profile_id, is_reply, reply_to, is_selected
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        tab_id,
-                        clean_comment,
-                        prediction,
-                        confidence,  # Store actual confidence value
-                        clean_profile_name,
-                        clean_profile_picture,
-                        metadata.get('date'),
-                        likes_count,
-                        metadata.get('profile_id'),
-                        float(bool(metadata.get('is_reply', False))),
-                        clean_reply_to,
-                        clean_comment in self.selected_comments
-                    ))
-                    
-                except Exception as e:
-                    print(f"Error saving comment {comment}: {e}")
-                    continue
-            
-            conn.commit()
-            conn.close()
-            
+            # One transaction; the comments go in as batched bulk inserts
+            with db_connection() as conn:
+                save_tab_comments(conn, self.session_id, tab_name, comments,
+                                  self.comment_metadata, self.selected_comment_texts(), append)
         except Exception as e:
             print(f"Tab save error: {e}")
 
@@ -540,17 +450,8 @@ class UserMainWindow(QMainWindow):
         if not table:
             return None
             
-        for row in range(table.rowCount()):
-            # Check both display text and stored data
-            item = table.item(row, 0)
-            if not item:
-                continue
-                
-            stored_text = item.data(Qt.UserRole)
-            if stored_text == comment_text:
-                return row
-                
-        return None
+        row = table.model().find_row(comment_text)
+        return row if row != -1 else None
 
     def confirm_sign_out(self):
         """Show confirmation dialog before signing out and close session"""
@@ -585,47 +486,14 @@ class UserMainWindow(QMainWindow):
                 for tab_name, tab_widget in self.tabs.items():
                     try:
                         # Get the table from this tab
-                        table = tab_widget.findChild(QTableWidget)
-                        if not table:
+                        table = tab_widget.findChild(CommentTableView)
+                        if not table and tab_widget not in self.pending_tab_rows:
                             continue
                             
-                        # Gather all comments from this tab
-                        tab_comments = []
-                        for row in range(table.rowCount()):
-                            row_comment_item = table.item(row, 0)
-                            row_prediction_item = table.item(row, 1)
-                            row_confidence_item = table.item(row, 2)
-                            
-                            if row_comment_item and row_prediction_item and row_confidence_item:
-                                # Get the stored comment text (using UserRole if available)
-                                row_comment_text = row_comment_item.data(Qt.UserRole) or row_comment_item.text()
-                                row_prediction = row_prediction_item.text()
-                                
-                                # Get confidence
-                                try:
-                                    row_confidence_text = row_confidence_item.text()
-                                    row_confidence = float(row_confidence_text.strip('%'))
-                                except:
-                                    row_confidence = 0.0
-                                
-                                # Get metadata
-                                metadata = self.comment_metadata.get(row_comment_text, {})
-                                
-                                # Create data dictionary
-                                row_data = {
-                                    'comment_text': row_comment_text,
-                                    'prediction': row_prediction,
-                                    'confidence': row_confidence,
-                                    'profile_name': metadata.get('profile_name', 'Direct Input'),
-                                    'profile_picture': metadata.get('profile_picture', ''),
-                                    'comment_date': metadata.get('date', time.strftime('%Y-%m-%d %H:%M:%S')),
-                                    'likes_count': metadata.get('likes_count', 'N/A'),
-                                    'profile_id': metadata.get('profile_id', 'N/A'),
-                                    'is_reply': metadata.get('is_reply', False),
-                                    'reply_to': metadata.get('reply_to', None)
-                                }
-                                
-                                tab_comments.append(row_data)
+                        # Gather all comments from this tab (restored rows if it was never shown)
+                        tab_comments = list(self.pending_tab_rows.get(tab_widget, []))
+                        if table:
+                            tab_comments.extend(self.table_comment_rows(table, 'Direct Input'))
                         
                         # Save this tab's state
                         if tab_comments:
@@ -732,22 +600,17 @@ class UserMainWindow(QMainWindow):
         # Clean up memory and UI
         if tab_name in self.tabs:
             # Get all comment text in this tab to clean up metadata and selected comments
-            comment_texts = []
-            table_widget = self.tabs[tab_name].findChild(QTableWidget)
+            # Rows of a tab that was never shown are still pending, not in the table
+            comment_texts = set(comment['comment_text'] for comment in self.pending_tab_rows.pop(self.tabs[tab_name], []))
+            table_widget = self.tabs[tab_name].findChild(CommentTableView)
             if table_widget:
-                for row in range(table_widget.rowCount()):
-                    comment_item = table_widget.item(row, 0)
-                    if comment_item:
-                        comment_text = comment_item.data(Qt.UserRole) or comment_item.text()
-                        comment_texts.append(comment_text)
-                        
-                        # Remove from selected comments if present
-                        if comment_text in self.selected_comments:
-                            self.selected_comments.remove(comment_text)
-                            
-                        # Remove metadata
-                        if comment_text in self.comment_metadata:
-                            del self.comment_metadata[comment_text]
+                comment_texts.update(table_widget.model().comments)
+
+            # Remove from selected comments and drop their metadata
+            self.selected_comments = [item for item in self.selected_comments if item not in comment_texts]
+            for comment_text in comment_texts:
+                if comment_text in self.comment_metadata:
+                    del self.comment_metadata[comment_text]
             
             # Remove tab widget and reference
             self.tabs[tab_name].deleteLater()
@@ -834,6 +697,7 @@ class UserMainWindow(QMainWindow):
         self.tab_widget.setStyleSheet(TAB_STYLE)
         self.tab_widget.setTabsClosable(True)
         self.tab_widget.tabCloseRequested.connect(self.close_tab)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
 
         # Create initial message
         self.initial_message = QLabel("No analysis performed yet.\nResults will appear here.")
@@ -961,6 +825,16 @@ class UserMainWindow(QMainWindow):
         self.filter_button.setFixedWidth(80)
         self.filter_button.setToolTip("Configure comment scraping options")
         url_layout.addWidget(self.filter_button)
+
+        self.queue_button.setFont(FONTS['button'])
+        self.queue_button.setStyleSheet(BUTTON_STYLE)
+        self.queue_button.setFixedWidth(80)
+        self.queue_button.setToolTip("Scrape several Facebook posts at once")
+        url_layout.addWidget(self.queue_button)
+
+        self.refresh_checkbox.setStyleSheet(CHECKBOX_REPLY_STYLE)
+        self.refresh_checkbox.setToolTip("Ignore cached results and scrape the post again")
+        url_layout.addWidget(self.refresh_checkbox)
         fb_layout.addLayout(url_layout)
 
         self.scrape_button.setFont(FONTS['button'])
@@ -1175,13 +1049,17 @@ class UserMainWindow(QMainWindow):
 
     def create_empty_tab(self, tab_type):
         """Create a new empty tab with a table"""
-        # Truncate tab name for consistent width
-        tab_display_name = self.truncate_tab_name(tab_type)
-        
         if tab_type in self.tabs:
-            return self.tabs[tab_type].findChild(QTableWidget)
+            return self.get_tab_table(self.tabs[tab_type])
 
         tab = QWidget()
+        table = self.build_tab_contents(tab)
+        self.add_tab_page(tab, tab_type)
+
+        return table
+
+    def build_tab_contents(self, tab):
+        """Build the header, search bar, sort dropdown and comment table inside a tab page"""
         tab_layout = QVBoxLayout(tab)
         
         # Header section with title and controls
@@ -1218,13 +1096,10 @@ class UserMainWindow(QMainWindow):
         tab_layout.addLayout(header_layout)
 
         # Create and configure table
-        table = QTableWidget()
+        table = CommentTableView()  # Columns come from its CommentTableModel
         table.setSortingEnabled(True)
         table.setStyleSheet(TABLE_ALTERNATE_STYLE)
-        table.setColumnCount(3)
-        table.setHorizontalHeaderLabels(["Comment", "Prediction", "Confidence"])
         table.setAlternatingRowColors(True)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
 
         # Adjust column sizes
         header = table.horizontalHeader()
@@ -1237,9 +1112,7 @@ class UserMainWindow(QMainWindow):
         table.setColumnWidth(2, 100)
 
         table.setWordWrap(True)
-        table.setSelectionBehavior(QTableWidget.SelectRows)
-        table.setSelectionMode(QTableWidget.SingleSelection)
-        table.itemSelectionChanged.connect(self.update_details_panel)
+        table.selectionModel().selectionChanged.connect(lambda *_: self.update_details_panel())
         
         # Store references to controls
         table.sort_combo = sort_combo
@@ -1247,14 +1120,16 @@ class UserMainWindow(QMainWindow):
         
         tab_layout.addWidget(table)
         
-        # Configure search functionality
-        def filter_table():
-            search_text = search_bar.text().lower()
-            for row in range(table.rowCount()):
-                comment = table.item(row, 0).text().lower()
-                table.setRowHidden(row, search_text not in comment)
-        
-        search_bar.textChanged.connect(filter_table)
+        # Configure search functionality (filters the table's model)
+        search_bar.textChanged.connect(table.model().set_search_text)
+
+        return table
+
+    def add_tab_page(self, tab, tab_type):
+        """Register a tab page under its full name and add it to the tab bar"""
+        # Truncate tab name for consistent width
+        tab_display_name = self.truncate_tab_name(tab_type)
+
         # Add tab to widget and store reference - use display name for UI but store full name in dict
         self.tab_widget.addTab(tab, tab_display_name)
         self.tabs[tab_type] = tab
@@ -1264,8 +1139,23 @@ class UserMainWindow(QMainWindow):
             self.initial_message.hide()
             self.tab_widget.show()
             self.enable_dataset_operations(True)
-            
-        return table
+
+    def create_placeholder_tab(self, tab_type, comments):
+        """
+        Add a restored tab as an empty page that holds its rows until it is first shown.
+
+        Args:
+            tab_type (str): Full tab name
+            comments (list): Rows for populate_table
+
+        Returns:
+            QWidget: The placeholder tab page
+        """
+        tab = QWidget()
+        self.add_tab_page(tab, tab_type)
+        # Registered after adding, so the first tab's currentChanged doesn't build it right away
+        self.pending_tab_rows[tab] = comments
+        return tab
 
     def enable_dataset_operations(self, enable=True):
         """Enable or disable dataset operation buttons"""
@@ -1282,140 +1172,60 @@ class UserMainWindow(QMainWindow):
         """Get the table widget from the current tab"""
         current_tab = self.tab_widget.currentWidget()
         if current_tab:
-            return current_tab.findChild(QTableWidget)
+            return self.get_tab_table(current_tab)
         return None
 
+    def get_tab_table(self, tab_widget):
+        """Get the table widget from a tab, building it first if the tab was restored but not shown yet"""
+        self.materialize_tab(tab_widget)
+        return tab_widget.findChild(CommentTableView)
+
+    def materialize_tab(self, tab_widget):
+        """Build a restored placeholder tab's table from its saved comments the first time it is needed"""
+        comments = self.pending_tab_rows.pop(tab_widget, None)
+        if comments is None:
+            return
+        table = tab_widget.findChild(CommentTableView) or self.build_tab_contents(tab_widget)
+        self.populate_table(table, comments)
+
+    def on_tab_changed(self, index):
+        """Populate a restored tab when the user switches to it"""
+        tab_widget = self.tab_widget.widget(index)
+        if tab_widget:
+            self.materialize_tab(tab_widget)
+
     def sort_table(self, table):
-        """Sort table based on selected criteria using custom logic."""
-        sort_combo = table.sort_combo
-        index = sort_combo.currentIndex()
+        """Sort the table's model by the selected criteria, or show only replies."""
+        index = table.sort_combo.currentIndex()
+        model = table.model()
         
-        # Disable sorting during the process
+        # Disable header-click sorting; the dropdown decides the order
         table.setSortingEnabled(False)
 
         # --- Reply Filtering --- 
-        if index == 5:  # "Show Replies Only"
-            for row in range(table.rowCount()):
-                comment_item = table.item(row, 0)
-                # Check UserRole first for original text
-                is_reply = False
-                if comment_item:
-                    metadata = self.comment_metadata.get(comment_item.data(Qt.UserRole) or comment_item.text(), {})
-                    is_reply = metadata.get('is_reply', False)
-                table.setRowHidden(row, not is_reply)
-            # Re-enable sorting after filtering
-            # table.setSortingEnabled(True) # Keep disabled, manual sort below
-            return # Exit after filtering
-        else:
-            # Ensure all rows are visible if not filtering replies
-            for row in range(table.rowCount()):
-                table.setRowHidden(row, False)
-
-        # --- Custom Sorting Logic --- 
-        # Get data for sorting
-        all_rows_data = []
-        for row in range(table.rowCount()):
-            comment_item = table.item(row, 0)
-            prediction_item = table.item(row, 1)
-            confidence_item = table.item(row, 2)
-            
-            if not (comment_item and prediction_item and confidence_item):
-                # Skip rows with missing items to avoid errors
-                continue 
-
-            # Get original comment text (prefer UserRole)
-            comment_text = comment_item.data(Qt.UserRole) or comment_item.text()
-            # Clean potential display prefix if fallback to text() was used
-            if comment_text.startswith(" [↪ Reply] "):
-                 comment_text = comment_text[len(" [↪ Reply] "):]
-            
-            prediction_text = prediction_item.text()
-            
-            # Get numerical confidence
-            confidence_value = 0.0
-            try:
-                # Use UserRole for confidence if available (safer)
-                conf_data = confidence_item.data(Qt.UserRole)
-                if conf_data is not None:
-                     confidence_value = float(conf_data)
-                else:
-                     # Fallback: parse text, removing %
-                     confidence_value = float(confidence_item.text().strip('%'))
-            except (ValueError, TypeError):
-                pass # Keep 0.0 if parsing fails
-                
-            all_rows_data.append((row, comment_text, prediction_text, confidence_value))
-
-        # Define sort key based on index
-        sort_key = None
-        reverse_sort = False
-        
-        if index == 0: # Comment A-Z
-            sort_key = lambda item: item[1].lower() # item[1] is comment_text
-        elif index == 1: # Comment Z-A
-            sort_key = lambda item: item[1].lower()
-            reverse_sort = True
-        elif index == 2: # Prediction A-Z
-            sort_key = lambda item: item[2] # item[2] is prediction_text
-        elif index == 3: # Confidence High-Low
-            sort_key = lambda item: item[3] # item[3] is confidence_value
-            reverse_sort = True
-        elif index == 4: # Confidence Low-High
-            sort_key = lambda item: item[3]
-            
-        # Perform the sort if a key is defined
-        if sort_key:
-            all_rows_data.sort(key=sort_key, reverse=reverse_sort)
+        model.set_replies_only(index == 5)  # "Show Replies Only"
+        if index == 5:
+            return
 
-        # --- Reorder Table Rows --- 
-        # This part can be slow for large tables, but is necessary for custom sort
-        current_row_mapping = {data[0]: data for data in all_rows_data}
-        
-        # Temporarily block signals to avoid triggering updates during move
-        table.blockSignals(True)
-        
-        # Move rows according to the sorted order
-        target_row = 0
-        processed_original_rows = set()
-        
-        # Iterate through the desired sorted order
-        for original_row_index, _, _, _ in all_rows_data:
-            if original_row_index in processed_original_rows:
-                 continue # Skip if this original row was already moved
-            
-            # Find the current visual position of the original row
-            current_visual_row = -1
-            for r in range(table.rowCount()):
-                item = table.item(r, 0)
-                if item and (item.data(Qt.UserRole) or item.text()) == current_row_mapping[original_row_index][1]:
-                    current_visual_row = r
-                    break
-            
-            if current_visual_row != -1 and current_visual_row != target_row:
-                # Insert a new row at the target position
-                table.insertRow(target_row)
-                
-                # Move items from the current visual row to the target row
-                for col in range(table.columnCount()):
-                    item_to_move = table.takeItem(current_visual_row + 1, col) # +1 because we inserted a row
-                    table.setItem(target_row, col, item_to_move)
-                    
-                # Remove the now empty original row (which shifted down)
-                table.removeRow(current_visual_row + 1)
-                
-            processed_original_rows.add(original_row_index)
-            target_row += 1
-            
-        # Unblock signals
-        table.blockSignals(False)
-        
-        # Optional: re-enable default sorting if desired, but manual sort is done
-        # table.setSortingEnabled(True)
+        # --- Sorting (reorders the model's arrays) --- 
+        sort_orders = {
+            0: (COMMENT_COLUMN, Qt.AscendingOrder),      # Comment A-Z
+            1: (COMMENT_COLUMN, Qt.DescendingOrder),     # Comment Z-A
+            2: (LABEL_COLUMN, Qt.AscendingOrder),        # Prediction A-Z
+            3: (CONFIDENCE_COLUMN, Qt.DescendingOrder),  # Confidence High-Low
+            4: (CONFIDENCE_COLUMN, Qt.AscendingOrder),   # Confidence Low-High
+        }
+        if index in sort_orders:
+            model.sort(*sort_orders[index])
 
     def update_details_panel(self):
         """Update the details panel with selected comment information"""
-        selected_items = self.get_current_table().selectedItems()
-        if not selected_items:
+        table = self.get_current_table()
+        if not table:
+            return
+            
+        row = table.selected_row()
+        if row == -1:
             self.details_text_edit.clear()
             self.add_remove_button.setEnabled(False)
             self.export_selected_button.setEnabled(False)
@@ -1427,20 +1237,13 @@ class UserMainWindow(QMainWindow):
         self.export_selected_button.setEnabled(True)
         self.enable_dataset_operations(True)
 
-        row = selected_items[0].row()
-        comment_item = self.get_current_table().item(row, 0)
-        comment = comment_item.data(Qt.UserRole) or comment_item.text()
-        prediction = self.get_current_table().item(row, 1).text()
-        confidence = self.get_current_table().item(row, 2).text()
+        comment, prediction, confidence_value = table.model().row_values(row)
+        confidence = f"{confidence_value:.2f}%"
         
         metadata = self.comment_metadata.get(comment, {})
         
         # Check if this comment is in the selected list and update add/remove button text
-        in_selected_list = False
-        for item in self.selected_comments:
-            if (isinstance(item, dict) and item.get('comment') == comment) or (isinstance(item, str) and item == comment):
-                in_selected_list = True
-                break
+        in_selected_list = comment in self.selected_comment_texts()
                 
         if in_selected_list:
             self.add_remove_button.setText("➖ Remove from List")
@@ -1477,15 +1280,9 @@ class UserMainWindow(QMainWindow):
 
             # Find row number logic (remains the same)
             row_num_str = "N/A"
-            current_table = self.get_current_table()
-            if current_table:
-                for i in range(current_table.rowCount()):
-                     parent_item = current_table.item(i, 0)
-                     # Use UserRole first for matching original text
-                     original_parent_text_from_item = parent_item.data(Qt.UserRole) if parent_item else None
-                     if original_parent_text_from_item == parent_text:
-                          row_num_str = str(i+1)
-                          break
+            parent_row = table.model().find_row(parent_text)
+            if parent_row != -1:
+                 row_num_str = str(parent_row + 1)
 
             self.details_text_edit.append(make_text("Row #", row_num_str))
             self.details_text_edit.append(make_text("Replying to", "[AUTHOR]")) # Redacted name
@@ -1510,211 +1307,93 @@ class UserMainWindow(QMainWindow):
             display_message(self, "Error", "Please enter a URL.")
             return
 
-        try:
-            start_time = time.time() # Record start time
-            self.show_loading(True)
-            QApplication.processEvents()
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as temp_file:
-                temp_path = temp_file.name
-            
-            # Use filters instead of just include_replies
-            scrape_comments(url, temp_path, self.comment_filters)
-            
-            end_time = time.time() # Record end time
-            duration = end_time - start_time
-            print(f"Scraping and initial processing took {duration:.2f} seconds.")
-            
-            df = pd.read_csv(temp_path)
-            
-            if not self.comment_filters.get("includeReplies", True):
-                df = df[~df['Is Reply']]
-            
-            # Initialize counters for excluded comments
-            short_comment_count = 0
-            name_only_count = 0
-            link_comment_count = 0
-            emoji_only_count = 0
-            total_comments = len(df)
-            
-            # Function to check if a comment is likely a name-only comment
-            def is_name_only(text):
-                # Convert to lowercase for better comparison
-                text = text.lower()
-                
-                # Check common name patterns
-                name_patterns = [
-                    # Pattern: First Second Third
-                    r"^[A-Za-z]+ [A-Za-z]+ [A-Za-z]+$",
-                    # Pattern: Name @ Name
-                    r"^[A-Za-z]+ @ [A-Za-z]+$",
-                    # Pattern: First Last
-                    r"^[A-Za-z]+ [A-Za-z]+$",
-                    # Tag pattern
-                    r"^@[A-Za-z0-9_]+$"
-                ]
-                
-                # Common Filipino name markers
-                name_markers = [
-                    "kuya", "ate", "tita", "tito", "lola", "lolo", "nanay", "tatay", 
-                    "mommy", "daddy", "mama", "papa", "inay", "itay", "sis", "bro"
-                ]
-                
-                # Check if any word in the comment is a common name marker
-                words = text.split()
-                has_name_marker = any(marker in words for marker in name_markers)
-                
-                # Check against regex patterns
-                matches_pattern = any(re.search(pattern, text, re.IGNORECASE) for pattern in name_patterns)
-                
-                return matches_pattern or has_name_marker
-            
-            # Function to check if comment has fewer words than minimum
-            def is_short_comment(text, min_words=3):
-                # Split by whitespace and count words
-                words = text.strip().split()
-                return len(words) < min_words
-            
-            # Function to check if comment contains links
-            def contains_link(text):
-                # Simple regex to detect URLs
-                url_pattern = r'https?://\S+|www\.\S+'
-                return bool(re.search(url_pattern, text))
-            
-            # Function to check if comment only contains emojis
-            def is_emoji_only(text):
-                # Strip whitespace
-                text = text.strip()
-                if not text:
-                    return False
-                
-                # Check if all characters are emojis or whitespace
-                emoji_pattern = re.compile(
-                    "["
-                    "\U0001F600-\U0001F64F"  # emoticons
-                    "\U0001F300-\U0001F5FF"  # symbols & pictographs
-                    "\U0001F680-\U0001F6FF"  # transport & map symbols
-                    "\U0001F700-\U0001F77F"  # alchemical symbols
-                    "\U0001F780-\U0001F7FF"  # Geometric Shapes
-                    "\U0001F800-\U0001F8FF"  # Supplemental Arrows-C
-                    "\U0001F900-\U0001F9FF"  # Supplemental Symbols and Pictographs
-                    "\U0001FA00-\U0001FA6F"  # Chess Symbols
-                    "\U0001FA70-\U0001FAFF"  # Symbols and Pictographs Extended-A
-                    "\U00002702-\U000027B0"  # Dingbats
-                    "\U000024C2-\U0001F251" 
-                    "]+|[\u2600-\u26FF\u2700-\u27BF]"
-                )
-                
-                # Replace all emojis with empty string
-                text_without_emojis = emoji_pattern.sub('', text)
-                
-                # If after removing emojis and whitespace there's nothing left, it's emoji-only
-                return len(text_without_emojis.strip()) == 0
-            
-            # Get filter settings with defaults
-            min_word_count = self.comment_filters.get("minWordCount", 3)
-            exclude_links = self.comment_filters.get("excludeLinks", True)
-            exclude_emojis_only = self.comment_filters.get("excludeEmojisOnly", True)
-            
-            # Create mask for comments to keep
-            keep_mask = pd.Series(True, index=df.index)
-            
-            # Apply filters
-            for idx, row in df.iterrows():
-                text = row['Text']
-                
-                # Check if comment is too short
-                if is_short_comment(text, min_word_count):
-                    keep_mask[idx] = False
-                    short_comment_count += 1
-                    continue
-                
-                # Check if comment is likely just a name
-                if is_name_only(text):
-                    keep_mask[idx] = False
-                    name_only_count += 1
-                    continue
-                
-                # Check if comment contains links and we want to exclude them
-                if exclude_links and contains_link(text):
-                    keep_mask[idx] = False
-                    link_comment_count += 1
-                    continue
-                
-                # Check if comment is emoji-only and we want to exclude them
-                if exclude_emojis_only and is_emoji_only(text):
-                    keep_mask[idx] = False
-                    emoji_only_count += 1
-                    continue
-            
-            # Apply the mask to keep only valid comments
-            filtered_df = df[keep_mask]
-            
-            # Initialize metadata and comments data
+        start_time = time.time() # Record start time
+        filters = dict(self.comment_filters)
+        refresh = self.refresh_checkbox.isChecked()
+        # Re-scraping a post whose tab is still open only fetches and merges its new comments
+        history_key = f"{self.session_id}|{url}"
+        history = None if refresh else load_scrape_history(history_key)
+        merge_tab = history.get('tab_name') if history and history.get('tab_name') in self.tabs else None
+        # A recent scrape of the same post and actor settings is reused unless a refresh is forced
+        cache_age = None if refresh or merge_tab else cached_scrape_age(url, filters)
+        result_tab = {}
+
+        def prepare():
+            # Runs on the worker thread: comments are filtered and classified page by
+            # page while the scraper is still running, without a temp CSV round trip
+            stats = {
+                'total_comments': 0,
+                'short_comment_count': 0,
+                'name_only_count': 0,
+                'link_comment_count': 0,
+                'emoji_only_count': 0
+            }
+
+            def scraped_rows():
+                # Raw comments are only written to disk if CSV export is turned on
+                for batch in iter_comment_batches(url, filters, save_path=scrape_export_path(),
+                                                  refresh=refresh, incremental=bool(merge_tab),
+                                                  history_key=history_key):
+                    yield self.scraped_comments_to_rows(batch, filters, stats)
+
+                duration = time.time() - start_time
+                print(f"Scraping and analysis took {duration:.2f} seconds.")
+
+            # The counters fill in as pages arrive and are complete once the stream ends
+            return scraped_rows(), stats
+
+        def make_tab_name():
+            if merge_tab:
+                result_tab['name'] = merge_tab
+                return merge_tab
+
+            # Initialize metadata for the new results
             self.comment_metadata = {}
-            comments_data = []
-            
-            for _, row in filtered_df.iterrows():
-                comment_text = row['Text']
-                # Get prediction and confidence from model
-                prediction, confidence = classify_comment(comment_text)
-                
-                # Store metadata
-                self.comment_metadata[comment_text] = {
-                    'profile_name': row['Profile Name'],
-                    'profile_picture': row['Profile Picture'],
-                    'date': row['Date'],
-                    'likes_count': row['Likes Count'],
-                    'profile_id': row['Profile ID'],
-                    'is_reply': row['Is Reply'],
-                    'reply_to': row['Reply To'],
-                    'confidence': confidence
-                }
-                
-                # Prepare comment data
-                comments_data.append({
-                    'comment_text': comment_text,
-                    'prediction': prediction,
-                    'confidence': confidence,
-                    'profile_name': row['Profile Name'],
-                    'profile_picture': row['Profile Picture'],
-                    'comment_date': row['Date'],
-                    'likes_count': row['Likes Count'],
-                    'profile_id': row['Profile ID'],
-                    'is_reply': row['Is Reply'],
-                    'reply_to': row['Reply To']
-                })
             
             # Create a new tab for the results
             tab_name = f"URL {self.url_tab_count}: {url[:30]}..."
             self.url_tab_count += 1
-            
-            # Create table and populate it
-            table = self.create_empty_tab(tab_name)
-            self.populate_table(table, comments_data)
-            
-            # Save the initial state
-            self.save_tab_state(tab_name, comments_data)
+            result_tab['name'] = tab_name
+            return tab_name
+
+        def on_complete(comments_data, stats):
+            duration = time.time() - start_time
             
             # Show summary dialog with exclusion statistics and duration
+            short_comment_count = stats['short_comment_count']
+            name_only_count = stats['name_only_count']
+            link_comment_count = stats['link_comment_count']
+            emoji_only_count = stats['emoji_only_count']
+            # Repeated comments were inferred once by the classifier
+            duplicate_count = count_duplicates([comment['comment_text'] for comment in comments_data])
             excluded_count = short_comment_count + name_only_count + link_comment_count + emoji_only_count
             filter_summary = ""
-            if excluded_count > 0:
-                min_word_count = self.comment_filters.get("minWordCount", 3)
+            if excluded_count > 0 or duplicate_count > 0:
+                min_word_count = filters.get("minWordCount", 3)
                 filter_summary = (
                     f"<b>Comments Filter Summary:</b><br>"
-                    f"Total comments found: {total_comments}<br>"
+                    f"Total comments found: {stats['total_comments']}<br>"
                     f"Comments excluded: {excluded_count}<br>"
                     f"&nbsp;&nbsp;• Short comments (&lt; {min_word_count} words): {short_comment_count}<br>"
                     f"&nbsp;&nbsp;• Name-only comments: {name_only_count}<br>"
                     f"&nbsp;&nbsp;• Comments with links: {link_comment_count}<br>"
-                    f"&nbsp;&nbsp;• Emoji-only comments: {emoji_only_count}<br><br>"
+                    f"&nbsp;&nbsp;• Emoji-only comments: {emoji_only_count}<br>"
+                    f"Duplicate comments (analyzed once): {duplicate_count}<br><br>"
                     f"Comments displayed: {len(comments_data)}"
                 )
             
             duration_summary = f"<b>Processing Time:</b><br>Scraping and analysis took {duration:.2f} seconds."            
             
             final_message = filter_summary + ("<br><br>" if filter_summary else "") + duration_summary
+            if cache_age is not None:
+                final_message += (f"<br><br><b>Source:</b><br>Cached scrape from {format_age(cache_age)} ago. "
+                                  f"Check Force refresh to scrape the post again.")
+                self.mark_cached_tab(result_tab['name'], cache_age)
+            if merge_tab:
+                final_message = (f"<b>Update:</b><br>{len(comments_data)} new comments merged into "
+                                 f"'{merge_tab}'.<br><br>" + final_message)
+            # Later scrapes of this post merge into the same tab
+            update_scrape_history(history_key, tab_name=result_tab['name'])
             
             QMessageBox.information(self, "Scraping Results", final_message)
             
@@ -1724,11 +1403,99 @@ class UserMainWindow(QMainWindow):
                 log_user_action(self.current_user, f"Scraped FB post: {short_url}")
             except Exception as log_error:
                 print(f"Logging error: {log_error}")
+
+        if merge_tab:
+            message = "Checking for new comments..."
+        elif cache_age is not None:
+            message = "Loading cached comments..."
+        else:
+            message = "Scraping comments..."
+        self.run_classification_job(message, prepare, make_tab_name, on_complete,
+                                    error_message="Error scraping comments", append=bool(merge_tab))
+
+    def show_scrape_queue(self):
+        """Scrape several Facebook posts concurrently, opening a tab for each post as it finishes"""
+        if self.classification_job and self.classification_job.is_running():
+            display_message(self, "Busy", "Please wait for the current analysis to finish or cancel it.")
+            return
+
+        filters = dict(self.comment_filters)
+
+        def process(url, comments):
+            # Runs on the queue's worker thread
+            stats = {}
+            return self.scraped_comments_to_rows(comments, filters, stats), stats
+
+        dialog = ScrapeQueueDialog(filters, process, self, refresh=self.refresh_checkbox.isChecked())
+        dialog.url_finished.connect(self.add_scraped_tab)
+        # Counts as the running job, so single scrapes wait for the queue
+        self.classification_job = dialog
+        dialog.show()
+
+    def mark_cached_tab(self, tab_name, cache_age=None):
+        """Flag a tab whose comments came from the scrape cache"""
+        if tab_name not in self.tabs:
+            return
+        age = f" from {format_age(cache_age)} ago" if cache_age is not None else ""
+        index = self.tab_widget.indexOf(self.tabs[tab_name])
+        self.tab_widget.setTabToolTip(index, f"{tab_name}\nCached scrape{age} (check Force refresh to re-scrape)")
+
+    def add_scraped_tab(self, url, comments_data, stats, cached=False):
+        """Open a results tab for one post finished by the scrape queue"""
+        tab_name = f"URL {self.url_tab_count}: {url[:30]}..."
+        self.url_tab_count += 1
+        table = self.create_empty_tab(tab_name)
+        self.populate_table(table, comments_data)
+        self.save_tab_state(tab_name, comments_data)
+        if cached:
+            self.mark_cached_tab(tab_name)
+
+        try:
+            # Truncate URL if too long
+            short_url = url[:30] + "..." if len(url) > 30 else url
+            log_user_action(self.current_user, f"Scraped FB post: {short_url}")
+        except Exception as log_error:
+            print(f"Logging error: {log_error}")
+
+    def scraped_comments_to_rows(self, comments, filters, stats):
+        """
+        Filter one page of scraped comments and convert it to table rows.
+        
+        Args:
+            comments (list): Comments from the scraper, keyed by its CSV columns
+            filters (dict): Comment filter settings
+            stats (dict): Exclusion counters, updated in place
             
-        except Exception as e:
-            display_message(self, "Error", f"Error scraping comments: {e}")
-        finally:
-            self.show_loading(False)
+        Returns:
+            list: Row dicts ready for classification
+        """
+        df = comments_to_frame(comments)
+        
+        # Filter out replies if not included
+        if not filters.get("includeReplies", True):
+            df = df[~df['Is Reply']]
+
+        filtered_df, batch_stats = filter_comments(df, filters)
+        for key, value in batch_stats.items():
+            stats[key] = stats.get(key, 0) + value
+
+        # Build the rows column-wise instead of with iterrows
+        columns = zip(filtered_df['Text'], filtered_df['Profile Name'], filtered_df['Profile Picture'],
+                      filtered_df['Date'], filtered_df['Likes Count'], filtered_df['Profile ID'],
+                      filtered_df['Is Reply'], filtered_df['Reply To'])
+        rows = []
+        for text, name, picture, date, likes, profile_id, is_reply, reply_to in columns:
+            rows.append({
+                'comment_text': text,
+                'profile_name': name,
+                'profile_picture': picture,
+                'comment_date': date,
+                'likes_count': likes,
+                'profile_id': profile_id,
+                'is_reply': is_reply,
+                'reply_to': reply_to
+            })
+        return rows
 
     def browse_file(self):
         """Open file dialog to select a CSV file"""
@@ -1743,85 +1510,129 @@ class UserMainWindow(QMainWindow):
             return
             
         file_path = self.file_input.text()
-        try:
-            # Get just the filename without path and log at the start
-            file_name = file_path.split('/')[-1].split('\\')[-1]
-            log_user_action(self.current_user, f"Started processing CSV file: {file_name}")
-            
-            self.show_loading(True)
-            QApplication.processEvents()
-            
+        
+        # Get just the filename without path and log at the start
+        file_name = file_path.split('/')[-1].split('\\')[-1]
+        log_user_action(self.current_user, f"Started processing CSV file: {file_name}")
+
+        def prepare():
+            # Runs on the worker thread: read the CSV and build the rows to classify
             df = pd.read_csv(file_path)
             # Get the first column name
             first_column = df.columns[0]
             
-            # Initialize comments list
-            comments_data = []
+            # Collect non-empty comment texts from the first column
+            comment_texts = [str(value).strip() for value in df[first_column]]
+            comment_texts = [text for text in comment_texts if text]
+            if not comment_texts:
+                raise ValueError("No valid comments found in the CSV file.")
             
-            # Process each row
-            for _, row in df.iterrows():
-                try:
-                    # Get comment text from first column, ensuring it's a string
-                    comment_text = str(row[first_column]).strip()
-                    if not comment_text:  # Skip empty comments
-                        continue
-                        
-                    # Classify the comment
-                    prediction, confidence = classify_comment(comment_text)
-                    
-                    # Store metadata
-                    self.comment_metadata[comment_text] = {
-                        'profile_name': 'CSV Input',
-                        'profile_picture': '',
-                        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
-                        'likes_count': 'N/A',
-                        'profile_id': 'N/A',
-                        'confidence': confidence
-                    }
-                    
-                    # Prepare comment data
-                    comments_data.append({
-                        'comment_text': comment_text,
-                        'prediction': prediction,
-                        'confidence': confidence,
-                        'profile_name': 'CSV Input',
-                        'profile_picture': '',
-                        'comment_date': time.strftime('%Y-%m-%d %H:%M:%S'),
-                        'likes_count': 'N/A',
-                        'profile_id': 'N/A',
-                        'is_reply': False,
-                        'reply_to': None
-                    })
-                    
-                except Exception as e:
-                    print(f"Error processing row: {e}")
-                    continue
-            
-            if not comments_data:
-                display_message(self, "Error", "No valid comments found in the CSV file.")
-                return
+            # Repeated comments are inferred once by the classifier
+            duplicate_count = count_duplicates(comment_texts)
+            if duplicate_count:
+                print(f"CSV contains {duplicate_count} duplicate comments; each unique comment is analyzed once.")
             
+            rows = []
+            for comment_text in comment_texts:
+                rows.append({
+                    'comment_text': comment_text,
+                    'profile_name': 'CSV Input',
+                    'profile_picture': '',
+                    'comment_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'likes_count': 'N/A',
+                    'profile_id': 'N/A',
+                    'is_reply': False,
+                    'reply_to': None
+                })
+            return rows, {'duplicate_count': duplicate_count}
+
+        def make_tab_name():
             # Create a new tab for the results
             tab_name = f"CSV {self.csv_tab_count}: {file_name}"
             self.csv_tab_count += 1
-            
-            # Create table and populate it
-            table = self.create_empty_tab(tab_name)
-            self.populate_table(table, comments_data)
-            
-            # Save the initial state
-            self.save_tab_state(tab_name, comments_data)
-            
+            return tab_name
+
+        def on_complete(comments_data, stats):
             # Log successful completion
             log_user_action(self.current_user, f"Successfully processed CSV file: {file_name}")
-            
-        except Exception as e:
+
+        def on_failed(error):
             # Log failure
-            if 'file_name' in locals():
-                log_user_action(self.current_user, f"Failed to process CSV file: {file_name}")
-            display_message(self, "Error", f"Error reading CSV file: {e}")
-        finally:
-            self.show_loading(False)
+            log_user_action(self.current_user, f"Failed to process CSV file: {file_name}")
+
+        self.run_classification_job("Processing CSV...", prepare, make_tab_name, on_complete,
+                                    error_message="Error reading CSV file", on_failed=on_failed)
+
+    def run_classification_job(self, message, prepare, make_tab_name, on_complete,
+                               error_message="Error analyzing comments", on_failed=None, append=False):
+        """
+        Classify rows on a background thread, appending them to a new tab as batches finish.
+        
+        Args:
+            message (str): Loading overlay message
+            prepare (callable): Runs on the worker thread and returns (rows, stats)
+            make_tab_name (callable): Returns the new tab's name once the rows are ready
+            on_complete (callable): Called with (rows, stats) when every row is classified
+            error_message (str): Prefix for the error dialog if the job fails
+            on_failed (callable): Called with the error message if the job fails
+            append (bool): Merge the rows into an existing tab; prepare yields only new comments
+        """
+        if self.classification_job and self.classification_job.is_running():
+            display_message(self, "Busy", "Please wait for the current analysis to finish or cancel it.")
+            return
+
+        job = ClassificationJob(self, self.loading_overlay, prepare, message)
+        state = {'stats': {}}
+
+        def open_tab():
+            tab_name = make_tab_name()
+            table = self.create_empty_tab(tab_name)
+            if tab_name in self.tabs:
+                self.tab_widget.setCurrentWidget(self.tabs[tab_name])
+            return tab_name, table
+
+        # The tab opens with the first rows, so a job that fails first leaves none behind
+        tab = JobTab(open_tab)
+
+        def on_prepared(total, stats):
+            state['stats'] = stats
+
+        def on_batch(rows):
+            table = tab.ensure()
+            # Merges trust the scraper's ID check; a repeated text is a distinct comment
+            self.add_comment_rows(table, rows)
+
+        def on_done(rows, cancelled):
+            if cancelled and not tab.is_open():
+                return
+            # A job that finds no rows still gets its (empty) tab
+            tab.ensure()
+            
+            # Save the (possibly partial) state; a merge only adds the new rows
+            self.save_tab_state(tab.name, rows, append=append)
+            
+            if cancelled:
+                log_user_action(self.current_user, f"Cancelled analysis for tab: {tab.name}")
+                QMessageBox.information(
+                    self, "Analysis Cancelled",
+                    f"Analysis was cancelled. The {len(rows)} comments analyzed so far "
+                    f"were kept in '{tab.name}'."
+                )
+            else:
+                on_complete(rows, state['stats'])
+
+        def on_error(error):
+            if on_failed:
+                on_failed(error)
+            display_message(self, "Error", f"{error_message}: {error}")
+
+        job.worker.prepared.connect(on_prepared)
+        job.worker.batch_ready.connect(on_batch)
+        job.worker.finished.connect(lambda rows: on_done(rows, False))
+        job.worker.cancelled.connect(lambda rows: on_done(rows, True))
+        job.worker.failed.connect(on_error)
+        self.classification_job = job
+        job.start()
 
     def analyze_single(self):
         """Analyze a single comment from direct input"""
@@ -1872,7 +1683,7 @@ class UserMainWindow(QMainWindow):
             # Get or create the "Direct Inputs" tab and its table
             if tab_name in self.tabs:
                 tab_widget = self.tabs[tab_name]
-                table = tab_widget.findChild(QTableWidget)
+                table = self.get_tab_table(tab_widget)
             else:
                 table = self.create_empty_tab(tab_name)
             
@@ -1889,44 +1700,7 @@ class UserMainWindow(QMainWindow):
                 display_message(self, "Warning", warning_text)
 
             # Now gather ALL comments from the Direct Inputs tab to save the complete state
-            all_comments_data = []
-            
-            # Iterate through all rows in the table
-            for row in range(table.rowCount()):
-                row_comment_item = table.item(row, 0)
-                row_prediction_item = table.item(row, 1)
-                row_confidence_item = table.item(row, 2)
-                
-                if row_comment_item and row_prediction_item and row_confidence_item:
-                    # Get the stored comment text (using UserRole if available)
-                    row_comment_text = row_comment_item.data(Qt.UserRole) or row_comment_item.text()
-                    row_prediction = row_prediction_item.text()
-                    
-                    # Get confidence - strip "%" and convert to float
-                    try:
-                        row_confidence_text = row_confidence_item.text()
-                        row_confidence = float(row_confidence_text.strip('%'))
-                    except:
-                        row_confidence = 0.0
-                    
-                    # Get metadata for this comment
-                    metadata = self.comment_metadata.get(row_comment_text, {})
-                    
-                    # Create data dictionary for this row
-                    row_data = {
-                        'comment_text': row_comment_text,
-                        'prediction': row_prediction,
-                        'confidence': row_confidence,
-                        'profile_name': metadata.get('profile_name', 'Direct Input'),
-                        'profile_picture': metadata.get('profile_picture', ''),
-                        'comment_date': metadata.get('date', time.strftime('%Y-%m-%d %H:%M:%S')),
-                        'likes_count': metadata.get('likes_count', 'N/A'),
-                        'profile_id': metadata.get('profile_id', 'N/A'),
-                        'is_reply': metadata.get('is_reply', False),
-                        'reply_to': metadata.get('reply_to', None)
-                    }
-                    
-                    all_comments_data.append(row_data)
+            all_comments_data = self.table_comment_rows(table, 'Direct Input')
             
             # Save the complete tab state with ALL comments
             self.save_tab_state(tab_name, all_comments_data)
@@ -1941,106 +1715,10 @@ class UserMainWindow(QMainWindow):
     def populate_table(self, table, comments, append=False):
         """Populate table with analyzed comments"""
         if not append:
-            table.setRowCount(0)
-            table.setColumnCount(3)
-            table.setHorizontalHeaderLabels(["Comment", "Prediction", "Confidence"])
-
-        # Create a set of existing comments to avoid duplicates
-        existing_comments = set()
-        if append:
-            for row in range(table.rowCount()):
-                comment_item = table.item(row, 0)
-                if comment_item and comment_item.data(Qt.UserRole):
-                    existing_comments.add(comment_item.data(Qt.UserRole))
+            table.model().clear()
 
-        for comment in comments:
-            # Get the comment text and prediction from the comment dictionary
-            comment_text = comment.get('comment_text', '')
-            
-            # Skip if this comment already exists in the table
-            if comment_text in existing_comments:
-                continue
-                
-            existing_comments.add(comment_text)
-            
-            prediction = comment.get('prediction', '')  # Use pre-classified prediction
-            confidence = comment.get('confidence', 0.0)  # Use pre-classified confidence (0.0-1.0)
-
-            # Convert confidence to High/Medium/Low
-            # confidence_level = "High" if confidence > 0.8 else "Medium" if confidence > 0.5 else "Low"
-
-            # Get metadata from either dictionary or metadata store
-            if isinstance(comment, dict):
-                # New format: use metadata directly from dictionary
-                metadata = {
-                    'profile_name': comment.get('profile_name', 'N/A'),
-                    'profile_picture': comment.get('profile_picture', None),
-                    'comment_date': comment.get('comment_date', 'N/A'),
-                    'likes_count': comment.get('likes_count', 0),
-                    'profile_id': comment.get('profile_id', 'N/A'),
-                    'is_reply': comment.get('is_reply', False),
-                    'reply_to': comment.get('reply_to', None),
-                    'confidence': confidence  # Store actual confidence value (0.0-1.0)
-                }
-                # Also store in comment_metadata for compatibility with other functions
-                self.comment_metadata[comment_text] = metadata
-            else:
-                # Old format: use comment_metadata directly (deprecated)
-                metadata = self.comment_metadata.get(comment_text, {})
-            
-            is_reply = metadata.get('is_reply', False)
-            
-            # Insert new row
-            row_position = table.rowCount()
-            table.insertRow(row_position)
-
-            # Set comment cell
-            display_text = comment_text
-            if is_reply:
-                reply_to = metadata.get('reply_to', '')
-                comment_item = QTableWidgetItem(display_text)
-                comment_item.setData(Qt.UserRole, comment_text)
-                comment_item.setData(Qt.DisplayRole, f" [↪ Reply] {display_text}")
-                comment_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            else:
-                comment_item = QTableWidgetItem(display_text)
-                comment_item.setData(Qt.UserRole, comment_text)
-                comment_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-            if is_reply:
-                lighter_surface = QColor(COLORS['surface']).lighter(105)
-                comment_item.setBackground(lighter_surface)
-
-            # Set prediction cell
-            prediction_item = QTableWidgetItem(prediction)
-            prediction_item.setTextAlignment(Qt.AlignCenter)
-            if prediction == "Potentially Harmful":
-                prediction_item.setForeground(QColor(COLORS['potentially_harmful']))
-            elif prediction == "Requires Review":
-                prediction_item.setForeground(QColor(COLORS['requires_attention']))
-            elif prediction == "Likely Appropriate":
-                prediction_item.setForeground(QColor(COLORS['likely_appropriate']))
-            else:
-                # Fallback for any other value
-                prediction_item.setForeground(QColor(COLORS['text']))
-            
-            # Set confidence cell (formatted 0-100 with %)
-            confidence_text = f"{confidence:.2f}%" # Format to 2 decimal places and add %
-            confidence_item = QTableWidgetItem(confidence_text)
-            confidence_item.setTextAlignment(Qt.AlignCenter)
-
-            # Add data to table
-            table.setItem(row_position, 0, comment_item)
-            table.setItem(row_position, 1, prediction_item)
-            table.setItem(row_position, 2, confidence_item) # Add to 3rd column
-
-            # Resize row to fit content
-            table.resizeRowToContents(row_position)
-
-            # Highlight if in selected comments
-            if comment_text in self.selected_comments:
-                for col in range(table.columnCount()):
-                    table.item(row_position, col).setBackground(QColor(COLORS['highlight']))
+        # Appending merges into the tab, skipping comments it already shows
+        self.add_comment_rows(table, comments, skip_existing=append)
 
         # Reset sort dropdown to default (index 0) when replacing table content
         if not append and hasattr(table, 'sort_combo'):
@@ -2063,46 +1741,79 @@ class UserMainWindow(QMainWindow):
         except Exception as e:
             print(f"Error setting current tab: {e}")
 
+    def add_comment_rows(self, table, comments, skip_existing=False):
+        """Append analyzed comments to a results table's model in one step (skip_existing when merging)."""
+        model = table.model()
+        new_comments = []
+        new_texts = set()
+        for comment in comments:
+            comment_text = comment.get('comment_text', '')
+            # Merging: skip comments the table already has, before touching their metadata
+            if skip_existing and (model.contains(comment_text) or comment_text in new_texts):
+                continue
+            new_texts.add(comment_text)
+            new_comments.append(comment)
+
+            # Store the row's metadata for the details panel and saving
+            self.comment_metadata[comment_text] = {
+                'profile_name': comment.get('profile_name', 'N/A'),
+                'profile_picture': comment.get('profile_picture', None),
+                'comment_date': comment.get('comment_date', 'N/A'),
+                'likes_count': comment.get('likes_count', 0),
+                'profile_id': comment.get('profile_id', 'N/A'),
+                'is_reply': comment.get('is_reply', False),
+                'reply_to': comment.get('reply_to', None),
+                'confidence': comment.get('confidence', 0.0)  # Store actual confidence value
+            }
+
+        selected_texts = self.selected_comment_texts()
+        model.append_rows(
+            [comment.get('comment_text', '') for comment in new_comments],
+            [comment.get('prediction', '') for comment in new_comments],  # Pre-classified prediction
+            [comment.get('confidence', 0.0) for comment in new_comments],
+            is_reply=[comment.get('is_reply', False) for comment in new_comments],
+            selected=[comment.get('comment_text', '') in selected_texts for comment in new_comments],
+        )
+
+    def selected_comment_texts(self):
+        """Texts of the comments on the user's list"""
+        return {item.get('comment') if isinstance(item, dict) else item for item in self.selected_comments}
+
+    def table_comment_rows(self, table, default_profile_name):
+        """Every comment in a table as a row for save_tab_state, with its stored metadata"""
+        model = table.model()
+        rows = []
+        for comment_text, prediction, confidence in zip(model.comments, model.labels, model.confidences):
+            metadata = self.comment_metadata.get(comment_text, {})
+            rows.append({
+                'comment_text': comment_text,
+                'prediction': prediction,
+                'confidence': float(confidence),
+                'profile_name': metadata.get('profile_name', default_profile_name),
+                'profile_picture': metadata.get('profile_picture', ''),
+                'comment_date': metadata.get('date', time.strftime('%Y-%m-%d %H:%M:%S')),
+                'likes_count': metadata.get('likes_count', 'N/A'),
+                'profile_id': metadata.get('profile_id', 'N/A'),
+                'is_reply': metadata.get('is_reply', False),
+                'reply_to': metadata.get('reply_to', None)
+            })
+        return rows
+
     def show_summary(self):
         """Show summary with counts, ratios, and a pie chart for the three-level guidance system."""
         table = self.get_current_table()
-        if not table or table.rowCount() == 0:
+        if not table or table.model().comment_count() == 0:
             display_message(self, "Info", "No comments to summarize")
             return
 
-        total_comments = table.rowCount()
-        potentially_harmful_count = 0
-        requires_review_count = 0
-        likely_appropriate_count = 0
-        confidences = [] # Collect confidences again
-
-        for row in range(total_comments):
-            comment_item = table.item(row, 0)
-            prediction_item = table.item(row, 1) 
-            confidence_item = table.item(row, 2) # Get item from 3rd column
-            
-            if not comment_item or not prediction_item or not confidence_item:
-                continue
-            
-            # Get prediction label
-            prediction = prediction_item.text()
+        # Count labels and average confidence (0-100) over the model's columns
+        model = table.model()
+        total_comments = model.comment_count()
+        potentially_harmful_count = int(np.count_nonzero(model.labels == "Potentially Harmful"))
+        requires_review_count = int(np.count_nonzero(model.labels == "Requires Review"))
+        likely_appropriate_count = int(np.count_nonzero(model.labels == "Likely Appropriate"))
 
-            # Get confidence score (0-100)
-            try:
-                confidence = float(confidence_item.text().strip('%')) # Read float from table, remove %
-                confidences.append(confidence)
-            except ValueError:
-                 # Handle cases where confidence might not be a valid number
-                 pass 
-
-            if prediction == "Potentially Harmful":
-                potentially_harmful_count += 1
-            elif prediction == "Requires Review":
-                requires_review_count += 1
-            elif prediction == "Likely Appropriate":
-                likely_appropriate_count += 1
-
-        avg_confidence = np.mean(confidences) if confidences else 0
+        avg_confidence = model.confidences.mean() if total_comments else 0
         
         # Calculate ratios
         harmful_ratio = (potentially_harmful_count / total_comments) if total_comments > 0 else 0
@@ -2174,15 +1885,12 @@ class UserMainWindow(QMainWindow):
 
     def show_word_cloud(self):
         """Generate and display word cloud visualization"""
-        total_comments = self.get_current_table().rowCount()
-        if total_comments == 0:
+        table = self.get_current_table()
+        if not table or table.model().comment_count() == 0:
             display_message(self, "Error", "No comments to visualize")
             return
 
-        all_comments = []
-        for row in range(total_comments):
-            comment = self.get_current_table().item(row, 0).text()
-            all_comments.append(comment)
+        all_comments = list(table.model().comments)
 
         try:
             def preprocess_text(text):
@@ -2241,19 +1949,14 @@ class UserMainWindow(QMainWindow):
 
     def toggle_list_status(self):
         """Add or remove selected comment from list"""
-        selected_items = self.get_current_table().selectedItems()
-        if not selected_items:
+        table = self.get_current_table()
+        row = table.selected_row()
+        if row == -1:
             display_message(self, "Error", "Please select a comment to add or remove")
             return
 
-        row = selected_items[0].row()
-        comment_item = self.get_current_table().item(row, 0)
-        prediction_item = self.get_current_table().item(row, 1)
-        confidence_item = self.get_current_table().item(row, 2)
-        
-        comment = comment_item.data(Qt.UserRole) or comment_item.text()
-        prediction = prediction_item.text()
-        confidence = confidence_item.text()
+        comment, prediction, confidence_value = table.model().row_values(row)
+        confidence = f"{confidence_value:.2f}%"
         
         # Check if this comment is already in the selected comments list
         for i, item in enumerate(self.selected_comments):
@@ -2262,8 +1965,7 @@ class UserMainWindow(QMainWindow):
                 self.selected_comments.pop(i)
                 display_message(self, "Success", "Comment removed from list")
                 # Reset row color
-                for col in range(self.get_current_table().columnCount()):
-                    self.get_current_table().item(row, col).setBackground(QColor(COLORS['normal']))
+                table.model().set_selected(comment, False)
                 log_user_action(self.current_user, "Removed comment from list")
                 self.update_details_panel()
                 return
@@ -2272,8 +1974,7 @@ class UserMainWindow(QMainWindow):
                 self.selected_comments.pop(i)
                 display_message(self, "Success", "Comment removed from list")
                 # Reset row color
-                for col in range(self.get_current_table().columnCount()):
-                    self.get_current_table().item(row, col).setBackground(QColor(COLORS['normal']))
+                table.model().set_selected(comment, False)
                 log_user_action(self.current_user, "Removed comment from list")
                 self.update_details_panel()
                 return
@@ -2286,8 +1987,7 @@ class UserMainWindow(QMainWindow):
         })
         display_message(self, "Success", "Comment added to list")
         # Highlight row color
-        for col in range(self.get_current_table().columnCount()):
-            self.get_current_table().item(row, col).setBackground(QColor(COLORS['highlight']))
+        table.model().set_selected(comment, True)
         log_user_action(self.current_user, "Added comment to list")
         self.update_details_panel()
 
@@ -2321,13 +2021,11 @@ class UserMainWindow(QMainWindow):
                         confidence = "Unknown"
                         
                         # Look for this comment in current table
-                        table = self.get_current_table()
-                        for row in range(table.rowCount()):
-                            comment_item = table.item(row, 0)
-                            if comment_item and (comment_item.data(Qt.UserRole) == comment or comment_item.text() == comment):
-                                prediction = table.item(row, 1).text()
-                                confidence = table.item(row, 2).text()
-                                break
+                        model = self.get_current_table().model()
+                        if model.contains(comment):
+                            i = model.row_of_comment[comment]
+                            prediction = model.labels[i]
+                            confidence = f"{model.confidences[i]:.2f}%"
                         
                         export_data.append([comment, prediction, confidence])
                 
@@ -2341,33 +2039,23 @@ class UserMainWindow(QMainWindow):
     def export_all(self):
         """Export all analyzed comments from the current tab to CSV"""
         table = self.get_current_table()
-        if not table or table.rowCount() == 0:
+        if not table or table.model().comment_count() == 0:
             display_message(self, "Info", "No comments to export")
             return
 
-        # Prepare data for export
+        # Prepare data for export straight from the model's columns
+        model = table.model()
         export_data = []
         header = ["Comment", "Prediction", "Confidence", "Commenter", "Date", "Likes", "Profile ID", "Is Reply", "Reply To"]
 
-        for row in range(table.rowCount()):
-            comment_item = table.item(row, 0)
-            prediction_item = table.item(row, 1)
-            confidence_item = table.item(row, 2)
-            
-            if not comment_item or not prediction_item or not confidence_item:
-                continue
-                
-            comment_text = comment_item.data(Qt.UserRole) or comment_item.text()
-            prediction = prediction_item.text()
-            confidence = confidence_item.text() # Get confidence string (e.g., "85.00%")
-
+        for comment_text, prediction, confidence in zip(model.comments, model.labels, model.confidence_texts()):
             # Get metadata
             metadata = self.comment_metadata.get(comment_text, {})
             
             export_data.append([
                 comment_text,
                 prediction,
-                confidence, # Use the formatted string directly
+                confidence, # Formatted as the table shows it (e.g., "85.00%")
                 metadata.get('profile_name', 'N/A'),
                 metadata.get('date', 'N/A'),
                 metadata.get('likes_count', 'N/A'),
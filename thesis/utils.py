@@ -4,6 +4,7 @@ from email.mime.text import MIMEText
 from email_config import SMTP_SERVER, SMTP_PORT, EMAIL_USERNAME, EMAIL_PASSWORD, EMAIL_FROM
 import os
 import sys
+import json
 
 def display_message(parent, title, message):
     """Utility function to display a message box"""
@@ -26,6 +27,39 @@ def get_resource_path(relative_path):
         
     return os.path.join(base_path, relative_path)
 
+def get_app_data_path(*parts):
+    """ Get a writable per-user path for caches and local settings, creating its directory """
+    base_path = os.environ.get("THESIS_APP_DATA") or os.path.join(os.path.expanduser("~"), ".cbguidance")
+    path = os.path.join(base_path, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def load_settings():
+    """ Load local settings from settings.json in the app data directory """
+    settings_path = os.path.join(get_app_data_path(), "settings.json")
+    if not os.path.exists(settings_path):
+        return {}
+    try:
+        with open(settings_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except Exception as e:
+        print(f"Failed to read settings from {settings_path}: {e}")
+        return {}
+
+def save_settings(**values):
+    """ Merge values into settings.json in the app data directory """
+    settings = load_settings()
+    settings.update(values)
+    settings_path = os.path.join(get_app_data_path(), "settings.json")
+    temp_path = settings_path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(settings, file, indent=2)
+        os.replace(temp_path, settings_path)
+    except Exception as e:
+        print(f"Failed to save settings to {settings_path}: {e}")
+    return settings
+
 def send_email(recipient_email, subject, body):
     """Sends an email using the configured SMTP settings."""
     msg = MIMEText(body)